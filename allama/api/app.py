@@ -100,7 +100,11 @@ from allama.secrets.router import org_router as org_secrets_router
 from allama.secrets.router import router as secrets_router
 from allama.settings.router import router as org_settings_router
 from allama.settings.service import SettingsService, get_setting_override
-from allama.storage.blob import configure_bucket_lifecycle, ensure_bucket_exists
+from allama.storage.blob import (
+    close_storage_clients,
+    configure_bucket_lifecycle,
+    ensure_bucket_exists,
+)
 from allama.tables.internal_router import router as internal_tables_router
 from allama.tables.router import router as tables_router
 from allama.tags.router import router as tags_router
@@ -191,6 +195,8 @@ async def lifespan(app: FastAPI):
                 "Platform registry sync task failed before shutdown", error=e
             )
 
+    await close_storage_clients()
+
 
 async def setup_org_settings(session: AsyncSession, admin_role: Role):
     settings_service = SettingsService(session, role=admin_role)
@@ -1,5 +1,12 @@
 import asyncio
-from collections.abc import AsyncGenerator, Awaitable, Callable, Iterable
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Hashable,
+    Iterable,
+)
 from concurrent.futures import Future, ProcessPoolExecutor
 from typing import Any, TypeVar, override
 
@@ -77,3 +84,46 @@ async def cooperative[T](
     for item in it:
         yield item
         await asyncio.sleep(delay)
+
+
+async def single_flight[K: Hashable, T](
+    in_flight: dict[K, asyncio.Task[T]],
+    key: K,
+    start: Callable[[], Coroutine[Any, Any, T]],
+    *,
+    on_result: Callable[[T], None] | None = None,
+) -> T:
+    """Await the in-flight task for `key`, starting one with `start()` if there is none.
+
+    Concurrent callers with the same key share one task, which is removed from
+    `in_flight` when it finishes. A task started on another (possibly closed) event
+    loop can't be awaited, so it is replaced with one on the running loop.
+
+    Args:
+        in_flight: The caller's in-flight tasks, by key.
+        key: Identifies the work being done.
+        start: Returns the coroutine to run when no task is in flight.
+        on_result: Called with the result of a successful task, e.g. to cache it.
+
+    Returns:
+        The task's result.
+    """
+    loop = asyncio.get_running_loop()
+    task = in_flight.get(key)
+    if task is None or task.get_loop() is not loop:
+        task = loop.create_task(start())
+        in_flight[key] = task
+
+        def _on_done(task: asyncio.Task[T]) -> None:
+            if in_flight.get(key) is task:
+                del in_flight[key]
+            if task.cancelled():
+                return
+            # Mark failures as retrieved in case every waiter was cancelled
+            if task.exception() is None and on_result is not None:
+                on_result(task.result())
+
+        task.add_done_callback(_on_done)
+
+    # Shield so a cancelled waiter doesn't cancel the task for everyone else
+    return await asyncio.shield(task)
@@ -24,7 +24,11 @@ ALLAMA__PUBLIC_APP_URL = os.environ.get(
 )
 
 ALLAMA__LOOP_MAX_BATCH_SIZE = int(os.environ.get("ALLAMA__LOOP_MAX_BATCH_SIZE", 64))
-"""Maximum number of parallel requests to the worker service."""
+"""Maximum number of for_each iterations of a single action in flight at once.
+
+Iterations are pulled lazily from the loop iterator, so this also bounds how many
+iteration contexts and unflushed results are held in memory.
+"""
 
 ALLAMA__EXECUTOR_QUEUE = os.environ.get(
     "ALLAMA__EXECUTOR_QUEUE", "shared-action-queue"
@@ -36,6 +40,24 @@ ALLAMA__EXECUTOR_REGISTRY_CACHE_DIR = os.environ.get(
 )
 """Directory for caching extracted registry tarballs in subprocess mode. Uses /tmp for ephemeral storage."""
 
+ALLAMA__EXECUTOR_REGISTRY_CACHE_MAX_SIZE_MB = int(
+    os.environ.get("ALLAMA__EXECUTOR_REGISTRY_CACHE_MAX_SIZE_MB", 10240)
+)
+"""Maximum size of the extracted registry tarballs in ALLAMA__EXECUTOR_REGISTRY_CACHE_DIR, in MB.
+
+Least recently used registry versions are evicted past this, except those that may
+still be in use. Set to 0 to disable eviction (default: 10 GB).
+"""
+
+ALLAMA__EXECUTOR_MANIFEST_CACHE_DIR = os.environ.get(
+    "ALLAMA__EXECUTOR_MANIFEST_CACHE_DIR", ""
+)
+"""Directory for persisting validated registry manifests across executor restarts.
+
+Registry versions are immutable, so cached manifests never go stale. Keep this out of
+ALLAMA__EXECUTOR_REGISTRY_CACHE_DIR, which is mounted into sandboxes. Disabled when empty.
+"""
+
 # TODO: Set this as an environment variable
 ALLAMA__SERVICE_ROLES_WHITELIST = [
     "allama-api",
@@ -222,6 +244,15 @@ ALLAMA__EXECUTOR_TOKEN_TTL_SECONDS = int(
 )
 """Executor JWT TTL in seconds (default: 900 seconds)."""
 
+ALLAMA__EXECUTOR_RESOLUTION_CACHE_TTL_SECONDS = float(
+    os.environ.get("ALLAMA__EXECUTOR_RESOLUTION_CACHE_TTL_SECONDS", 60)
+)
+"""How long secrets and variables resolved for one action dispatch are reused
+across its for_each iterations, in seconds (default: 60 seconds).
+
+Set to 0 to resolve them for every iteration.
+"""
+
 # === Remote registry === #
 ALLAMA__ALLOWED_GIT_DOMAINS = set(
     os.environ.get(
@@ -244,6 +275,37 @@ ALLAMA__BLOB_STORAGE_BUCKET_REGISTRY = os.environ.get(
 ALLAMA__BLOB_STORAGE_ENDPOINT = os.environ.get("ALLAMA__BLOB_STORAGE_ENDPOINT")
 """Endpoint URL for blob storage."""
 
+ALLAMA__BLOB_STORAGE_MAX_POOL_CONNECTIONS = int(
+    os.environ.get("ALLAMA__BLOB_STORAGE_MAX_POOL_CONNECTIONS", 50)
+)
+"""Maximum HTTP connections kept open by the shared S3 client (default: 50).
+
+One client is reused per process (and event loop), so this bounds concurrent
+S3 requests from a worker.
+"""
+
+ALLAMA__BLOB_CACHE_DIR = os.environ.get("ALLAMA__BLOB_CACHE_DIR", "")
+"""Directory for the node-local blob cache shared by all processes on a host.
+
+Second tier behind each process's in-memory blob cache. Blobs are keyed by SHA-256,
+so entries never go stale. Disabled when empty.
+"""
+
+ALLAMA__BLOB_CACHE_DISK_MAX_BYTES = int(
+    os.environ.get("ALLAMA__BLOB_CACHE_DISK_MAX_BYTES", 2 * 1024 * 1024 * 1024)
+)
+"""Size budget for ALLAMA__BLOB_CACHE_DIR. Least recently used blobs are evicted
+beyond this (default: 2 GB)."""
+
+ALLAMA__BLOB_INTEGRITY_SAMPLE_RATE = float(
+    os.environ.get("ALLAMA__BLOB_INTEGRITY_SAMPLE_RATE", 1.0)
+)
+"""Fraction of blob downloads whose SHA-256 is verified (default: 1.0, all of them).
+
+Downloads that are not sampled only get a size check. Cached blobs are verified
+once, when first downloaded, so cache hits are never re-hashed.
+"""
+
 ALLAMA__BLOB_STORAGE_PRESIGNED_URL_ENDPOINT = os.environ.get(
     "ALLAMA__BLOB_STORAGE_PRESIGNED_URL_ENDPOINT", None
 )
@@ -324,6 +386,20 @@ ALLAMA__COLLECTION_INLINE_MAX_BYTES = int(
 )
 """Maximum bytes before using CollectionObject. Default: 256 KB."""
 
+ALLAMA__COLLECTION_CHUNK_COMPRESSION_ENABLED = os.environ.get(
+    "ALLAMA__COLLECTION_CHUNK_COMPRESSION_ENABLED", "false"
+).lower() in ("true", "1")
+"""Write collection chunks as zstd-compressed JSON.
+
+The encoding is recorded in the manifest and chunk refs, so readers handle both
+compressed and uncompressed collections regardless of this setting.
+"""
+
+ALLAMA__COLLECTION_TRANSFER_CONCURRENCY = int(
+    os.environ.get("ALLAMA__COLLECTION_TRANSFER_CONCURRENCY", "8")
+)
+"""Maximum concurrent chunk uploads or downloads per collection. Default: 8."""
+
 # === Local registry === #
 ALLAMA__LOCAL_REPOSITORY_ENABLED = os.getenv(
     "ALLAMA__LOCAL_REPOSITORY_ENABLED", "0"
@@ -564,12 +640,33 @@ ALLAMA__CONTEXT_COMPRESSION_ALGORITHM = os.environ.get(
 )
 """Compression algorithm to use. Supported: zstd, gzip, brotli. Defaults to zstd."""
 
+ALLAMA__CONTEXT_COMPRESSION_OFFLOAD_THRESHOLD_KB = int(
+    os.environ.get("ALLAMA__CONTEXT_COMPRESSION_OFFLOAD_THRESHOLD_KB", 256)
+)
+"""Payloads larger than this (in KB) are compressed and decompressed in a worker
+thread instead of on the event loop. Defaults to 256KB."""
+
+ALLAMA__CONTEXT_COMPRESSION_ZSTD_DICT_PATH = os.environ.get(
+    "ALLAMA__CONTEXT_COMPRESSION_ZSTD_DICT_PATH", ""
+)
+"""Path to a trained zstd dictionary (see `train_zstd_dictionary`) for context compression.
+
+Payloads record the dictionary they were compressed with, so every worker decoding
+them needs the same file. Disabled when empty.
+"""
+
 ALLAMA__WORKFLOW_RETURN_STRATEGY: Literal["context", "minimal"] = cast(
     Literal["context", "minimal"],
     os.environ.get("ALLAMA__WORKFLOW_RETURN_STRATEGY", "minimal").lower(),
 )
 """Strategy to use when returning a value from a workflow. Supported: context, minimal. Defaults to minimal."""
 
+# === Expressions === #
+ALLAMA__EXPRESSION_PARSE_CACHE_SIZE = int(
+    os.environ.get("ALLAMA__EXPRESSION_PARSE_CACHE_SIZE", 4096)
+)
+"""Maximum number of parsed expressions kept in the process-wide parse cache. Defaults to 4096."""
+
 # === Redis config === #
 REDIS_CHAT_TTL_SECONDS = int(
     os.environ.get("REDIS_CHAT_TTL_SECONDS", 3 * 24 * 60 * 60)  # 3 days
@@ -747,6 +844,16 @@ ALLAMA__REGISTRY_SYNC_DISCOVER_TIMEOUT = int(
 )
 """Timeout for action discovery during registry sync in seconds. Defaults to 300 (5 min)."""
 
+ALLAMA__REGISTRY_TARBALL_COMPRESSION: Literal["gzip", "zstd"] = cast(
+    Literal["gzip", "zstd"],
+    os.environ.get("ALLAMA__REGISTRY_TARBALL_COMPRESSION", "gzip").lower(),
+)
+"""Compression for registry tarball venv layers built during sync: "gzip" or "zstd".
+
+zstd compresses on all cores and extracts several times faster. Executors detect
+each artifact's format, so existing gzip artifacts stay readable. Defaults to "gzip".
+"""
+
 ALLAMA__BUILTIN_REGISTRY_SOURCE_PATH = os.environ.get(
     "ALLAMA__BUILTIN_REGISTRY_SOURCE_PATH", "/app/packages/allama-registry"
 )
@@ -26,6 +26,19 @@ def _serializer(obj: Any) -> Any:
     return to_jsonable_python(obj, fallback=str)
 
 
+_ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+
+def to_payload_json(value: Any) -> Any:
+    """Round-trip a value through the payload JSON encoding.
+
+    Gives workflow code the same view of a value that an activity receives.
+    """
+    return orjson.loads(
+        orjson.dumps(value, default=_serializer, option=_ORJSON_OPTIONS)
+    )
+
+
 class PydanticORJSONPayloadConverter(JSONPlainPayloadConverter):
     """Pydantic ORJSON payload converter.
 
@@ -46,7 +59,7 @@ class PydanticORJSONPayloadConverter(JSONPlainPayloadConverter):
             data=orjson.dumps(
                 value,
                 default=_serializer,
-                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+                option=_ORJSON_OPTIONS,
             ),
         )
 
@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import threading
 from collections.abc import Callable, Coroutine, Mapping
+from dataclasses import dataclass
 from typing import Any, cast
 
 import dateparser
@@ -37,8 +38,13 @@ from allama.dsl.types import ActionErrorInfo, ActionErrorInfoAdapter
 from allama.dsl.validation import normalize_trigger_inputs
 from allama.exceptions import AllamaExpressionError
 from allama.expressions.common import ExprContext
-from allama.expressions.core import TemplateExpression
+from allama.expressions.core import (
+    ACTION_FIELD_ANY,
+    CollectedExprs,
+    TemplateExpression,
+)
 from allama.expressions.eval import (
+    collect_expressions,
     eval_templated_object,
     get_iterables_from_expression,
 )
@@ -47,6 +53,7 @@ from allama.identifiers.workflow import WorkflowUUID
 from allama.logger import logger
 from allama.registry.lock.types import RegistryLock
 from allama.storage.collection import (
+    materialize_collection_item,
     materialize_collection_values,
     store_collection,
 )
@@ -131,6 +138,24 @@ class EvaluateTemplatedObjectActivityInput(BaseModel):
     key: str
 
 
+class EvaluateExpressionsActivityInput(BaseModel):
+    """Input for evaluating many expressions in one activity."""
+
+    operands: list[ExecutionContext]
+    """Contexts shared by the expressions. Each is materialized once."""
+
+    expressions: list[tuple[str, int]]
+    """(expression, index into `operands`) pairs, in the order to return results."""
+
+
+class EvaluatedExpression(BaseModel):
+    """Outcome of one expression in `evaluate_expressions_activity`."""
+
+    result: Any = None
+    error: str | None = None
+    error_type: str | None = None
+
+
 class EvaluateForEachActivityInput(BaseModel):
     """Input for evaluating for_each loop iterations with materialized context."""
 
@@ -193,15 +218,20 @@ def run_sync[T: Any](coro: Coroutine[Any, Any, T]) -> T:
     return runner.run(coro)
 
 
-async def _materialize_task_result(task_result: TaskResult) -> MaterializedTaskResult:
+async def _materialize_task_result(
+    task_result: TaskResult, *, fetch_result: bool = True
+) -> MaterializedTaskResult:
     """Materialize a TaskResult's StoredObject result to raw value.
 
     Handles collection_index for scatter items - when set, the stored result
-    is a collection and we extract the item at that index.
+    is a collection and we extract the item at that index. For CollectionObject
+    results only the chunk holding the item is fetched.
 
     Args:
         task_result: A TaskResult
-        cache: Shared cache for ExternalObject retrievals
+        fetch_result: Whether to retrieve the result. When False, only the
+            TaskResult metadata (error, interaction, ...) is materialized and
+            the result is left as None.
 
     Returns:
         MaterializedTaskResult with raw result value
@@ -209,10 +239,21 @@ async def _materialize_task_result(task_result: TaskResult) -> MaterializedTaskR
     # Handle Pydantic TaskResult instance
     storage = get_object_storage()
     match task_result.result:
+        case _ if not fetch_result:
+            # Only TaskResult metadata is referenced
+            raw_result = None
         case InlineObject():
             raw_result = task_result.result.data
         case ExternalObject():
             raw_result = await storage.retrieve(task_result.result)
+        case CollectionObject() if task_result.collection_index is not None:
+            # Scatter item: fetch the one item, not the whole collection
+            raw_result = await materialize_collection_item(
+                task_result.result, task_result.collection_index
+            )
+            return _to_materialized_task_result(
+                task_result, raw_result, apply_collection_index=False
+            )
         case CollectionObject():
             raw_result = await materialize_collection_values(task_result.result)
         case _:
@@ -221,8 +262,22 @@ async def _materialize_task_result(task_result: TaskResult) -> MaterializedTaskR
                 f"got {type(task_result.result).__name__}"
             )
 
+    return _to_materialized_task_result(task_result, raw_result)
+
+
+def _to_materialized_task_result(
+    task_result: TaskResult, raw_result: Any, *, apply_collection_index: bool = True
+) -> MaterializedTaskResult:
+    """Wrap a raw result value with the TaskResult metadata.
+
+    Set apply_collection_index=False when raw_result is already the scatter item.
+    """
     # Handle scatter item extraction - if collection_index is set, extract the item
-    if task_result.collection_index is not None and isinstance(raw_result, list):
+    if (
+        apply_collection_index
+        and task_result.collection_index is not None
+        and isinstance(raw_result, list)
+    ):
         raw_result = raw_result[task_result.collection_index]
 
     return MaterializedTaskResult(
@@ -236,7 +291,56 @@ async def _materialize_task_result(task_result: TaskResult) -> MaterializedTaskR
     )
 
 
-async def materialize_context(ctx: ExecutionContext) -> MaterializedExecutionContext:
+@dataclass(slots=True)
+class MaterializationStats:
+    """Byte accounting for a single context materialization.
+
+    Sizes are taken from the stored object refs, so no extra reads are needed.
+    Collections are accounted by their manifest size.
+    """
+
+    bytes_fetched: int = 0
+    """Bytes retrieved from object storage."""
+
+    bytes_skipped: int = 0
+    """Bytes present in the context but not retrieved because nothing referenced them."""
+
+    objects_fetched: int = 0
+    objects_skipped: int = 0
+
+    def record(self, stored: StoredObject, *, fetched: bool) -> None:
+        match stored:
+            case ExternalObject(ref=ref):
+                size = ref.size_bytes
+            case CollectionObject(manifest_ref=ref):
+                size = ref.size_bytes
+            case _:
+                # Inline data is already in the context, nothing to fetch
+                return
+        if fetched:
+            self.bytes_fetched += size
+            self.objects_fetched += 1
+        else:
+            self.bytes_skipped += size
+            self.objects_skipped += 1
+
+
+def collect_context_refs(*objs: Any) -> CollectedExprs | None:
+    """Collect the context references used by the expressions in `objs`.
+
+    Returns None if any expression can't be parsed, so that callers fall back to
+    full materialization and surface the error during evaluation as before.
+    """
+    try:
+        return collect_expressions(list(objs))
+    except AllamaExpressionError as e:
+        logger.debug("Couldn't collect context references", error=e)
+        return None
+
+
+async def materialize_context(
+    ctx: ExecutionContext, *, refs: CollectedExprs | None = None
+) -> MaterializedExecutionContext:
     """Retrieve StoredObjects and replace with raw values in context copy.
 
     With uniform envelope design, TaskResult.result is ALWAYS a StoredObject.
@@ -249,6 +353,11 @@ async def materialize_context(ctx: ExecutionContext) -> MaterializedExecutionCon
 
     Args:
         ctx: Execution context containing ACTIONS, TRIGGER, etc.
+        refs: Context references collected from the expressions that will be
+            evaluated against the result (see `collect_context_refs`). When given,
+            only referenced actions and TRIGGER are materialized, and action
+            results are skipped if only their metadata (e.g. `error`) is used.
+            When None, everything is materialized.
 
     Returns:
         MaterializedExecutionContext with all StoredObjects replaced by raw values.
@@ -259,6 +368,7 @@ async def materialize_context(ctx: ExecutionContext) -> MaterializedExecutionCon
         function validates them back to proper types before materialization.
     """
     result: MaterializedExecutionContext = {}
+    stats = MaterializationStats()
 
     # Track action refs to map results back after parallel materialization
     action_refs: list[str] = []
@@ -271,15 +381,27 @@ async def materialize_context(ctx: ExecutionContext) -> MaterializedExecutionCon
     # Materialize ACTIONS - each value is a TaskResult with StoredObject result
     if actions := ctx.get("ACTIONS"):
         for ref, task_result in actions.items():
-            action_refs.append(ref)
             validated = TaskResult.model_validate(task_result)
-            coros.append(_materialize_task_result(validated))
+            if refs is None or refs.all_actions:
+                fetch_result = True
+            elif (fields := refs.actions.get(ref)) is None:
+                stats.record(validated.result, fetched=False)
+                continue
+            else:
+                fetch_result = bool(fields & {"result", ACTION_FIELD_ANY})
+            action_refs.append(ref)
+            stats.record(validated.result, fetched=fetch_result)
+            coros.append(_materialize_task_result(validated, fetch_result=fetch_result))
 
     # Materialize TRIGGER - always a StoredObject with uniform envelope
     if trigger := ctx.get("TRIGGER"):
-        trigger_task_idx = len(action_refs)  # Index after all action tasks
         validated = StoredObjectValidator.validate_python(trigger)
-        coros.append(get_object_storage().retrieve(validated))
+        if refs is None or refs.trigger:
+            trigger_task_idx = len(action_refs)  # Index after all action tasks
+            stats.record(validated, fetched=True)
+            coros.append(get_object_storage().retrieve(validated))
+        else:
+            stats.record(validated, fetched=False)
 
     # Collect results and map back to their refs
     try:
@@ -311,9 +433,82 @@ async def materialize_context(ctx: ExecutionContext) -> MaterializedExecutionCon
     if var := ctx.get("var"):
         result["var"] = var
 
+    _log_materialization_stats(stats)
     return result
 
 
+def materialize_inline_context(
+    ctx: ExecutionContext, *, refs: CollectedExprs
+) -> MaterializedExecutionContext | None:
+    """Materialize the referenced parts of a context without touching storage.
+
+    Safe to call from workflow code. Follows the same selection rules as
+    `materialize_context`.
+
+    Returns:
+        The materialized context, or None if any referenced value is externalized
+        (ExternalObject or CollectionObject) and needs `materialize_context`.
+    """
+    result: MaterializedExecutionContext = {}
+
+    if actions := ctx.get("ACTIONS"):
+        materialized_actions: dict[str, MaterializedTaskResult] = {}
+        for ref, task_result in actions.items():
+            validated = TaskResult.model_validate(task_result)
+            if refs.all_actions:
+                fetch_result = True
+            elif (fields := refs.actions.get(ref)) is None:
+                continue
+            else:
+                fetch_result = bool(fields & {"result", ACTION_FIELD_ANY})
+            match validated.result:
+                case _ if not fetch_result:
+                    raw_result = None
+                case InlineObject(data=data):
+                    raw_result = data
+                case _:
+                    return None
+            materialized_actions[ref] = _to_materialized_task_result(
+                validated, raw_result
+            )
+        if materialized_actions:
+            result["ACTIONS"] = materialized_actions
+
+    if (trigger := ctx.get("TRIGGER")) and refs.trigger:
+        match StoredObjectValidator.validate_python(trigger):
+            case InlineObject(data=data):
+                result["TRIGGER"] = data
+            case _:
+                return None
+
+    # Copy through non-StoredObject fields unchanged
+    if env := ctx.get("ENV"):
+        result["ENV"] = env
+    if secrets := ctx.get("SECRETS"):
+        result["SECRETS"] = secrets
+    if vars := ctx.get("VARS"):
+        result["VARS"] = vars
+    if var := ctx.get("var"):
+        result["var"] = var
+
+    return result
+
+
+def _log_materialization_stats(stats: MaterializationStats) -> None:
+    """Emit the per-activity materialization metric."""
+    if not (stats.objects_fetched or stats.objects_skipped):
+        return
+    activity_type = activity.info().activity_type if activity.in_activity() else None
+    logger.info(
+        "Context materialization metrics",
+        activity_type=activity_type,
+        bytes_fetched=stats.bytes_fetched,
+        bytes_skipped=stats.bytes_skipped,
+        objects_fetched=stats.objects_fetched,
+        objects_skipped=stats.objects_skipped,
+    )
+
+
 class ValidateActionActivityInput(BaseModel):
     role: Role
     task: ActionStatement
@@ -387,22 +582,46 @@ class DSLActivities:
         to the calling workflow.
         """
         # Materialize any StoredObjects in operand
-        materialized = run_sync(materialize_context(operand))
-
-        expr_str = expression.strip()
+        materialized = run_sync(
+            materialize_context(operand, refs=collect_context_refs(expression))
+        )
+        return _evaluate_expression(expression, materialized)
 
-        # Fail fast on empty / whitespace‐only expressions so that users receive a
-        # clear error instead of silently evaluating to ``False``.
-        if not expr_str:
-            raise AllamaExpressionError("Expression cannot be empty")
+    @staticmethod
+    @activity.defn
+    def evaluate_expressions_activity(
+        input: EvaluateExpressionsActivityInput,
+    ) -> list[EvaluatedExpression]:
+        """Evaluate many templated expressions in one round trip.
+
+        Each operand is materialized once for all of the expressions that use it.
+        Evaluation errors are returned per expression rather than failing the
+        activity, so one bad expression doesn't fail the others.
+        """
+        by_operand: dict[int, list[str]] = {}
+        for expression, operand_idx in input.expressions:
+            by_operand.setdefault(operand_idx, []).append(expression)
+        materialized = {
+            operand_idx: run_sync(
+                materialize_context(
+                    input.operands[operand_idx],
+                    refs=collect_context_refs(*expressions),
+                )
+            )
+            for operand_idx, expressions in by_operand.items()
+        }
 
-        # Evaluate the expression. Any parsing / evaluation errors raised inside
-        # ``TemplateExpression`` are propagated unchanged so that Temporal marks
-        # the activity as failed.
-        # Internally, this will raise a ``AllamaExpressionError`` if the expression
-        # is malformed/invalid.
-        expr = TemplateExpression(expr_str, operand=materialized)
-        return expr.result()
+        results: list[EvaluatedExpression] = []
+        for expression, operand_idx in input.expressions:
+            try:
+                result = _evaluate_expression(expression, materialized[operand_idx])
+            except Exception as e:
+                results.append(
+                    EvaluatedExpression(error=str(e), error_type=e.__class__.__name__)
+                )
+            else:
+                results.append(EvaluatedExpression(result=result))
+        return results
 
     @staticmethod
     @activity.defn
@@ -415,7 +634,9 @@ class DSLActivities:
         that expressions evaluate against raw values even when results are externalized.
         """
         # Materialize any StoredObjects in operand
-        materialized = run_sync(materialize_context(input.operand))
+        materialized = run_sync(
+            materialize_context(input.operand, refs=collect_context_refs(input.obj))
+        )
         result = eval_templated_object(input.obj, operand=materialized)
         stored = run_sync(get_object_storage().store(input.key, result))
         return stored
@@ -444,7 +665,11 @@ class DSLActivities:
     ) -> int:
         """Evaluate for_each expression to get iteration count for looped subflows."""
         # Materialize any StoredObjects in operand
-        materialized = run_sync(materialize_context(input.operand))
+        materialized = run_sync(
+            materialize_context(
+                input.operand, refs=collect_context_refs(input.for_each)
+            )
+        )
 
         # Get iterables from for_each expression
         iterators = get_iterables_from_expression(
@@ -556,7 +781,9 @@ class DSLActivities:
         Materializes any StoredObjects in operand before evaluation. This ensures
         that expressions evaluate against raw values even when results are externalized.
         """
-        materialized = run_sync(materialize_context(input.operand))
+        materialized = run_sync(
+            materialize_context(input.operand, refs=collect_context_refs(input.args))
+        )
         evaled_args = eval_templated_object(input.args, operand=materialized)
         return AgentActionArgs(**evaled_args)
 
@@ -570,7 +797,9 @@ class DSLActivities:
         Materializes any StoredObjects in operand before evaluation. This ensures
         that expressions evaluate against raw values even when results are externalized.
         """
-        materialized = run_sync(materialize_context(input.operand))
+        materialized = run_sync(
+            materialize_context(input.operand, refs=collect_context_refs(input.args))
+        )
         evaled_args = eval_templated_object(input.args, operand=materialized)
         return PresetAgentActionArgs(**evaled_args)
 
@@ -585,7 +814,9 @@ class DSLActivities:
         that expressions evaluate against raw values even when results are externalized.
         """
         # Materialize any StoredObjects in operand
-        materialized = run_sync(materialize_context(input.operand))
+        materialized = run_sync(
+            materialize_context(input.operand, refs=collect_context_refs(input.obj))
+        )
         result = eval_templated_object(input.obj, operand=materialized)
         stored = run_sync(get_object_storage().store(input.key, result))
         return stored
@@ -641,13 +872,33 @@ class DSLActivities:
         return await _prepare_subflow(input)
 
 
+def _evaluate_expression(
+    expression: str, materialized: MaterializedExecutionContext
+) -> Any:
+    expr_str = expression.strip()
+
+    # Fail fast on empty / whitespace‐only expressions so that users receive a
+    # clear error instead of silently evaluating to ``False``.
+    if not expr_str:
+        raise AllamaExpressionError("Expression cannot be empty")
+
+    # Evaluate the expression. Any parsing / evaluation errors raised inside
+    # ``TemplateExpression`` are propagated unchanged to the caller.
+    # Internally, this will raise a ``AllamaExpressionError`` if the expression
+    # is malformed/invalid.
+    expr = TemplateExpression(expr_str, operand=materialized)
+    return expr.result()
+
+
 def _evaluate_scatter_input(input: ScatterActionInput) -> StoredObject:
     """Evaluate scatter collection expression and store as CollectionObject.
 
     Returns CollectionObject if externalized, InlineObject otherwise.
     """
     # Materialize any StoredObjects in operand
-    materialized = run_sync(materialize_context(input.operand))
+    materialized = run_sync(
+        materialize_context(input.operand, refs=collect_context_refs(input.collection))
+    )
     result = eval_templated_object(input.collection, operand=materialized)
 
     # Treat None as empty collection (will be handled by empty check below)
@@ -733,7 +984,11 @@ def _resolve_subflow_batch(
         )
 
     # Materialize any StoredObjects in operand
-    materialized = run_sync(materialize_context(input.operand))
+    materialized = run_sync(
+        materialize_context(
+            input.operand, refs=collect_context_refs(task.for_each, task.args)
+        )
+    )
 
     # Get iterables from for_each expression
     iterators = get_iterables_from_expression(expr=task.for_each, operand=materialized)
@@ -881,7 +1136,9 @@ async def _prepare_subflow(input: PrepareSubflowActivityInput) -> PreparedSubflo
     task = input.task
 
     # Materialize any StoredObjects in operand
-    materialized = await materialize_context(input.operand)
+    materialized = await materialize_context(
+        input.operand, refs=collect_context_refs(task.args, task.for_each)
+    )
 
     # Evaluate task args to get workflow_id or workflow_alias
     evaluated_args = eval_templated_object(task.args, operand=materialized)
@@ -938,6 +1195,7 @@ async def _prepare_subflow(input: PrepareSubflowActivityInput) -> PreparedSubflo
         return PreparedSubflowResult(
             wf_id=wf_id,
             dsl=dsl,
+            definition_version=defn.version,
             registry_lock=registry_lock,
             trigger_inputs=None,
             runtime_configs=runtime_config,
@@ -965,6 +1223,7 @@ async def _prepare_subflow(input: PrepareSubflowActivityInput) -> PreparedSubflo
     return PreparedSubflowResult(
         wf_id=wf_id,
         dsl=dsl,
+        definition_version=defn.version,
         registry_lock=registry_lock,
         trigger_inputs=trigger_inputs_stored,
         runtime_configs=runtime_configs,
@@ -489,6 +489,13 @@ class DSLRunArgs(BaseModel):
     role: Role
     dsl: DSLInput | None = None
     wf_id: WorkflowUUID
+    definition_version: int | None = Field(
+        default=None,
+        description=(
+            "Workflow definition version to run when `dsl` is not provided. "
+            "If not provided, the latest version is used."
+        ),
+    )
     trigger_inputs: StoredObject | None = None
     parent_run_context: RunContext | None = None
     runtime_config: DSLConfig = Field(
@@ -646,6 +653,9 @@ class PreparedSubflowResult(BaseModel):
     dsl: DSLInput
     """Workflow definition."""
 
+    definition_version: int | None = None
+    """Version of the workflow definition `dsl` was loaded from."""
+
     registry_lock: RegistryLock | None = None
     """Frozen dependency versions. May be None for workflows without locks."""
 
@@ -1,7 +1,11 @@
 """Temporal PayloadCodec for compressing large workflow payloads."""
 
+import asyncio
+import hashlib
 from collections.abc import Iterable
+from pathlib import Path
 
+import zstandard
 from cramjam import (
     brotli as cramjam_brotli,  # pyright: ignore[reportAttributeAccessIssue]
 )
@@ -15,16 +19,62 @@ from allama.concurrency import cooperative
 from allama.config import (
     ALLAMA__CONTEXT_COMPRESSION_ALGORITHM,
     ALLAMA__CONTEXT_COMPRESSION_ENABLED,
+    ALLAMA__CONTEXT_COMPRESSION_OFFLOAD_THRESHOLD_KB,
     ALLAMA__CONTEXT_COMPRESSION_THRESHOLD_KB,
+    ALLAMA__CONTEXT_COMPRESSION_ZSTD_DICT_PATH,
 )
 
+ZSTD_LEVEL = 11
+
+DICT_ID_METADATA_KEY = "compression_dict_id"
+"""Payload metadata key naming the zstd dictionary a payload was compressed with.
+
+Payloads without it (including all histories written before dictionary support)
+are plain zstd frames.
+"""
+
+_COMPRESSED_ENCODINGS = ("binary/zstd", "binary/gzip", "binary/brotli")
+_COMPRESSION_METADATA_KEYS = (
+    "encoding",
+    "original_encoding",
+    "original_size",
+    "compressed_size",
+    DICT_ID_METADATA_KEY,
+)
+
+
+def zstd_dictionary_id(dictionary: bytes) -> str:
+    """Stable identifier for a dictionary, recorded in payload metadata."""
+    return hashlib.sha256(dictionary).hexdigest()[:16]
+
+
+def train_zstd_dictionary(
+    samples: Iterable[bytes], dict_size: int = 110 * 1024
+) -> bytes:
+    """Train a zstd dictionary from representative payloads.
+
+    Save the result to a file and point ALLAMA__CONTEXT_COMPRESSION_ZSTD_DICT_PATH at
+    it. Payloads compressed with a dictionary can only be decoded with that same
+    dictionary, so keep it available for as long as those histories are.
+
+    Args:
+        samples: Serialized payloads (e.g. action results) to train on.
+        dict_size: Maximum dictionary size in bytes.
+
+    Returns:
+        The dictionary bytes.
+    """
+    return zstandard.train_dictionary(dict_size, list(samples)).as_bytes()
+
 
 class CompressionPayloadCodec(PayloadCodec):
     """Temporal PayloadCodec that compresses large payloads using zstd/gzip/brotli.
 
     This codec automatically compresses payloads that exceed a configurable size
     threshold, helping workflows handle large data without hitting Temporal's
-    payload size limits.
+    payload size limits. Payloads above the offload threshold are (de)compressed
+    in a worker thread so they don't block the event loop. With a zstd dictionary
+    configured, zstd payloads are compressed against it and tagged with its id.
     """
 
     def __init__(
@@ -32,6 +82,8 @@ class CompressionPayloadCodec(PayloadCodec):
         threshold_bytes: int | None = None,
         algorithm: str | None = None,
         enabled: bool | None = None,
+        offload_threshold_bytes: int | None = None,
+        zstd_dictionary: bytes | None = None,
     ):
         self.enabled = (
             enabled if enabled is not None else ALLAMA__CONTEXT_COMPRESSION_ENABLED
@@ -42,17 +94,81 @@ class CompressionPayloadCodec(PayloadCodec):
             else ALLAMA__CONTEXT_COMPRESSION_THRESHOLD_KB * 1024
         )
         self.algorithm = algorithm or ALLAMA__CONTEXT_COMPRESSION_ALGORITHM
+        self.offload_threshold = (
+            offload_threshold_bytes
+            if offload_threshold_bytes is not None
+            else ALLAMA__CONTEXT_COMPRESSION_OFFLOAD_THRESHOLD_KB * 1024
+        )
 
         if self.enabled and self.algorithm not in ("zstd", "gzip", "brotli"):
             raise ValueError(f"Unsupported compression algorithm: {self.algorithm}")
 
+        # Loaded even when compression is disabled, to decode existing histories
+        if zstd_dictionary is None and ALLAMA__CONTEXT_COMPRESSION_ZSTD_DICT_PATH:
+            zstd_dictionary = Path(
+                ALLAMA__CONTEXT_COMPRESSION_ZSTD_DICT_PATH
+            ).read_bytes()
+        self.zstd_dict_id: bytes | None = None
+        self._zstd_dict: zstandard.ZstdCompressionDict | None = None
+        if zstd_dictionary is not None:
+            self._zstd_dict = zstandard.ZstdCompressionDict(zstd_dictionary)
+            self._zstd_dict.precompute_compress(level=ZSTD_LEVEL)
+            self.zstd_dict_id = zstd_dictionary_id(zstd_dictionary).encode()
+
         logger.info(
             "Compression codec initialized",
             enabled=self.enabled,
             threshold=self.threshold,
             algorithm=self.algorithm,
+            offload_threshold=self.offload_threshold,
+            zstd_dict_id=self.zstd_dict_id,
         )
 
+    def _compress(self, data: bytes) -> tuple[bytes, bytes, bytes | None]:
+        """Compress data with the configured algorithm.
+
+        Returns:
+            The compressed data, its encoding, and the zstd dictionary id (if any).
+        """
+        match self.algorithm:
+            case "zstd" if self._zstd_dict is not None:
+                # Compressors aren't thread-safe; they're cheap with a precomputed dict
+                compressor = zstandard.ZstdCompressor(
+                    level=ZSTD_LEVEL, dict_data=self._zstd_dict
+                )
+                return compressor.compress(data), b"binary/zstd", self.zstd_dict_id
+            case "zstd":
+                return (
+                    bytes(cramjam_zstd.compress(data, ZSTD_LEVEL)),
+                    b"binary/zstd",
+                    None,
+                )
+            case "gzip":
+                return bytes(cramjam_gzip.compress(data)), b"binary/gzip", None
+            case "brotli":
+                return bytes(cramjam_brotli.compress(data)), b"binary/brotli", None
+            case _:
+                raise ValueError(f"Unknown compression algorithm: {self.algorithm}")
+
+    def _decompress(self, payload: Payload, encoding: str) -> bytes:
+        match encoding:
+            case "binary/zstd" if dict_id := payload.metadata.get(DICT_ID_METADATA_KEY):
+                if dict_id != self.zstd_dict_id:
+                    raise ValueError(
+                        f"Payload needs zstd dictionary {dict_id.decode()}, "
+                        f"which is not configured"
+                    )
+                decompressor = zstandard.ZstdDecompressor(dict_data=self._zstd_dict)
+                return decompressor.decompress(payload.data)
+            case "binary/zstd":
+                return bytes(cramjam_zstd.decompress(payload.data))
+            case "binary/gzip":
+                return bytes(cramjam_gzip.decompress(payload.data))
+            case "binary/brotli":
+                return bytes(cramjam_brotli.decompress(payload.data))
+            case _:
+                raise ValueError(f"Unknown compression encoding: {encoding}")
+
     async def encode(self, payloads: Iterable[Payload]) -> list[Payload]:
         """Encode payloads, compressing those that exceed the threshold."""
         if not self.enabled:
@@ -65,21 +181,19 @@ class CompressionPayloadCodec(PayloadCodec):
                 result.append(payload)
                 continue
 
+            if self.algorithm not in ("zstd", "gzip", "brotli"):
+                logger.warning(f"Unknown compression algorithm: {self.algorithm}")
+                result.append(payload)
+                continue
+
             try:
-                # Compress the payload data
-                if self.algorithm == "zstd":
-                    compressed_data = bytes(cramjam_zstd.compress(payload.data, 11))
-                    encoding = b"binary/zstd"
-                elif self.algorithm == "gzip":
-                    compressed_data = bytes(cramjam_gzip.compress(payload.data))
-                    encoding = b"binary/gzip"
-                elif self.algorithm == "brotli":
-                    compressed_data = bytes(cramjam_brotli.compress(payload.data))
-                    encoding = b"binary/brotli"
+                # Compress the payload data, off the event loop if it's large
+                if len(payload.data) > self.offload_threshold:
+                    compressed_data, encoding, dict_id = await asyncio.to_thread(
+                        self._compress, payload.data
+                    )
                 else:
-                    logger.warning(f"Unknown compression algorithm: {self.algorithm}")
-                    result.append(payload)
-                    continue
+                    compressed_data, encoding, dict_id = self._compress(payload.data)
 
                 # Calculate compression ratio
                 original_size = len(payload.data)
@@ -108,6 +222,8 @@ class CompressionPayloadCodec(PayloadCodec):
                         "compressed_size": str(compressed_size).encode(),
                     }
                 )
+                if dict_id is not None:
+                    new_metadata[DICT_ID_METADATA_KEY] = dict_id
 
                 result.append(
                     Payload(
@@ -143,18 +259,19 @@ class CompressionPayloadCodec(PayloadCodec):
                 result.append(payload)
                 continue
 
+            if encoding not in _COMPRESSED_ENCODINGS:
+                logger.warning(f"Unknown compression encoding: {encoding}")
+                result.append(payload)
+                continue
+
             try:
-                # Decompress based on encoding
-                if encoding == "binary/zstd":
-                    decompressed_data = bytes(cramjam_zstd.decompress(payload.data))
-                elif encoding == "binary/gzip":
-                    decompressed_data = bytes(cramjam_gzip.decompress(payload.data))
-                elif encoding == "binary/brotli":
-                    decompressed_data = bytes(cramjam_brotli.decompress(payload.data))
+                # Decompress based on encoding, off the event loop if it's large
+                if len(payload.data) > self.offload_threshold:
+                    decompressed_data = await asyncio.to_thread(
+                        self._decompress, payload, encoding
+                    )
                 else:
-                    logger.warning(f"Unknown compression encoding: {encoding}")
-                    result.append(payload)
-                    continue
+                    decompressed_data = self._decompress(payload, encoding)
 
                 # Create new payload with original metadata restored
                 # Restore the original encoding that was preserved during compression
@@ -162,13 +279,7 @@ class CompressionPayloadCodec(PayloadCodec):
                 new_metadata = {
                     k: v
                     for k, v in payload.metadata.items()
-                    if k
-                    not in (
-                        "encoding",
-                        "original_encoding",
-                        "original_size",
-                        "compressed_size",
-                    )
+                    if k not in _COMPRESSION_METADATA_KEYS
                 }
                 # Restore the original encoding
                 if original_encoding:
@@ -47,6 +47,8 @@ class LoopStrategy(StrEnum):
     PARALLEL = "parallel"
     BATCH = "batch"
     SEQUENTIAL = "sequential"
+    WINDOW = "window"
+    """Keep `batch_size` iterations in flight, starting the next as soon as one completes."""
 
 
 class WaitStrategy(StrEnum):
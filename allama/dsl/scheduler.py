@@ -19,10 +19,15 @@ with workflow.unsafe.imports_passed_through():
 
     from allama.concurrency import cooperative
     from allama.contexts import ctx_stream_id
+    from allama.dsl._converter import to_payload_json
     from allama.dsl.action import (
         DSLActivities,
+        EvaluatedExpression,
+        EvaluateExpressionsActivityInput,
         EvaluateTemplatedObjectActivityInput,
         FinalizeGatherActivityInput,
+        collect_context_refs,
+        materialize_inline_context,
     )
     from allama.dsl.common import (
         RETRY_POLICIES,
@@ -44,6 +49,7 @@ with workflow.unsafe.imports_passed_through():
         ActionStatement,
         ExecutionContext,
         GatherArgs,
+        MaterializedExecutionContext,
         RunContext,
         ScatterArgs,
         StreamID,
@@ -57,7 +63,8 @@ with workflow.unsafe.imports_passed_through():
     )
     from allama.exceptions import TaskUnreachable
     from allama.expressions.common import ExprContext
-    from allama.expressions.core import extract_expressions
+    from allama.expressions.core import TemplateExpression, extract_expressions
+    from allama.expressions.functions import NON_DETERMINISTIC_FUNCTIONS
     from allama.logger import logger
     from allama.storage.object import (
         CollectionObject,
@@ -69,6 +76,21 @@ with workflow.unsafe.imports_passed_through():
     )
 
 
+_INLINE_EXPRESSION_PATCH_ID = "inline-expression-evaluation"
+"""Patch ID guarding in-workflow expression evaluation for replay of older histories."""
+
+_BATCHED_EXPRESSION_PATCH_ID = "batched-expression-evaluation"
+"""Patch ID guarding batched expression evaluation activities for replay of older histories."""
+
+
+@dataclass(slots=True)
+class _PendingExpression:
+    expression: str
+    context: ExecutionContext
+    stream_id: StreamID
+    future: asyncio.Future[Any]
+
+
 def _get_collection_size(stored: StoredObject) -> int:
     """Get the size of a stored collection.
 
@@ -157,6 +179,10 @@ class DSLScheduler:
             for ref in self.tasks
         }
         """Adjacency list of task dependencies (sorted for determinism)"""
+        self.task_action_refs: dict[str, tuple[str, ...]] = {
+            ref: self._extract_action_refs(task) for ref, task in self.tasks.items()
+        }
+        """Action refs used in each task's expressions (sorted for determinism)"""
 
         # Scope management
         self._root_context = context
@@ -170,6 +196,22 @@ class DSLScheduler:
         self.task_streams: defaultdict[Task, list[StreamID]] = defaultdict(list)
         self.open_streams: dict[Task, int] = {}
         """Used to track the number of scopes that have been closed for an scatter"""
+        self._result_owners: dict[str, dict[StreamID, StreamID | None]] = {}
+        """Memo of action ref -> lookup stream -> stream holding the result (or None).
+
+        Only stream result sets are cached, not results, so replacing a result
+        needs no invalidation. Adding a result goes through `set_action_result`.
+        """
+
+        # Expression evaluations waiting to be sent in one activity this tick
+        self._pending_expressions: list[_PendingExpression] = []
+        self._expression_flush: asyncio.Task[None] | None = None
+
+        # Metrics
+        self.expression_activities_avoided = 0
+        """Number of expressions evaluated in-workflow instead of in an activity"""
+        self.expression_activities_batched = 0
+        """Number of expression activities saved by batching evaluations"""
 
         self.logger.debug(
             "Scheduler config",
@@ -547,6 +589,8 @@ class DSLScheduler:
                 exceptions=self.task_exceptions,
                 n_visited=len(self.completed_tasks),
                 n_tasks=len(self.tasks),
+                expression_activities_avoided=self.expression_activities_avoided,
+                expression_activities_batched=self.expression_activities_batched,
             )
             # Cancel all pending tasks and wait for them to complete
             for task in pending_tasks:
@@ -563,6 +607,8 @@ class DSLScheduler:
         self.logger.info(
             "All tasks completed",
             n_tasks=len(self.tasks),
+            expression_activities_avoided=self.expression_activities_avoided,
+            expression_activities_batched=self.expression_activities_batched,
         )
         self.logger.debug(
             "All tasks completed (details)",
@@ -676,7 +722,9 @@ class DSLScheduler:
             context = self.build_stream_aware_context(stmt, task.stream_id)
             self.logger.debug("`run_if` condition", run_if=run_if)
             try:
-                expr_result = await self.resolve_expression(run_if, context)
+                expr_result = await self.resolve_expression(
+                    run_if, context, stream_id=task.stream_id
+                )
             except Exception as e:
                 raise ApplicationError(
                     f"Error evaluating `run_if` condition: {e}",
@@ -856,7 +904,9 @@ class DSLScheduler:
                 # This is the number of execution streams that will be synchronized by this gather
                 size = len(self.task_streams[parent_scatter])
                 result = [Sentinel.GATHER_UNSET for _ in range(size)]
-                parent_action_context[gather_ref] = TaskResult.from_result(result)
+                self.set_action_result(
+                    parent_stream_id, gather_ref, TaskResult.from_result(result)
+                )
 
             # Place an error object in the result
             # Do not pass the full object as some exceptions aren't serializable
@@ -963,7 +1013,6 @@ class DSLScheduler:
                         "Observed scatter, setting result to empty collection",
                         task=task,
                     )
-                    parent_action_context = self._get_action_context(parent_stream)
                     finalized = await workflow.execute_activity(
                         DSLActivities.finalize_gather_activity,
                         arg=FinalizeGatherActivityInput(
@@ -978,9 +1027,13 @@ class DSLScheduler:
                         start_to_close_timeout=timedelta(seconds=60),
                         retry_policy=RETRY_POLICIES["activity:fail_fast"],
                     )
-                    parent_action_context[task.ref] = TaskResult(
-                        result=finalized.result,
-                        result_typename=finalized.result.typename or "list",
+                    self.set_action_result(
+                        parent_stream,
+                        task.ref,
+                        TaskResult(
+                            result=finalized.result,
+                            result_typename=finalized.result.typename or "list",
+                        ),
                     )
                 else:
                     self.logger.debug(
@@ -1088,7 +1141,9 @@ class DSLScheduler:
             # This is the number of execution streams that will be synchronized by this gather
             size = len(self.task_streams[parent_scatter])
             result = [Sentinel.GATHER_UNSET for _ in range(size)]
-            parent_action_context[gather_ref] = TaskResult.from_result(result)
+            self.set_action_result(
+                parent_stream_id, gather_ref, TaskResult.from_result(result)
+            )
 
         # Access the raw list via get_data() and modify in place
         parent_action_context[gather_ref].get_data()[stream_idx] = item
@@ -1126,7 +1181,9 @@ class DSLScheduler:
         # Keeps items unless drop_nulls is True and item is None.
         # Automatically remove unset values (Sentinel.IMPLODE_UNSET).
         if gather_ref not in parent_action_context:
-            parent_action_context[gather_ref] = TaskResult.from_result([])
+            self.set_action_result(
+                parent_stream_id, gather_ref, TaskResult.from_result([])
+            )
         task_result = parent_action_context[gather_ref]
 
         # Gather items are StoredObjects produced in each execution stream.
@@ -1203,7 +1260,7 @@ class DSLScheduler:
         if finalized.errors:
             task_result = task_result.with_error(finalized.errors)
 
-        parent_action_context[gather_ref] = task_result
+        self.set_action_result(parent_stream_id, gather_ref, task_result)
         self.logger.debug(
             "Gather complete. Go back up to parent stream",
             task=task,
@@ -1219,13 +1276,31 @@ class DSLScheduler:
         context = self.get_context(stream_id)
         return context.get("ACTIONS", {})
 
+    def set_action_result(
+        self, stream_id: StreamID, action_ref: str, result: TaskResult
+    ) -> None:
+        """Set an action's result in a stream's context."""
+        actions_context = self._get_action_context(stream_id)
+        if action_ref not in actions_context:
+            # Lookups of this ref from descendant streams may now resolve here
+            self._result_owners.pop(action_ref, None)
+        actions_context[action_ref] = result
+
+    @staticmethod
+    def _extract_action_refs(task: ActionStatement) -> tuple[str, ...]:
+        expr_ctxs = extract_expressions(task.model_dump())
+        return tuple(sorted(expr_ctxs[ExprContext.ACTIONS]))
+
     def build_stream_aware_context(
         self, task: ActionStatement, stream_id: StreamID
     ) -> ExecutionContext:
         """Build a context that is aware of the stream hierarchy."""
-        expr_ctxs = extract_expressions(task.model_dump())
+        if self.tasks.get(task.ref) is task:
+            action_refs = self.task_action_refs[task.ref]
+        else:
+            action_refs = self._extract_action_refs(task)
         resolved_actions: dict[str, TaskResult] = {}
-        for action_ref in expr_ctxs[ExprContext.ACTIONS]:
+        for action_ref in action_refs:
             result = self.get_stream_aware_action_result(action_ref, stream_id)
             # Only include actions that exist in the stream hierarchy.
             # Actions that don't exist (return None) are omitted to prevent
@@ -1243,7 +1318,9 @@ class DSLScheduler:
         Resolve an action expression in a stream-aware manner.
 
         Traverses from the current stream up through the hierarchy until it finds
-        the action result or reaches the global stream.
+        the action result or reaches the global stream. The stream that resolved
+        the lookup is memoized until a result for `action_ref` is added to any
+        stream through `set_action_result`.
 
         Args:
             action_ref: The action reference to resolve (e.g., "webhook", "transform_1")
@@ -1258,11 +1335,20 @@ class DSLScheduler:
 
             # In global context
             result = scheduler.resolve_action_expression("webhook")
-
-        Performance
-        -----------
-        WE SHOULD TOTALLY CACHE THIS FUNCTION BTW
         """
+        owners = self._result_owners.setdefault(action_ref, {})
+        try:
+            owner = owners[stream_id]
+        except KeyError:
+            owner = owners[stream_id] = self._find_result_owner(action_ref, stream_id)
+        if owner is None:
+            return None
+        return self.streams[owner]["ACTIONS"][action_ref]
+
+    def _find_result_owner(
+        self, action_ref: str, stream_id: StreamID
+    ) -> StreamID | None:
+        """Find the nearest stream, starting at `stream_id`, that has a result for `action_ref`."""
         self.logger.trace(
             "Resolving action expression",
             action_ref=action_ref,
@@ -1282,7 +1368,7 @@ class DSLScheduler:
                         action_ref=action_ref,
                         stream_id=curr_stream,
                     )
-                    return actions_context[action_ref]
+                    return curr_stream
 
             # Move to parent stream
             curr_stream = self.stream_hierarchy.get(curr_stream)
@@ -1298,13 +1384,72 @@ class DSLScheduler:
         )
         return None
 
-    async def resolve_expression(
+    def _get_inline_operand(
         self, expression: str, context: ExecutionContext
+    ) -> MaterializedExecutionContext | None:
+        """Get the operand for evaluating `expression` in-workflow.
+
+        Returns None if the expression must be evaluated in an activity, i.e. it
+        can't be parsed, calls a non-deterministic function, or references
+        externalized values.
+        """
+        refs = collect_context_refs(expression)
+        if refs is None or refs.functions & NON_DETERMINISTIC_FUNCTIONS:
+            return None
+        operand = materialize_inline_context(context, refs=refs)
+        if operand is None:
+            return None
+        # Evaluate against the same values the activity would deserialize
+        return to_payload_json(operand)
+
+    async def resolve_expression(
+        self,
+        expression: str,
+        context: ExecutionContext,
+        *,
+        stream_id: StreamID | None = None,
     ) -> Any:
-        """Evaluate an expression."""
+        """Evaluate an expression.
+
+        Deterministic expressions over inline values are evaluated in-workflow.
+        Everything else is evaluated in an activity. If `stream_id` is given (the
+        stream `context` was built for), the evaluation is batched with others
+        requested in the same scheduling tick.
+        """
         self.logger.trace(
             "Resolving expression", expression=expression, context=context
         )
+        if (
+            workflow.patched(_INLINE_EXPRESSION_PATCH_ID)
+            and (operand := self._get_inline_operand(expression, context)) is not None
+        ):
+            try:
+                result = TemplateExpression(
+                    expression.strip(), operand=operand
+                ).result()
+            except Exception as e:
+                # Surface the error like a failed evaluation activity would
+                raise ApplicationError(
+                    str(e), type=e.__class__.__name__, non_retryable=True
+                ) from e
+            self.expression_activities_avoided += 1
+            return result
+        # Histories from before batching issued the activity right away, so don't
+        # defer it behind sibling tasks' commands when replaying them
+        if stream_id is None or not workflow.patched(_BATCHED_EXPRESSION_PATCH_ID):
+            return await self._evaluate_expression_activity(expression, context)
+
+        future = asyncio.get_running_loop().create_future()
+        if not self._pending_expressions:
+            self._expression_flush = asyncio.create_task(self._flush_expressions())
+        self._pending_expressions.append(
+            _PendingExpression(expression, context, stream_id, future)
+        )
+        return await future
+
+    async def _evaluate_expression_activity(
+        self, expression: str, context: ExecutionContext
+    ) -> Any:
         try:
             return await workflow.execute_activity(
                 DSLActivities.evaluate_single_expression_activity,
@@ -1319,3 +1464,78 @@ class DSLScheduler:
                     raise cause from None
                 case _:
                     raise
+
+    async def _flush_expressions(self) -> None:
+        """Evaluate the expressions requested in this scheduling tick together."""
+        # Let every task that became ready in this tick request its evaluation
+        await asyncio.sleep(0)
+        pending, self._pending_expressions = self._pending_expressions, []
+
+        if len(pending) == 1:
+            # A lone expression doesn't need the batch activity
+            [item] = pending
+            try:
+                result = await self._evaluate_expression_activity(
+                    item.expression, item.context
+                )
+            except Exception as e:
+                item.future.set_exception(e)
+            else:
+                item.future.set_result(result)
+            return
+
+        # Contexts built for one stream only differ in which ACTIONS they
+        # include, so share one context (and one materialization) per stream
+        operands: list[ExecutionContext] = []
+        operand_idx: dict[StreamID, int] = {}
+        expressions: list[tuple[str, int]] = []
+        for item in pending:
+            if (idx := operand_idx.get(item.stream_id)) is None:
+                idx = operand_idx[item.stream_id] = len(operands)
+                operands.append(ExecutionContext(**{**item.context, "ACTIONS": {}}))
+            operands[idx]["ACTIONS"].update(item.context.get("ACTIONS", {}))
+            expressions.append((item.expression, idx))
+
+        self.logger.debug(
+            "Evaluating expressions in batch",
+            n_expressions=len(pending),
+            n_operands=len(operands),
+        )
+        try:
+            evaluated: list[EvaluatedExpression] = await workflow.execute_activity(
+                DSLActivities.evaluate_expressions_activity,
+                arg=EvaluateExpressionsActivityInput(
+                    operands=operands, expressions=expressions
+                ),
+                start_to_close_timeout=timedelta(seconds=60),
+                retry_policy=RETRY_POLICIES["activity:fail_fast"],
+            )
+        except Exception as e:
+            cause = e.cause if isinstance(e, ActivityError) and e.cause else e
+            # Each waiter raises its own error, as with per-expression failures
+            for item in pending:
+                if isinstance(cause, ApplicationError):
+                    error = ApplicationError(
+                        cause.message,
+                        *cause.details,
+                        type=cause.type,
+                        non_retryable=cause.non_retryable,
+                    )
+                else:
+                    error = ApplicationError(
+                        str(cause), type=cause.__class__.__name__, non_retryable=True
+                    )
+                error.__cause__ = cause
+                item.future.set_exception(error)
+            return
+
+        self.expression_activities_batched += len(pending) - 1
+        for item, outcome in zip(pending, evaluated, strict=True):
+            if outcome.error is not None:
+                item.future.set_exception(
+                    ApplicationError(
+                        outcome.error, type=outcome.error_type, non_retryable=True
+                    )
+                )
+            else:
+                item.future.set_result(outcome.result)
@@ -3,7 +3,7 @@ from __future__ import annotations
 import asyncio
 import re
 import uuid
-from collections.abc import Awaitable, Generator, Iterator
+from collections.abc import Awaitable, Generator, Iterator, Sequence
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
@@ -147,6 +147,10 @@ with workflow.unsafe.imports_passed_through():
     from allama.workflow.schedules.service import WorkflowSchedulesService
 
 
+_CHILD_DSL_BY_REFERENCE_PATCH_ID = "child-dsl-by-reference"
+"""Patch ID guarding looped child workflows receiving their DSL by definition version."""
+
+
 def _inherit_search_attributes_with_alias(
     base_attrs: TypedSearchAttributes | None,
     alias: str,
@@ -278,7 +282,9 @@ class DSLWorkflow:
             # Otherwise, fetch the latest workflow definition
             self.logger.debug("Fetching latest workflow definition")
             try:
-                result = await self._get_workflow_definition(args.wf_id)
+                result = await self._get_workflow_definition(
+                    args.wf_id, version=args.definition_version
+                )
                 self.dsl = result.dsl
                 registry_lock = result.registry_lock
             except AllamaException as e:
@@ -288,7 +294,8 @@ class DSLWorkflow:
                     non_retryable=True,
                     type=e.__class__.__name__,
                 ) from e
-            self.dispatch_type = "pull"
+            # A parent that pinned the definition version still pushed this run
+            self.dispatch_type = "push" if args.definition_version else "pull"
 
         # Resolve registry lock if not provided or empty
         # This ensures all trigger paths (schedules, child workflows, API) have a valid lock
@@ -650,6 +657,8 @@ class DSLWorkflow:
         if retry_until is None:
             raise ValueError("Retry until is not set")
         ctx = self.context.copy()
+        # Don't leak results into the root stream's actions
+        ctx["ACTIONS"] = dict(ctx["ACTIONS"])
         result = None
         while True:
             # NOTE: This only works with successful results
@@ -940,8 +949,7 @@ class DSLWorkflow:
             raise ApplicationError(msg, non_retryable=True, type=err_type) from e
         finally:
             logger.trace("Setting action result", task_result=task_result)
-            context = self.get_context(stream_id)
-            context["ACTIONS"][task.ref] = task_result
+            self.scheduler.set_action_result(stream_id, task.ref, task_result)
         return task_result
 
     ERROR_TYPE_TO_MESSAGE = {
@@ -1132,25 +1140,34 @@ class DSLWorkflow:
         batch_size = {
             LoopStrategy.SEQUENTIAL: 1,
             LoopStrategy.BATCH: int(task.args.get("batch_size", 32)),
+            LoopStrategy.WINDOW: int(task.args.get("batch_size", 32)),
             LoopStrategy.PARALLEL: total_count,
         }[loop_strategy]
 
-        # Process in batches for concurrency control
         all_results: list[StoredObject] = []
-        batch_start = 0
-
-        while batch_start < total_count:
-            current_batch_size = min(batch_size, total_count - batch_start)
-            batch_results = await self._execute_child_workflow_batch_prepared(
+        if loop_strategy == LoopStrategy.WINDOW:
+            all_results = await self._execute_child_workflow_window_prepared(
                 task=task,
                 prepared=prepared,
-                batch_start=batch_start,
-                batch_size=current_batch_size,
+                window_size=batch_size,
                 fail_strategy=fail_strategy,
                 child_time_anchor=child_time_anchor,
             )
-            all_results.extend(batch_results)
-            batch_start += current_batch_size
+        else:
+            # Process in batches for concurrency control
+            batch_start = 0
+            while batch_start < total_count:
+                current_batch_size = min(batch_size, total_count - batch_start)
+                batch_results = await self._execute_child_workflow_batch_prepared(
+                    task=task,
+                    prepared=prepared,
+                    batch_start=batch_start,
+                    batch_size=current_batch_size,
+                    fail_strategy=fail_strategy,
+                    child_time_anchor=child_time_anchor,
+                )
+                all_results.extend(batch_results)
+                batch_start += current_batch_size
 
         # Synchronize by converting Sequence[StoredObject] -> CollectionObject
         stream_id = ctx_stream_id.get()
@@ -1185,24 +1202,10 @@ class DSLWorkflow:
         def iter_run_args() -> Iterator[tuple[int, DSLRunArgs]]:
             for i in range(batch_size):
                 loop_index = batch_start + i
-                config = prepared.get_config(loop_index)
-
-                # Get trigger_inputs for this specific iteration
-                # Works with both CollectionObject and InlineObject
-                trigger_inputs = prepared.get_trigger_input_at(loop_index)
-
                 yield (
                     loop_index,
-                    DSLRunArgs(
-                        role=self.role,
-                        dsl=prepared.dsl,
-                        wf_id=prepared.wf_id,
-                        trigger_inputs=trigger_inputs,
-                        parent_run_context=self.run_context,
-                        runtime_config=config,
-                        execution_type=self.execution_type,
-                        time_anchor=child_time_anchor,
-                        registry_lock=prepared.registry_lock,
+                    self._prepared_child_run_args(
+                        prepared, loop_index, child_time_anchor
                     ),
                 )
 
@@ -1225,8 +1228,90 @@ class DSLWorkflow:
             if any(isinstance(val, BaseException) for val in gather_result):
                 raise RuntimeError("One or more child workflows failed")
 
+        return self._to_child_workflow_results(gather_result)
+
+    async def _execute_child_workflow_window_prepared(
+        self,
+        task: ActionStatement,
+        prepared: PreparedSubflowResult,
+        window_size: int,
+        fail_strategy: FailStrategy,
+        child_time_anchor: datetime,
+    ) -> list[StoredObject]:
+        """Execute child workflows with up to `window_size` in flight.
+
+        Unlike batches, a new child starts as soon as any running child completes,
+        so one slow child only holds up its own slot. Results are in input order.
+        """
+        total_count = prepared.count
+        results: list[StoredObject | BaseException | None] = [None] * total_count
+        loop_indices = iter(range(total_count))
+        failed = False
+
+        async def run_slot() -> None:
+            nonlocal failed
+            # Slots share the index iterator, so children start in input order.
+            # Completions are replayed in history order, so this is deterministic.
+            for loop_index in loop_indices:
+                if failed and fail_strategy == FailStrategy.ALL:
+                    return
+                self.logger.trace(
+                    "Run child workflow window (prepared)",
+                    loop_index=loop_index,
+                    fail_strategy=fail_strategy,
+                )
+                run_args = self._prepared_child_run_args(
+                    prepared, loop_index, child_time_anchor
+                )
+                try:
+                    results[loop_index] = await self._run_child_workflow(
+                        task, run_args, loop_index=loop_index
+                    )
+                except Exception as e:
+                    results[loop_index] = e
+                    failed = True
+
+        n_slots = min(max(window_size, 1), total_count)
+        await asyncio.gather(*(run_slot() for _ in range(n_slots)))
+
+        if failed and fail_strategy == FailStrategy.ALL:
+            raise RuntimeError("One or more child workflows failed")
+
+        return self._to_child_workflow_results(results)
+
+    def _prepared_child_run_args(
+        self,
+        prepared: PreparedSubflowResult,
+        loop_index: int,
+        child_time_anchor: datetime,
+    ) -> DSLRunArgs:
+        # Pass the definition by version so each child's start event doesn't
+        # carry a copy of it. Children fetch it on start (cached per worker).
+        if prepared.definition_version is not None and workflow.patched(
+            _CHILD_DSL_BY_REFERENCE_PATCH_ID
+        ):
+            dsl, definition_version = None, prepared.definition_version
+        else:
+            dsl, definition_version = prepared.dsl, None
+        return DSLRunArgs(
+            role=self.role,
+            dsl=dsl,
+            definition_version=definition_version,
+            wf_id=prepared.wf_id,
+            # Works with both CollectionObject and InlineObject
+            trigger_inputs=prepared.get_trigger_input_at(loop_index),
+            parent_run_context=self.run_context,
+            runtime_config=prepared.get_config(loop_index),
+            execution_type=self.execution_type,
+            time_anchor=child_time_anchor,
+            registry_lock=prepared.registry_lock,
+        )
+
+    @staticmethod
+    def _to_child_workflow_results(values: Sequence[Any]) -> list[StoredObject]:
+        """Convert child workflow outcomes to results, turning errors into error info."""
         result: list[StoredObject] = []
-        for val in gather_result:
+        for val in values:
             match val:
                 case BaseException():
                     result.append(
@@ -1278,6 +1363,8 @@ class DSLWorkflow:
         batch_size = {
             LoopStrategy.SEQUENTIAL: 1,
             LoopStrategy.BATCH: sf_context.batch_size,
+            # Args are resolved per batch here, so windows run as batches
+            LoopStrategy.WINDOW: sf_context.batch_size,
             LoopStrategy.PARALLEL: total_count,  # All at once
         }[loop_strategy]
 
@@ -1404,16 +1491,7 @@ class DSLWorkflow:
             if any(isinstance(val, BaseException) for val in gather_result):
                 raise RuntimeError("One or more child workflows failed")
 
-        result: list[StoredObject] = []
-        for val in gather_result:
-            match val:
-                case BaseException():
-                    result.append(
-                        InlineObject(data=dsl_execution_error_from_exception(val))
-                    )
-                case _:
-                    result.append(StoredObjectValidator.validate_python(val))
-        return result
+        return self._to_child_workflow_results(gather_result)
 
     async def _handle_return(self) -> StoredObject:
         self.logger.debug("Handling return", context=self.context)
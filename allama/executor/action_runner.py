@@ -7,8 +7,9 @@ All execution is untrusted - DB credentials are never passed to subprocesses.
 Secrets and variables are pre-resolved on the host.
 
 Key features:
-- Tarball extraction: Downloads and extracts pre-built venv tarballs from S3
-- Caching: Reuses extracted tarballs by cache key for fast subsequent runs
+- Tarball extraction: Streams pre-built venv tarballs from S3 into extraction
+- Caching: Reuses extracted tarballs by cache key for fast subsequent runs, evicting
+  the least recently used ones past a size bound
 - Subprocess execution: Runs actions via minimal_runner.py
 - nsjail sandboxing: Optional OS-level isolation with resource limits
 - Timeout handling: Kills subprocess on timeout
@@ -21,10 +22,15 @@ import hashlib
 import os
 import shutil
 import sys
-import tarfile
 import tempfile
+import threading
 import time
+import uuid
+from collections import Counter
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import closing, contextmanager
 from pathlib import Path
+from queue import Full, Queue
 from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse
 
@@ -34,11 +40,17 @@ from pydantic_core import to_json
 
 from allama import config
 from allama.auth.executor_tokens import mint_executor_token
+from allama.concurrency import single_flight
 from allama.executor.schemas import (
     ExecutorActionErrorInfo,
     ResolvedContext,
 )
 from allama.logger import logger
+from allama.registry.sync.schemas import TarballVenvManifest
+from allama.registry.sync.tarball import (
+    detect_tarball_compression,
+    open_tarball_stream,
+)
 from allama.sandbox.executor import ActionSandboxConfig, NsjailExecutor
 from allama.sandbox.types import ResourceLimits
 from allama.storage import blob
@@ -49,6 +61,10 @@ if TYPE_CHECKING:
 
 type ExecutionResult = Any | ExecutorActionErrorInfo
 
+_TARBALL_DIR_PREFIX = "tarball-"
+_LAYER_DIR_PREFIX = "layer-"
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 def _get_allama_app_dir() -> Path:
     """Get the allama package directory for sandbox mounting.
@@ -114,33 +130,159 @@ def _parse_s3_uri(uri: str) -> tuple[str, str]:
     return bucket, key
 
 
+class _ChunkReader:
+    """Minimal read-only file object over an iterator of byte chunks.
+
+    Lets tarfile extract a download in stream mode as it arrives.
+    """
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = bytearray()
+        self.bytes_read = 0
+
+    def peek(self, size: int) -> bytes:
+        """Return up to size bytes without consuming them."""
+        while len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        return bytes(self._buffer[:size])
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0 or size >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        self.bytes_read += len(data)
+        return data
+
+
+def _prefetch(
+    chunks: Iterator[bytes], max_chunks: int = 8
+) -> Generator[bytes, None, None]:
+    """Read chunks ahead in a background thread so downloading overlaps extraction."""
+    queue: Queue[bytes | BaseException | None] = Queue(max_chunks)
+    stopped = threading.Event()
+
+    def _put(item: bytes | BaseException | None) -> bool:
+        while not stopped.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            for chunk in chunks:
+                if not _put(chunk):
+                    return
+        except BaseException as e:
+            _put(e)
+        else:
+            _put(None)
+
+    producer = threading.Thread(target=_produce, daemon=True)
+    producer.start()
+    try:
+        while (item := queue.get()) is not None:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Stop the producer before the caller closes the underlying response
+        stopped.set()
+        producer.join()
+
+
+def _link_layers(layer_dirs: Iterable[Path], target_dir: Path) -> int:
+    """Assemble extracted venv layers into one directory with hardlinks.
+
+    Later layers win where files overlap, as when installing them in order.
+
+    Returns:
+        The total size of the assembled files, in bytes.
+    """
+    total = 0
+    for layer_dir in layer_dirs:
+        for root, _, files in os.walk(layer_dir):
+            dest_root = target_dir / os.path.relpath(root, layer_dir)
+            dest_root.mkdir(parents=True, exist_ok=True)
+            for name in files:
+                src = os.path.join(root, name)
+                dst = dest_root / name
+                dst.unlink(missing_ok=True)
+                try:
+                    os.link(src, dst, follow_symlinks=False)
+                except OSError:
+                    # e.g. a filesystem without hardlinks
+                    shutil.copy2(src, dst, follow_symlinks=False)
+                total += os.lstat(src).st_size
+    return total
+
+
+def _dir_size(path: Path) -> int:
+    """Total size of the files under a directory, in bytes."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
 class ActionRunner:
     """Runs registry actions in subprocesses with tarball venv caching.
 
     This runner:
     1. Computes a cache key from the tarball URI
-    2. Downloads and extracts tarballs to a cached target directory
+    2. Streams and extracts tarballs to a cached target directory
     3. Executes the action in a subprocess with PYTHONPATH set
     4. Returns the result or error
+
+    Layered artifacts (a manifest of content-addressed layers) are assembled
+    from individually cached layers, so versions share unchanged layers.
+
+    Extracted tarballs are evicted least recently used first once the cache
+    exceeds ALLAMA__EXECUTOR_REGISTRY_CACHE_MAX_SIZE_MB. Entries pinned by a
+    running action, or used within the executor client timeout (possibly by
+    another process sharing the cache directory), are never evicted. Sizes of
+    files shared by hardlink are counted for every entry, so the bound is
+    conservative.
     """
 
     def __init__(self, cache_dir: Path | None = None):
         self.cache_dir = cache_dir or Path(config.ALLAMA__EXECUTOR_REGISTRY_CACHE_DIR)
-        # Per-cache-key locks to prevent duplicate downloads in async context
-        self._extraction_locks: dict[str, asyncio.Lock] = {}
-        self._locks_lock = asyncio.Lock()  # Protects _extraction_locks dict
+        # In-flight extractions, shared by concurrent requests for the same entry
+        self._extractions: dict[str, asyncio.Task[Path]] = {}
+        # Number of running actions using each cache key in this process
+        self._in_use: Counter[str] = Counter()
+        # Known sizes of cache entries (by directory name), so they're only measured once
+        self._entry_sizes: dict[str, int] = {}
         logger.info("ActionRunner initialized", cache_dir=str(self.cache_dir))
 
-    async def _get_extraction_lock(self, cache_key: str) -> asyncio.Lock:
-        """Get or create a lock for the given cache key.
-
-        This prevents multiple concurrent async tasks from downloading
-        the same tarball simultaneously.
-        """
-        async with self._locks_lock:
-            if cache_key not in self._extraction_locks:
-                self._extraction_locks[cache_key] = asyncio.Lock()
-            return self._extraction_locks[cache_key]
+    @contextmanager
+    def _pinned(self, cache_keys: Iterable[str]) -> Iterator[None]:
+        """Protect extracted tarballs from eviction while they're in use."""
+        cache_keys = list(cache_keys)
+        self._in_use.update(cache_keys)
+        try:
+            yield
+        finally:
+            self._in_use.subtract(cache_keys)
+            self._in_use += Counter()  # Drop keys no longer in use
 
     async def _tarball_uri_to_http_url(self, s3_uri: str) -> str:
         """Convert S3 URI to presigned HTTP URL for tarball download."""
@@ -181,113 +323,232 @@ class ActionRunner:
     async def ensure_tarball_extracted(self, cache_key: str, tarball_uri: str) -> Path:
         """Ensure tarball is extracted to a target directory.
 
-        Uses per-cache-key locking to prevent duplicate downloads from
-        concurrent async tasks. Falls back to atomic rename pattern for
-        cross-process coordination (e.g., multiple worker pods).
+        Concurrent requests for the same cache key share a single download and
+        extraction. Falls back to atomic rename pattern for cross-process
+        coordination (e.g., multiple worker pods).
 
         Returns the path to the extracted directory (add to PYTHONPATH).
         """
-        target_dir = self.cache_dir / f"tarball-{cache_key}"
+        return await self._ensure_extracted(
+            f"{_TARBALL_DIR_PREFIX}{cache_key}", tarball_uri
+        )
 
-        # Fast path: already extracted (no lock needed for read check)
-        if target_dir.exists():
-            logger.debug("Using cached tarball extraction", cache_key=cache_key)
-            return target_dir
+    async def _ensure_extracted(self, entry_name: str, tarball_uri: str) -> Path:
+        """Ensure a tarball (or layered artifact) is extracted to a cache entry."""
+        target_dir = self.cache_dir / entry_name
 
-        # Acquire per-cache-key lock to prevent duplicate downloads
-        lock = await self._get_extraction_lock(cache_key)
-        async with lock:
-            # Double-check after acquiring lock (another task may have finished)
-            if target_dir.exists():
-                logger.debug(
-                    "Tarball extracted by another task while waiting",
-                    cache_key=cache_key,
-                )
-                return target_dir
+        # Fast path: already extracted. Touch it to record the use for eviction.
+        try:
+            os.utime(target_dir)
+        except FileNotFoundError:
+            pass
+        else:
+            logger.debug("Using cached tarball extraction", entry=entry_name)
+            return target_dir
 
-            logger.info("Downloading and extracting tarball", cache_key=cache_key)
-            start_time = time.monotonic()
+        if entry_name in self._extractions:
+            logger.debug("Waiting for in-flight tarball extraction", entry=entry_name)
+        return await single_flight(
+            self._extractions,
+            entry_name,
+            lambda: self._extract_and_cache(entry_name, tarball_uri, target_dir),
+        )
 
-            # Use PID + unique ID in temp names to avoid conflicts
-            # PID handles cross-process conflicts, unique_id handles concurrent async tasks
-            unique_id = id(asyncio.current_task())
-            temp_tarball = (
-                self.cache_dir / f"{cache_key}.{os.getpid()}.{unique_id}.tar.gz"
-            )
-            temp_dir = self.cache_dir / f"{cache_key}.{os.getpid()}.{unique_id}.tmp"
+    async def _extract_and_cache(
+        self, entry_name: str, tarball_uri: str, target_dir: Path
+    ) -> Path:
+        """Stream a tarball into a temp directory and atomically move it into place."""
+        logger.info("Downloading and extracting tarball", entry=entry_name)
+        start_time = time.monotonic()
 
-            try:
-                # Create cache dir if needed
-                self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Temp names are unique so concurrent extractions of one entry (by other
+        # processes, or on another event loop here) never share a directory. Keep
+        # the entry prefix out so directory scans never mistake it for an entry.
+        scratch_name = entry_name.replace("-", ".", 1)
+        temp_dir = self.cache_dir / f"{scratch_name}.{uuid.uuid4().hex}.tmp"
 
-                # Download tarball
-                download_start = time.monotonic()
+        try:
+            # Create cache dir if needed
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_dir.mkdir(parents=True, exist_ok=True)
+
+            # Layered artifacts point at their JSON manifest
+            if tarball_uri.endswith(".json"):
+                size_bytes = await self._assemble_layers(tarball_uri, temp_dir)
+            else:
                 http_url = await self._tarball_uri_to_http_url(tarball_uri)
-                await self._download_file(http_url, temp_tarball)
-                download_elapsed = (time.monotonic() - download_start) * 1000
+                size_bytes = await self._stream_extract_tarball(http_url, temp_dir)
 
-                # Extract tarball
-                extract_start = time.monotonic()
-                temp_dir.mkdir(parents=True, exist_ok=True)
-                await self._extract_tarball(temp_tarball, temp_dir)
-                extract_elapsed = (time.monotonic() - extract_start) * 1000
-
-                # Atomic rename - if another process won the race, this fails
-                try:
-                    temp_dir.rename(target_dir)
-                    total_elapsed = (time.monotonic() - start_time) * 1000
-                    logger.info(
-                        "Tarball extracted and cached",
-                        cache_key=cache_key,
-                        download_ms=f"{download_elapsed:.1f}",
-                        extract_ms=f"{extract_elapsed:.1f}",
-                        total_ms=f"{total_elapsed:.1f}",
+            # Atomic rename - if another process won the race, this fails
+            try:
+                temp_dir.rename(target_dir)
+                total_elapsed = (time.monotonic() - start_time) * 1000
+                logger.info(
+                    "Tarball extracted and cached",
+                    entry=entry_name,
+                    size_bytes=size_bytes,
+                    total_ms=f"{total_elapsed:.1f}",
+                )
+            except OSError:
+                # Another process already created target_dir - that's fine
+                if target_dir.exists():
+                    logger.debug(
+                        "Tarball already extracted by another process",
+                        entry=entry_name,
                     )
-                except OSError:
-                    # Another process already created target_dir - that's fine
-                    if target_dir.exists():
-                        logger.debug(
-                            "Tarball already extracted by another process",
-                            cache_key=cache_key,
-                        )
-                    else:
-                        raise
-            finally:
-                # Clean up temp files
-                if temp_dir.exists():
-                    shutil.rmtree(temp_dir, ignore_errors=True)
-                if temp_tarball.exists():
-                    temp_tarball.unlink(missing_ok=True)
+                else:
+                    raise
+            self._entry_sizes[entry_name] = size_bytes
+        finally:
+            # Clean up temp files
+            if temp_dir.exists():
+                shutil.rmtree(temp_dir, ignore_errors=True)
 
-            return target_dir
+        try:
+            await self._evict_lru()
+        except Exception as e:
+            logger.warning("Failed to evict registry cache entries", error=str(e))
+        return target_dir
 
-    async def _download_file(self, url: str, output_path: Path) -> None:
-        """Download a file from HTTP URL to local path."""
+    async def _assemble_layers(self, manifest_uri: str, target_dir: Path) -> int:
+        """Extract each layer of a layered artifact and assemble them in target_dir.
+
+        Layers are cached individually by digest, so only layers that aren't
+        already cached are downloaded.
+
+        Returns:
+            The total size of the assembled files, in bytes.
+        """
+        bucket, _ = _parse_s3_uri(manifest_uri)
+        http_url = await self._tarball_uri_to_http_url(manifest_uri)
         async with httpx.AsyncClient(follow_redirects=True) as client:
-            response = await client.get(url)
+            response = await client.get(http_url)
             response.raise_for_status()
-            output_path.write_bytes(response.content)
+        manifest = TarballVenvManifest.model_validate_json(response.content)
+
+        for layer in manifest.layers:
+            if layer.key is None:
+                raise ValueError(f"Layer {layer.name} has no object key")
+        layer_dirs = await asyncio.gather(
+            *(
+                self._ensure_extracted(
+                    f"{_LAYER_DIR_PREFIX}{layer.digest[:16]}",
+                    f"s3://{bucket}/{layer.key}",
+                )
+                for layer in manifest.layers
+            )
+        )
+        size_bytes = await asyncio.to_thread(_link_layers, layer_dirs, target_dir)
+        logger.debug(
+            "Assembled layered tarball venv",
+            num_layers=len(layer_dirs),
+            size_bytes=size_bytes,
+        )
+        return size_bytes
+
+    async def _stream_extract_tarball(self, url: str, target_dir: Path) -> int:
+        """Download a gzip or zstd tarball and extract it as it arrives.
+
+        The compression format is detected from the first bytes of the download.
+
+        Returns:
+            The total size of the extracted files, in bytes.
+        """
+
+        def _do_stream_extract() -> tuple[int, int]:
+            with httpx.stream("GET", url, follow_redirects=True) as response:
+                response.raise_for_status()
+                chunks = _prefetch(response.iter_bytes(_DOWNLOAD_CHUNK_SIZE))
+                with closing(chunks):
+                    reader = _ChunkReader(chunks)
+                    compression = detect_tarball_compression(reader.peek(4))
+                    with open_tarball_stream(reader, compression) as tar:
+                        # Use filter='data' to prevent path traversal attacks (CVE-2007-4559)
+                        tar.extractall(path=target_dir, filter="data")
+                        extracted_size = sum(member.size for member in tar.getmembers())
+            return reader.bytes_read, extracted_size
+
+        downloaded_size, extracted_size = await asyncio.to_thread(_do_stream_extract)
 
         # Log only the path portion to avoid leaking presigned URL signatures
         parsed = urlparse(url)
         safe_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
         logger.debug(
-            "File downloaded",
+            "Tarball streamed and extracted",
             url=safe_url[:80],
-            size_bytes=output_path.stat().st_size,
+            target=str(target_dir),
+            downloaded_bytes=downloaded_size,
+            extracted_bytes=extracted_size,
+        )
+        return extracted_size
+
+    async def _evict_lru(self) -> None:
+        """Evict least recently used tarball extractions past the cache size bound."""
+        max_bytes = config.ALLAMA__EXECUTOR_REGISTRY_CACHE_MAX_SIZE_MB * 1024 * 1024
+        if max_bytes <= 0:
+            return
+
+        def _scan() -> list[tuple[float, str, int]]:
+            entries: list[tuple[float, str, int]] = []
+            for path in self.cache_dir.iterdir():
+                if not path.name.startswith((_TARBALL_DIR_PREFIX, _LAYER_DIR_PREFIX)):
+                    continue
+                try:
+                    mtime = path.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                size = self._entry_sizes.get(path.name)
+                if size is None:
+                    size = _dir_size(path)
+                entries.append((mtime, path.name, size))
+            return entries
+
+        entries = await asyncio.to_thread(_scan)
+        total = 0
+        for _, entry_name, size in entries:
+            self._entry_sizes.setdefault(entry_name, size)
+            total += size
+        if total <= max_bytes:
+            return
+
+        # Entries used this recently may back an action running in another process
+        in_use_cutoff = time.time() - config.ALLAMA__EXECUTOR_CLIENT_TIMEOUT
+        evicted: list[Path] = []
+        for mtime, entry_name, size in sorted(entries):
+            if total <= max_bytes:
+                break
+            cache_key = entry_name.removeprefix(_TARBALL_DIR_PREFIX)
+            if self._in_use[cache_key] or mtime > in_use_cutoff:
+                continue
+            # Rename first so the entry disappears atomically for other readers
+            scratch_name = entry_name.replace("-", ".", 1)
+            evicting_dir = (
+                self.cache_dir / f"{scratch_name}.{uuid.uuid4().hex}.evicting"
+            )
+            try:
+                (self.cache_dir / entry_name).rename(evicting_dir)
+            except OSError:
+                # Already evicted by another process
+                continue
+            self._entry_sizes.pop(entry_name, None)
+            total -= size
+            evicted.append(evicting_dir)
+
+        if not evicted:
+            logger.warning(
+                "Registry cache exceeds its size bound but every entry is in use",
+                size_bytes=total,
+                max_bytes=max_bytes,
+            )
+            return
+        for evicting_dir in evicted:
+            await asyncio.to_thread(shutil.rmtree, evicting_dir, ignore_errors=True)
+        logger.info(
+            "Evicted registry cache entries",
+            count=len(evicted),
+            size_bytes=total,
+            max_bytes=max_bytes,
         )
-
-    async def _extract_tarball(self, tarball_path: Path, target_dir: Path) -> None:
-        """Extract a gzipped tarball to target directory."""
-
-        def _do_extract() -> None:
-            with tarfile.open(tarball_path, "r:gz") as tar:
-                # Extract all contents to target directory
-                # Use filter='data' to prevent path traversal attacks (CVE-2007-4559)
-                tar.extractall(path=target_dir, filter="data")
-
-        await asyncio.to_thread(_do_extract)
-        logger.debug("Tarball extracted", target=str(target_dir))
 
     async def execute_action(
         self,
@@ -319,54 +580,60 @@ class ActionRunner:
         """
         timeout = timeout or config.ALLAMA__EXECUTOR_CLIENT_TIMEOUT
 
-        # Download and extract each tarball venv, collect paths in deterministic order
-        registry_paths: list[Path] = []
-        if tarball_uris:
-            for tarball_uri in tarball_uris:
-                cache_key = self.compute_tarball_cache_key(tarball_uri)
-                target_dir = await self.ensure_tarball_extracted(cache_key, tarball_uri)
-                registry_paths.append(target_dir)
-            logger.info(
-                "Using tarball venvs",
-                count=len(registry_paths),
-            )
-        else:
-            # No tarballs available - use empty base dir
-            base_dir = self.cache_dir / "base"
-            base_dir.mkdir(parents=True, exist_ok=True)
-            registry_paths = [base_dir]
-            logger.info("No tarball URIs provided, using base PYTHONPATH")
-
-        # Check if sandbox execution is enabled and available
-        # force_sandbox=True overrides config (used by ephemeral backend)
-        use_sandbox = force_sandbox or (
-            config.ALLAMA__EXECUTOR_SANDBOX_ENABLED and _is_sandbox_available()
-        )
-        logger.debug(
-            "Using sandbox execution",
-            use_sandbox=use_sandbox,
-            force_sandbox=force_sandbox,
-        )
-
-        if use_sandbox:
-            return await self._execute_sandboxed(
-                input=input,
-                role=role,
-                registry_paths=registry_paths,
-                env_vars=env_vars,
-                timeout=timeout,
-                resolved_context=resolved_context,
+        # Pin the tarball venvs so they aren't evicted while the action runs
+        cache_keys = [self.compute_tarball_cache_key(uri) for uri in tarball_uris or []]
+        with self._pinned(cache_keys):
+            # Download and extract each tarball venv, collect paths in deterministic order
+            registry_paths: list[Path] = []
+            if tarball_uris:
+                for cache_key, tarball_uri in zip(
+                    cache_keys, tarball_uris, strict=True
+                ):
+                    target_dir = await self.ensure_tarball_extracted(
+                        cache_key, tarball_uri
+                    )
+                    registry_paths.append(target_dir)
+                logger.info(
+                    "Using tarball venvs",
+                    count=len(registry_paths),
+                )
+            else:
+                # No tarballs available - use empty base dir
+                base_dir = self.cache_dir / "base"
+                base_dir.mkdir(parents=True, exist_ok=True)
+                registry_paths = [base_dir]
+                logger.info("No tarball URIs provided, using base PYTHONPATH")
+
+            # Check if sandbox execution is enabled and available
+            # force_sandbox=True overrides config (used by ephemeral backend)
+            use_sandbox = force_sandbox or (
+                config.ALLAMA__EXECUTOR_SANDBOX_ENABLED and _is_sandbox_available()
             )
-        else:
-            return await self._execute_direct(
-                input=input,
-                role=role,
-                registry_paths=registry_paths,
-                env_vars=env_vars,
-                timeout=timeout,
-                resolved_context=resolved_context,
+            logger.debug(
+                "Using sandbox execution",
+                use_sandbox=use_sandbox,
+                force_sandbox=force_sandbox,
             )
 
+            if use_sandbox:
+                return await self._execute_sandboxed(
+                    input=input,
+                    role=role,
+                    registry_paths=registry_paths,
+                    env_vars=env_vars,
+                    timeout=timeout,
+                    resolved_context=resolved_context,
+                )
+            else:
+                return await self._execute_direct(
+                    input=input,
+                    role=role,
+                    registry_paths=registry_paths,
+                    env_vars=env_vars,
+                    timeout=timeout,
+                    resolved_context=resolved_context,
+                )
+
     async def _execute_sandboxed(
         self,
         input: RunActionInput,
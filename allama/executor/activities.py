@@ -31,7 +31,13 @@ from allama.exceptions import (
 from allama.executor.backends import get_executor_backend
 from allama.executor.service import dispatch_action
 from allama.logger import logger
-from allama.storage.object import StoredObject, action_key, get_object_storage
+from allama.storage.object import (
+    CollectionObject,
+    StoredObject,
+    action_collection_prefix,
+    action_key,
+    get_object_storage,
+)
 
 
 class ExecutorActivities:
@@ -109,8 +115,18 @@ class ExecutorActivities:
                         attempt_number=attempt_manager.retry_state.attempt_number,
                     )
                     result = await dispatch_action(
-                        backend=backend, input=materialized_input
+                        backend=backend,
+                        input=materialized_input,
+                        collection_key=action_collection_prefix(
+                            workspace_id=str(role.workspace_id),
+                            wf_exec_id=input.run_context.wf_exec_id,
+                            stream_id=input.stream_id,
+                            ref=task.ref,
+                        ),
                     )
+                    # Large for_each results are already streamed to a collection
+                    if isinstance(result, CollectionObject):
+                        return result
 
                     # Always wrap result in StoredObject envelope
                     # - get_object_storage() returns S3ObjectStorage when externalization is enabled
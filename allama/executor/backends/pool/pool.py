@@ -34,6 +34,8 @@ Communication:
 - Each sandbox has a /work directory mounted from host
 - Worker creates Unix socket at /work/task.sock
 - Host connects to /tmp/sandbox-{id}/work/task.sock
+- Host keeps one long-lived connection per worker and multiplexes requests
+  over it, matching responses to requests by `request_id`
 """
 
 from __future__ import annotations
@@ -83,6 +85,130 @@ def get_available_cpus() -> int:
     return os.cpu_count() or 4
 
 
+class WorkerConnection:
+    """Long-lived connection to a pool worker that multiplexes requests.
+
+    Every message is an orjson body behind a 4-byte length prefix. Requests
+    carry a `request_id` and the worker answers with
+    `{"request_id": ..., "response": ...}`, so many tasks can be in flight on
+    one socket and complete out of order. A bare ExecutorResult without a
+    `request_id` is a connection-level error and fails every pending request.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        worker_id: int,
+    ) -> None:
+        self.worker_id = worker_id
+        self._reader = reader
+        self._writer = writer
+        self._write_lock = asyncio.Lock()
+        self._pending: dict[int, asyncio.Future[dict[str, Any]]] = {}
+        self._next_request_id = 0
+        self._read_task = asyncio.create_task(self._read_loop())
+
+    @classmethod
+    async def open(
+        cls, socket_path: Path, worker_id: int, timeout: float = 5.0
+    ) -> WorkerConnection:
+        """Connect to a worker's socket."""
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_unix_connection(str(socket_path)),
+            timeout=timeout,
+        )
+        return cls(reader, writer, worker_id)
+
+    @property
+    def closed(self) -> bool:
+        return self._read_task.done()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def request(self, request: dict[str, Any], timeout: float) -> dict[str, Any]:
+        """Send a request and wait for its response.
+
+        Raises:
+            ConnectionError: If the connection is closed before a response arrives.
+            TimeoutError: If no response arrives within `timeout` seconds.
+        """
+        if self.closed:
+            raise ConnectionError(f"Connection to worker {self.worker_id} is closed")
+
+        request_id = self._next_request_id
+        self._next_request_id += 1
+        future: asyncio.Future[dict[str, Any]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._pending[request_id] = future
+        try:
+            request_bytes = orjson.dumps({**request, "request_id": request_id})
+            length_prefix = len(request_bytes).to_bytes(4, "big")
+            async with self._write_lock:
+                self._writer.write(length_prefix + request_bytes)
+                await self._writer.drain()
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            # A late response for a timed out or cancelled request is dropped
+            self._pending.pop(request_id, None)
+
+    async def _read_loop(self) -> None:
+        """Dispatch responses to their pending requests until the socket closes."""
+        error: BaseException = ConnectionError(
+            f"Connection to worker {self.worker_id} closed"
+        )
+        try:
+            while True:
+                length_bytes = await self._reader.readexactly(4)
+                response_length = int.from_bytes(length_bytes, "big")
+                message = orjson.loads(await self._reader.readexactly(response_length))
+                request_id = message.get("request_id")
+                if request_id is None:
+                    # The worker couldn't attribute this error to one request
+                    # (e.g. an unreadable frame), so it applies to all of them
+                    for future in self._pending.values():
+                        if not future.done():
+                            future.set_result(message)
+                    continue
+                future = self._pending.get(request_id)
+                if future is not None and not future.done():
+                    future.set_result(message["response"])
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(
+                "Worker connection read loop failed",
+                worker_id=self.worker_id,
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            error = ConnectionError(
+                f"Connection to worker {self.worker_id} failed: {e}"
+            )
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+
+    async def close(self) -> None:
+        """Close the connection and fail any in-flight requests."""
+        self._read_task.cancel()
+        try:
+            await self._read_task
+        except asyncio.CancelledError:
+            pass
+        try:
+            self._writer.close()
+            await self._writer.wait_closed()
+        except Exception:
+            pass  # Ignore errors during cleanup
+
+
 @dataclass
 class WorkerInfo:
     """Metadata about a pool worker."""
@@ -101,6 +227,8 @@ class WorkerInfo:
     oldest_task_started_at: float = (
         0.0  # Timestamp of oldest active task (for stuck detection)
     )
+    connection: WorkerConnection | None = field(default=None, repr=False)
+    connection_lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
 
 
 @dataclass
@@ -117,6 +245,9 @@ class WorkerPool:
 
     Each worker can handle multiple concurrent tasks (up to max_concurrent_per_worker)
     via its internal thread pool. This allows better utilization of warm workers.
+
+    With `multiplex_connections` (the default), tasks for a worker share one
+    long-lived connection. Otherwise each task opens its own connection.
     """
 
     size: int = 8
@@ -126,8 +257,11 @@ class WorkerPool:
     )
     startup_timeout: float = 60.0
     memory_limit_mb: int = 512
+    multiplex_connections: bool = True
     _workers: list[WorkerInfo] = field(default_factory=list)
     _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Signalled (under _lock) whenever a worker slot frees up
+    _slot_available: asyncio.Condition = field(init=False, repr=False)
     _started: bool = False
     _base_dir: Path = field(
         default_factory=lambda: Path(tempfile.gettempdir()) / "allama-pool-workers"
@@ -169,6 +303,11 @@ class WorkerPool:
     _lifetime_tasks_queued: int = 0  # Tasks that had to wait for a worker slot
     _peak_tasks_waiting: int = 0  # Max concurrent tasks waiting at any point
 
+    # Queue wait metrics (in milliseconds, for tasks that acquired a slot after waiting)
+    _queue_waits: int = 0
+    _queue_wait_time_total_ms: float = 0.0
+    _queue_wait_time_max_ms: float = 0.0
+
     # Latency metrics (in milliseconds)
     _total_task_time_ms: float = 0.0  # Cumulative for avg calculation
     _max_task_time_ms: float = 0.0  # Slowest task
@@ -178,6 +317,9 @@ class WorkerPool:
     _per_worker_tasks_completed: dict[int, int] = field(default_factory=dict)
     _per_worker_recycles: dict[int, int] = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        self._slot_available = asyncio.Condition(self._lock)
+
     @asynccontextmanager
     async def _timed_lock(self):
         """Acquire lock with timing metrics.
@@ -552,59 +694,79 @@ class WorkerPool:
 
         return "\n".join(config_lines)
 
+    def _select_worker(self) -> WorkerInfo | None:
+        """Pick the least-loaded live worker with spare capacity.
+
+        Ties are broken round-robin. Must be called with the lock held.
+        """
+        best_worker: WorkerInfo | None = None
+        candidates: list[WorkerInfo] = []
+        for worker in self._workers:
+            if (
+                worker.process.returncode is not None  # Worker is dead
+                or worker.recycling  # Worker is being recycled
+                or worker.active_tasks >= self.max_concurrent_per_worker
+            ):
+                continue
+            if best_worker is None or worker.active_tasks < best_worker.active_tasks:
+                best_worker = worker
+                candidates = [worker]
+            elif worker.active_tasks == best_worker.active_tasks:
+                candidates.append(worker)
+
+        if not candidates:
+            return None
+
+        # Round-robin selection among candidates with equal load
+        # Use modulo to wrap around the candidate list
+        selected = candidates[self._next_worker_index % len(candidates)]
+        self._next_worker_index = (self._next_worker_index + 1) % len(self._workers)
+        return selected
+
+    def _pool_state(self) -> dict[str, int]:
+        """Summarize worker capacity for logging. Must be called with the lock held."""
+        workers_at_capacity = 0
+        workers_dead = 0
+        workers_recycling = 0
+        total_active = 0
+        for worker in self._workers:
+            total_active += worker.active_tasks
+            if worker.process.returncode is not None:
+                workers_dead += 1
+            elif worker.recycling:
+                workers_recycling += 1
+            elif worker.active_tasks >= self.max_concurrent_per_worker:
+                workers_at_capacity += 1
+        return {
+            "total_workers": len(self._workers),
+            "workers_at_capacity": workers_at_capacity,
+            "workers_dead": workers_dead,
+            "workers_recycling": workers_recycling,
+            "total_active_tasks": total_active,
+            "max_capacity": len(self._workers) * self.max_concurrent_per_worker,
+            "tasks_waiting": self._tasks_waiting,
+        }
+
     async def _get_available_worker(self, timeout: float = 30.0) -> WorkerInfo:
         """Get a worker with available capacity.
 
         Workers can handle multiple concurrent tasks up to max_concurrent_per_worker.
         This method finds a worker with available capacity and increments its active_tasks count.
+
+        When every worker is at capacity, the caller waits on `_slot_available`
+        until a released slot wakes it, instead of polling.
         """
-        start_time = asyncio.get_event_loop().time()
-        last_log_time = start_time
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        deadline = start_time + timeout
         log_interval = 5.0  # Log wait status every 5 seconds
-        wait_logged = False
         is_waiting = False  # Track if we've incremented _tasks_waiting
 
-        try:
-            while True:
-                async with self._timed_lock():
-                    # Collect pool state for logging
-                    workers_at_capacity = 0
-                    workers_dead = 0
-                    workers_recycling = 0
-                    total_active = 0
-
-                    # Find all available workers and minimum load
-                    available_workers: list[WorkerInfo] = []
-                    min_load = float("inf")
-                    for worker in self._workers:
-                        total_active += worker.active_tasks
-                        if worker.process.returncode is not None:
-                            workers_dead += 1
-                            continue  # Worker is dead
-                        if worker.recycling:
-                            workers_recycling += 1
-                            continue  # Worker is being recycled
-                        if worker.active_tasks >= self.max_concurrent_per_worker:
-                            workers_at_capacity += 1
-                            continue  # Worker is at capacity
-                        available_workers.append(worker)
-                        if worker.active_tasks < min_load:
-                            min_load = worker.active_tasks
-
-                    if available_workers:
-                        # Get candidates with minimum load
-                        candidates = [
-                            w for w in available_workers if w.active_tasks == min_load
-                        ]
-
-                        # Round-robin selection among candidates with equal load
-                        # Use modulo to wrap around the candidate list
-                        selected_idx = self._next_worker_index % len(candidates)
-                        best_worker = candidates[selected_idx]
-                        self._next_worker_index = (self._next_worker_index + 1) % len(
-                            self._workers
-                        )
-
+        async with self._timed_lock():
+            try:
+                while True:
+                    best_worker = self._select_worker()
+                    if best_worker is not None:
                         best_worker.active_tasks += 1
                         # Only update oldest_task_started_at when transitioning 0→1 active tasks
                         # This ensures stuck detection tracks the oldest running task, not the newest
@@ -622,22 +784,26 @@ class WorkerPool:
                             selected_worker_active=best_worker.active_tasks,
                             selected_worker_completed=best_worker.tasks_completed,
                             worker_loads=",".join(worker_loads),
-                            total_active=total_active,
                         )
-                        if wait_logged:
-                            elapsed = asyncio.get_event_loop().time() - start_time
+                        if is_waiting:
+                            wait_time_ms = (loop.time() - start_time) * 1000
+                            self._queue_waits += 1
+                            self._queue_wait_time_total_ms += wait_time_ms
+                            self._queue_wait_time_max_ms = max(
+                                self._queue_wait_time_max_ms, wait_time_ms
+                            )
                             # Decrement waiting count before returning
-                            if is_waiting:
-                                self._tasks_waiting = max(0, self._tasks_waiting - 1)
-                                is_waiting = False
+                            self._tasks_waiting = max(0, self._tasks_waiting - 1)
+                            is_waiting = False
                             logger.info(
                                 "Worker slot acquired after waiting",
                                 worker_id=best_worker.worker_id,
-                                wait_time_s=f"{elapsed:.2f}",
+                                wait_time_s=f"{wait_time_ms / 1000:.2f}",
                                 tasks_still_waiting=self._tasks_waiting,
                             )
                         return best_worker
 
+                    elapsed = loop.time() - start_time
                     # No worker available - increment waiting count on first wait
                     if not is_waiting:
                         self._tasks_waiting += 1
@@ -646,59 +812,59 @@ class WorkerPool:
                         # Track peak waiting
                         if self._tasks_waiting > self._peak_tasks_waiting:
                             self._peak_tasks_waiting = self._tasks_waiting
-
-                    # Collect state for logging (include waiting count)
-                    pool_state = {
-                        "total_workers": len(self._workers),
-                        "workers_at_capacity": workers_at_capacity,
-                        "workers_dead": workers_dead,
-                        "workers_recycling": workers_recycling,
-                        "total_active_tasks": total_active,
-                        "max_capacity": len(self._workers)
-                        * self.max_concurrent_per_worker,
-                        "tasks_waiting": self._tasks_waiting,
-                    }
-
-                current_time = asyncio.get_event_loop().time()
-                elapsed = current_time - start_time
-
-                # Log on first wait and periodically thereafter
-                if not wait_logged:
-                    wait_logged = True
-                    logger.warning(
-                        "No available worker, waiting for slot",
-                        timeout_s=timeout,
-                        **pool_state,
-                    )
-                    last_log_time = current_time
-                elif current_time - last_log_time >= log_interval:
-                    logger.warning(
-                        "Still waiting for worker slot",
-                        elapsed_s=f"{elapsed:.1f}",
-                        remaining_s=f"{timeout - elapsed:.1f}",
-                        **pool_state,
-                    )
-                    last_log_time = current_time
-
-                if elapsed > timeout:
-                    logger.error(
-                        "Timeout waiting for worker slot",
-                        elapsed_s=f"{elapsed:.1f}",
-                        **pool_state,
-                    )
-                    raise RuntimeError("No available worker (all at capacity)")
-
-                await asyncio.sleep(0.01)
-        finally:
-            # Always decrement waiting count if we were waiting (must be inside lock)
-            if is_waiting:
-                async with self._timed_lock():
+                        logger.warning(
+                            "No available worker, waiting for slot",
+                            timeout_s=timeout,
+                            **self._pool_state(),
+                        )
+                    elif elapsed >= timeout:
+                        logger.error(
+                            "Timeout waiting for worker slot",
+                            elapsed_s=f"{elapsed:.1f}",
+                            **self._pool_state(),
+                        )
+                        raise RuntimeError("No available worker (all at capacity)")
+
+                    # Releases the lock while waiting. Wake up at least every
+                    # log_interval to re-check capacity (e.g. after a forced release
+                    # that couldn't notify) and report progress.
+                    remaining = deadline - loop.time()
+                    try:
+                        await asyncio.wait_for(
+                            self._slot_available.wait(),
+                            timeout=max(0.0, min(remaining, log_interval)),
+                        )
+                    except TimeoutError:
+                        elapsed = loop.time() - start_time
+                        if elapsed < timeout:
+                            logger.warning(
+                                "Still waiting for worker slot",
+                                elapsed_s=f"{elapsed:.1f}",
+                                remaining_s=f"{timeout - elapsed:.1f}",
+                                **self._pool_state(),
+                            )
+            except BaseException:
+                # Pass on a wakeup we may have consumed but can no longer use
+                if is_waiting and self._has_available_slot():
+                    self._slot_available.notify(1)
+                raise
+            finally:
+                if is_waiting:
                     self._tasks_waiting = max(0, self._tasks_waiting - 1)
                     logger.debug(
                         "Task stopped waiting (timeout/cancelled)",
                         tasks_waiting=self._tasks_waiting,
                     )
 
+    def _has_available_slot(self) -> bool:
+        """Check for spare capacity without advancing round-robin state."""
+        return any(
+            w.process.returncode is None
+            and not w.recycling
+            and w.active_tasks < self.max_concurrent_per_worker
+            for w in self._workers
+        )
+
     async def _emit_metrics_loop(self) -> None:
         """Background task that periodically emits pool metrics."""
         while self._started:
@@ -785,6 +951,12 @@ class WorkerPool:
             else 0.0
         )
 
+        avg_queue_wait_ms = (
+            self._queue_wait_time_total_ms / self._queue_waits
+            if self._queue_waits > 0
+            else 0.0
+        )
+
         # Compute throughput
         completed_delta = total_completed - self._last_total_completed
         throughput_per_sec = (
@@ -816,6 +988,11 @@ class WorkerPool:
             "lock_wait_total_ms": f"{self._lock_wait_time_total_ms:.2f}",
             "lock_wait_avg_ms": f"{avg_lock_wait_ms:.3f}",
             "lock_wait_max_ms": f"{self._lock_max_wait_time_ms:.2f}",
+            # Queue wait metrics
+            "queue_waits": self._queue_waits,
+            "queue_wait_total_ms": f"{self._queue_wait_time_total_ms:.2f}",
+            "queue_wait_avg_ms": f"{avg_queue_wait_ms:.3f}",
+            "queue_wait_max_ms": f"{self._queue_wait_time_max_ms:.2f}",
         }
 
         logger.info(f"Pool metrics: {json.dumps(metrics, indent=2)}")
@@ -860,6 +1037,9 @@ class WorkerPool:
                 # Mark as recycling so no new tasks are assigned to this worker
                 worker.recycling = True
                 should_recycle = True
+            else:
+                # Wake exactly one task waiting for a slot
+                self._slot_available.notify(1)
 
         # Perform recycle outside the lock to avoid blocking the pool
         if should_recycle:
@@ -884,6 +1064,8 @@ class WorkerPool:
             self._per_worker_recycles.get(worker.worker_id, 0) + 1
         )
 
+        await self._close_connection(worker)
+
         # Terminate the old worker (outside lock - this can take time)
         was_killed = False
         try:
@@ -919,6 +1101,8 @@ class WorkerPool:
                 idx = self._workers.index(worker)
                 if new_worker is not None:
                     self._workers[idx] = new_worker
+                    # The replacement worker brings a full set of free slots
+                    self._slot_available.notify(self.max_concurrent_per_worker)
                 else:
                     # Failed to spawn replacement, remove the dead worker
                     self._workers.pop(idx)
@@ -1035,7 +1219,8 @@ class WorkerPool:
                     action=action_name,
                     task_ref=task_ref,
                 )
-                # Force decrement without async lock
+                # Force decrement without async lock. Waiters can't be notified
+                # here; they re-check capacity periodically.
                 worker.active_tasks = max(0, worker.active_tasks - 1)
                 worker.tasks_completed += 1
                 # Reset oldest_task_started_at when worker becomes idle
@@ -1043,6 +1228,26 @@ class WorkerPool:
                     worker.oldest_task_started_at = 0.0
                 raise
 
+    async def _get_connection(self, worker: WorkerInfo) -> WorkerConnection:
+        """Get the worker's long-lived connection, (re)connecting if needed."""
+        async with worker.connection_lock:
+            if worker.connection is None or worker.connection.closed:
+                worker.connection = await WorkerConnection.open(
+                    worker.socket_path, worker.worker_id
+                )
+                logger.debug(
+                    "Opened worker connection",
+                    worker_id=worker.worker_id,
+                    socket_path=str(worker.socket_path),
+                )
+            return worker.connection
+
+    async def _close_connection(self, worker: WorkerInfo) -> None:
+        """Close the worker's long-lived connection, if any."""
+        if (connection := worker.connection) is not None:
+            worker.connection = None
+            await connection.close()
+
     async def _execute_on_worker(
         self,
         worker: WorkerInfo,
@@ -1063,80 +1268,26 @@ class WorkerPool:
             "role": role.model_dump(mode="json"),
             "resolved_context": resolved_context.model_dump(mode="json"),
         }
-        request_bytes = orjson.dumps(request)
 
         logger.debug(
             "Executing on worker - starting",
             worker_id=worker.worker_id,
             action=action_name,
             task_ref=task_ref,
-            request_size=len(request_bytes),
+            multiplexed=self.multiplex_connections,
             socket_path=str(worker.socket_path),
         )
 
-        writer: asyncio.StreamWriter | None = None
         try:
-            # Connect to worker's socket (on host filesystem)
-            stage = "connect"
-            logger.debug(
-                "Connecting to worker socket",
-                worker_id=worker.worker_id,
-                action=action_name,
-                task_ref=task_ref,
-            )
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_unix_connection(str(worker.socket_path)),
-                timeout=5.0,
-            )
-            connect_elapsed = (time.monotonic() - start_time) * 1000
-            logger.debug(
-                "Connected to worker socket",
-                worker_id=worker.worker_id,
-                action=action_name,
-                task_ref=task_ref,
-                connect_ms=f"{connect_elapsed:.1f}",
-            )
-
-            # Send request
-            stage = "send"
-            length_prefix = len(request_bytes).to_bytes(4, "big")
-            writer.write(length_prefix + request_bytes)
-            await writer.drain()
-            send_elapsed = (time.monotonic() - start_time) * 1000
-            logger.debug(
-                "Request sent to worker",
-                worker_id=worker.worker_id,
-                action=action_name,
-                task_ref=task_ref,
-                send_ms=f"{send_elapsed:.1f}",
-            )
-
-            # Read response length
-            stage = "read_length"
-            length_bytes = await asyncio.wait_for(
-                reader.readexactly(4),
-                timeout=timeout,
-            )
-            response_length = int.from_bytes(length_bytes, "big")
-            read_length_elapsed = (time.monotonic() - start_time) * 1000
-            logger.debug(
-                "Response length received",
-                worker_id=worker.worker_id,
-                action=action_name,
-                task_ref=task_ref,
-                response_length=response_length,
-                read_length_ms=f"{read_length_elapsed:.1f}",
-            )
-
-            # Read response body
-            stage = "read_body"
-            response_bytes = await asyncio.wait_for(
-                reader.readexactly(response_length),
-                timeout=timeout,
-            )
+            if self.multiplex_connections:
+                stage = "connect"
+                connection = await self._get_connection(worker)
+                stage = "request"
+                data = await connection.request(request, timeout=timeout)
+            else:
+                data = await self._request_on_new_connection(worker, request, timeout)
 
             elapsed_ms = (time.monotonic() - start_time) * 1000
-            data = orjson.loads(response_bytes)
 
             # Validate using discriminated union
             result = _ExecutorResultAdapter.validate_python(data)
@@ -1197,14 +1348,39 @@ class WorkerPool:
             )
             raise
 
+    async def _request_on_new_connection(
+        self, worker: WorkerInfo, request: dict[str, Any], timeout: float
+    ) -> dict[str, Any]:
+        """Send a single request over a dedicated connection to the worker."""
+        request_bytes = orjson.dumps(request)
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_unix_connection(str(worker.socket_path)),
+            timeout=5.0,
+        )
+        try:
+            # Send request
+            length_prefix = len(request_bytes).to_bytes(4, "big")
+            writer.write(length_prefix + request_bytes)
+            await writer.drain()
+
+            # Read response
+            length_bytes = await asyncio.wait_for(
+                reader.readexactly(4),
+                timeout=timeout,
+            )
+            response_length = int.from_bytes(length_bytes, "big")
+            response_bytes = await asyncio.wait_for(
+                reader.readexactly(response_length),
+                timeout=timeout,
+            )
+            return orjson.loads(response_bytes)
         finally:
             # Always close the writer to release the socket connection
-            if writer is not None:
-                try:
-                    writer.close()
-                    await writer.wait_closed()
-                except Exception:
-                    pass  # Ignore errors during cleanup
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass  # Ignore errors during cleanup
 
     def get_lifetime_metrics(self) -> dict[str, Any]:
         """Get all lifetime metrics for the pool.
@@ -1217,6 +1393,11 @@ class WorkerPool:
             if self._lifetime_tasks_completed > 0
             else 0.0
         )
+        avg_queue_wait_ms = (
+            self._queue_wait_time_total_ms / self._queue_waits
+            if self._queue_waits > 0
+            else 0.0
+        )
 
         return {
             # Task metrics
@@ -1232,6 +1413,11 @@ class WorkerPool:
             # Capacity metrics
             "tasks_queued": self._lifetime_tasks_queued,
             "peak_tasks_waiting": self._peak_tasks_waiting,
+            # Queue wait metrics (ms, tasks that waited for a slot)
+            "queue_waits": self._queue_waits,
+            "total_queue_wait_ms": self._queue_wait_time_total_ms,
+            "avg_queue_wait_ms": avg_queue_wait_ms,
+            "max_queue_wait_ms": self._queue_wait_time_max_ms,
             # Latency metrics (ms)
             "total_task_time_ms": self._total_task_time_ms,
             "avg_task_time_ms": avg_task_time_ms,
@@ -1260,6 +1446,7 @@ class WorkerPool:
             self._metrics_task = None
 
         for worker in self._workers:
+            await self._close_connection(worker)
             try:
                 worker.process.terminate()
                 await asyncio.wait_for(worker.process.wait(), timeout=5.0)
@@ -6,6 +6,8 @@ multiple tasks. All heavy imports are done once at startup.
 Architecture:
 - Single event loop handles all connections concurrently
 - asyncio.start_unix_server spawns a coroutine per connection
+- Each connection carries many length-prefixed requests; every request runs
+  in its own task and responses are matched to requests by `request_id`
 - When one task awaits (IO), others can run (AsyncConcurrent pattern)
 - No ThreadPool needed - asyncio handles IO concurrency naturally
 
@@ -77,9 +79,11 @@ def _ensure_tarball_paths_in_sys_path() -> None:
                 )
 
 
-# Global counters for connection tracking
+# Global counters for connection and request tracking
 _connection_counter = 0
 _active_connections = 0
+_request_counter = 0
+_active_requests = 0
 _worker_id = int(os.environ.get("ALLAMA_WORKER_ID", "0"))
 _test_mode = os.environ.get("ALLAMA__POOL_WORKER_TEST_MODE", "").lower() == "true"
 
@@ -198,53 +202,30 @@ async def handle_task(request: dict[str, Any]) -> dict[str, Any]:
         }
 
 
-async def handle_connection(
-    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+async def _handle_request(
+    request: dict[str, Any],
+    writer: asyncio.StreamWriter,
+    write_lock: asyncio.Lock,
+    conn_id: int,
 ) -> None:
-    """Handle a single client connection.
+    """Run a single request and write its response to the connection.
 
-    Each connection runs as a coroutine on the main event loop.
-    Multiple connections are handled concurrently - when one awaits IO,
-    others can proceed (AsyncConcurrent pattern).
+    Multiplexed requests carry a `request_id`, which is echoed back in a
+    `{"request_id": ..., "response": ...}` envelope. Requests without one get the
+    bare ExecutorResult dict.
     """
-    global _connection_counter, _active_connections
+    global _request_counter, _active_requests
 
-    # Assign connection ID and track active connections
-    _connection_counter += 1
-    conn_id = _connection_counter
-    _active_connections += 1
+    _request_counter += 1
+    _active_requests += 1
 
     # Task timeout - prevents indefinite hangs on stuck DB queries, etc.
     task_timeout = float(os.environ.get("ALLAMA__POOL_WORKER_TASK_TIMEOUT", "300"))
+    request_id = request.pop("request_id", None)
     action_name = "unknown"
     task_ref = "unknown"
 
-    logger.debug(
-        "Connection received",
-        worker_id=_worker_id,
-        conn_id=conn_id,
-        active_connections=_active_connections,
-    )
-
     try:
-        # Read request (length-prefixed)
-        logger.debug(
-            "Reading request length",
-            worker_id=_worker_id,
-            conn_id=conn_id,
-        )
-        length_bytes = await reader.readexactly(4)
-        request_length = int.from_bytes(length_bytes, "big")
-
-        logger.debug(
-            "Reading request body",
-            worker_id=_worker_id,
-            conn_id=conn_id,
-            request_length=request_length,
-        )
-        request_bytes = await reader.readexactly(request_length)
-        request = orjson.loads(request_bytes)
-
         # Extract action info for logging
         action_name = request.get("input", {}).get("task", {}).get("action", "unknown")
         task_ref = request.get("input", {}).get("task", {}).get("ref", "unknown")
@@ -253,9 +234,10 @@ async def handle_connection(
             "Task received",
             worker_id=_worker_id,
             conn_id=conn_id,
+            request_id=request_id,
             action=action_name,
             task_ref=task_ref,
-            active_connections=_active_connections,
+            active_requests=_active_requests,
         )
 
         # Handle task with timeout to prevent indefinite hangs
@@ -268,11 +250,12 @@ async def handle_connection(
                 "Task timed out in pool worker",
                 worker_id=_worker_id,
                 conn_id=conn_id,
+                request_id=request_id,
                 action=action_name,
                 task_ref=task_ref,
                 timeout=task_timeout,
                 elapsed_s=f"{elapsed:.1f}",
-                active_connections=_active_connections,
+                active_requests=_active_requests,
             )
             error_info = ExecutorActionErrorInfo(
                 action_name=action_name,
@@ -291,39 +274,145 @@ async def handle_connection(
             "Task processed",
             worker_id=_worker_id,
             conn_id=conn_id,
+            request_id=request_id,
             action=action_name,
             task_ref=task_ref,
             success=result.get("type") == "success",
             elapsed_ms=f"{task_elapsed * 1000:.1f}",
-            active_connections=_active_connections,
+            active_requests=_active_requests,
         )
-
-        # Write response (length-prefixed)
-        logger.debug(
-            "Writing response",
+    except asyncio.CancelledError:
+        logger.warning(
+            "Request cancelled",
             worker_id=_worker_id,
             conn_id=conn_id,
+            request_id=request_id,
+            action=action_name,
+            task_ref=task_ref,
+            active_requests=_active_requests,
         )
-        response_bytes = orjson.dumps(result, default=to_jsonable_python)
-        length_prefix = len(response_bytes).to_bytes(4, "big")
-
-        writer.write(length_prefix + response_bytes)
-        await writer.drain()
-
+        raise
+    except Exception as e:
+        logger.error(
+            "Request handler error",
+            worker_id=_worker_id,
+            conn_id=conn_id,
+            request_id=request_id,
+            action=action_name,
+            task_ref=task_ref,
+            error=str(e),
+            error_type=type(e).__name__,
+        )
+        # Log traceback at debug level to avoid leaking sensitive data in production
         logger.debug(
-            "Response sent",
+            "Request handler error traceback", traceback=traceback.format_exc()
+        )
+        error_info = ExecutorActionErrorInfo(
+            action_name=action_name,
+            type="WorkerError",
+            message=str(e),
+            filename="worker.py",
+            function="handle_connection",
+        )
+        result = {
+            "type": "failure",
+            "error": error_info.model_dump(mode="json"),
+        }
+    finally:
+        _active_requests -= 1
+
+    # Write response (length-prefixed)
+    response = (
+        result if request_id is None else {"request_id": request_id, "response": result}
+    )
+    response_bytes = orjson.dumps(response, default=to_jsonable_python)
+    length_prefix = len(response_bytes).to_bytes(4, "big")
+    try:
+        async with write_lock:
+            writer.write(length_prefix + response_bytes)
+            await writer.drain()
+    except (ConnectionError, RuntimeError) as e:
+        logger.warning(
+            "Failed to send response, client disconnected",
             worker_id=_worker_id,
             conn_id=conn_id,
-            response_length=len(response_bytes),
+            request_id=request_id,
+            action=action_name,
+            task_ref=task_ref,
+            error=str(e),
         )
+        return
+
+    logger.debug(
+        "Response sent",
+        worker_id=_worker_id,
+        conn_id=conn_id,
+        request_id=request_id,
+        response_length=len(response_bytes),
+    )
+
+
+async def handle_connection(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """Handle a single client connection.
+
+    Each connection runs as a coroutine on the main event loop and reads a
+    stream of length-prefixed requests. Every request runs in its own task, so
+    many requests can be in flight on one long-lived connection and responses
+    may be written out of order (matched by `request_id` on the host).
+    """
+    global _connection_counter, _active_connections
+
+    # Assign connection ID and track active connections
+    _connection_counter += 1
+    conn_id = _connection_counter
+    _active_connections += 1
+
+    write_lock = asyncio.Lock()
+    request_tasks: set[asyncio.Task[None]] = set()
+
+    logger.debug(
+        "Connection received",
+        worker_id=_worker_id,
+        conn_id=conn_id,
+        active_connections=_active_connections,
+    )
+
+    try:
+        while True:
+            # Read request (length-prefixed)
+            try:
+                length_bytes = await reader.readexactly(4)
+            except asyncio.IncompleteReadError as e:
+                if e.partial:
+                    raise
+                # Clean EOF between requests
+                break
+            request_length = int.from_bytes(length_bytes, "big")
+
+            logger.debug(
+                "Reading request body",
+                worker_id=_worker_id,
+                conn_id=conn_id,
+                request_length=request_length,
+            )
+            request_bytes = await reader.readexactly(request_length)
+            request = orjson.loads(request_bytes)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+
+            task = asyncio.create_task(
+                _handle_request(request, writer, write_lock, conn_id)
+            )
+            request_tasks.add(task)
+            task.add_done_callback(request_tasks.discard)
 
     except asyncio.IncompleteReadError as e:
         logger.warning(
             "Client disconnected (incomplete read)",
             worker_id=_worker_id,
             conn_id=conn_id,
-            action=action_name,
-            task_ref=task_ref,
             active_connections=_active_connections,
             error=str(e),
         )
@@ -332,9 +421,8 @@ async def handle_connection(
             "Connection cancelled",
             worker_id=_worker_id,
             conn_id=conn_id,
-            action=action_name,
-            task_ref=task_ref,
             active_connections=_active_connections,
+            pending_requests=len(request_tasks),
         )
         raise
     except Exception as e:
@@ -342,8 +430,6 @@ async def handle_connection(
             "Connection handler error",
             worker_id=_worker_id,
             conn_id=conn_id,
-            action=action_name,
-            task_ref=task_ref,
             active_connections=_active_connections,
             error=str(e),
             error_type=type(e).__name__,
@@ -352,10 +438,11 @@ async def handle_connection(
         logger.debug(
             "Connection handler error traceback", traceback=traceback.format_exc()
         )
-        # Try to send error response
+        # Try to send error response. It isn't tied to one request, so it goes
+        # out bare and the host fails every pending request on this connection.
         try:
             error_info = ExecutorActionErrorInfo(
-                action_name=action_name,
+                action_name="unknown",
                 type="WorkerError",
                 message=str(e),
                 filename="worker.py",
@@ -369,11 +456,17 @@ async def handle_connection(
                 default=to_jsonable_python,
             )
             length_prefix = len(error_response).to_bytes(4, "big")
-            writer.write(length_prefix + error_response)
-            await writer.drain()
+            async with write_lock:
+                writer.write(length_prefix + error_response)
+                await writer.drain()
         except Exception:
             pass
     finally:
+        # Responses for in-flight requests can no longer be delivered
+        for task in request_tasks:
+            task.cancel()
+        if request_tasks:
+            await asyncio.gather(*request_tasks, return_exceptions=True)
         _active_connections -= 1
         logger.debug(
             "Connection closed",
@@ -390,7 +483,6 @@ async def handle_connection(
 
 async def _heartbeat_loop(worker_id: int, interval: float = 30.0) -> None:
     """Emit periodic heartbeat to detect event loop blocks."""
-    global _active_connections, _connection_counter
     last_beat = time.monotonic()
     tasks_at_last_beat = 0
 
@@ -413,8 +505,9 @@ async def _heartbeat_loop(worker_id: int, interval: float = 30.0) -> None:
             "Pool worker heartbeat",
             worker_id=worker_id,
             active_connections=_active_connections,
+            active_requests=_active_requests,
             total_connections=_connection_counter,
-            tasks_since_last_beat=_connection_counter - tasks_at_last_beat,
+            tasks_since_last_beat=_request_counter - tasks_at_last_beat,
             pending_asyncio_tasks=pending_tasks,
             heartbeat_delay_ms=f"{delay * 1000:.1f}" if delay > 0.1 else "0",
             pid=os.getpid(),
@@ -431,7 +524,7 @@ async def _heartbeat_loop(worker_id: int, interval: float = 30.0) -> None:
             )
 
         last_beat = now
-        tasks_at_last_beat = _connection_counter
+        tasks_at_last_beat = _request_counter
 
 
 async def run_worker(socket_path: Path, worker_id: int) -> None:
@@ -6,12 +6,20 @@ Provides O(1) action resolution using registry locks with action-level bindings.
 from __future__ import annotations
 
 import asyncio
-
-from aiocache import Cache, cached
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import orjson
 from allama_registry import RegistrySecretType
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from allama import config
+from allama.concurrency import single_flight
 from allama.db.engine import get_async_session_context_manager
 from allama.db.models import (
     PlatformRegistryRepository,
@@ -122,55 +130,152 @@ async def _fetch_manifest(
     return RegistryVersionManifest.model_validate(manifest_dict)
 
 
-def _manifest_key_builder(
-    fn: object,
+MANIFEST_CACHE_MAX_ENTRIES = 256
+"""Maximum number of registry versions kept in memory per process.
+
+A registry version's manifest never changes, so entries don't expire; the least
+recently used version is evicted once this many are cached.
+"""
+
+_MANIFEST_DISK_FORMAT_VERSION = 1
+
+type _ManifestEntry = tuple[RegistryVersionManifest, dict[str, ActionImplementation]]
+type _ManifestKey = tuple[str, str, OrganizationID | None]
+
+_manifest_cache: OrderedDict[_ManifestKey, _ManifestEntry] = OrderedDict()
+_manifest_loads: dict[_ManifestKey, asyncio.Task[_ManifestEntry]] = {}
+
+
+def _manifest_key(
+    origin: str, version: str, organization_id: OrganizationID
+) -> _ManifestKey:
+    """Build cache key for manifest entries.
+
+    Platform registry versions are shared by every organization.
+    """
+    if origin == DEFAULT_REGISTRY_ORIGIN:
+        return (origin, version, None)
+    return (origin, version, organization_id)
+
+
+def _manifest_disk_path(key: _ManifestKey) -> Path | None:
+    if not config.ALLAMA__EXECUTOR_MANIFEST_CACHE_DIR:
+        return None
+    origin, version, organization_id = key
+    digest = hashlib.sha256(f"{origin}\0{version}".encode()).hexdigest()
+    scope = str(organization_id) if organization_id is not None else "platform"
+    return Path(config.ALLAMA__EXECUTOR_MANIFEST_CACHE_DIR) / scope / f"{digest}.json"
+
+
+def _read_disk_entry(path: Path) -> _ManifestEntry | None:
+    """Load a persisted manifest entry, ignoring missing or unreadable files."""
+    try:
+        data = orjson.loads(path.read_bytes())
+        if data.get("format_version") != _MANIFEST_DISK_FORMAT_VERSION:
+            return None
+        manifest = RegistryVersionManifest.model_validate(data["manifest"])
+        impl_index = {
+            name: ActionImplementation.model_validate(impl)
+            for name, impl in data["impl_index"].items()
+        }
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring unreadable manifest cache file", path=path, error=e)
+        return None
+    return (manifest, impl_index)
+
+
+def _write_disk_entry(path: Path, entry: _ManifestEntry) -> None:
+    """Persist a manifest entry atomically (write to a temp file, then rename)."""
+    manifest, impl_index = entry
+    data: dict[str, Any] = {
+        "format_version": _MANIFEST_DISK_FORMAT_VERSION,
+        "manifest": manifest.model_dump(mode="json"),
+        "impl_index": {
+            name: impl.model_dump(mode="json") for name, impl in impl_index.items()
+        },
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps(data))
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError as e:
+        # The disk tier is best-effort; the in-memory entry is still usable
+        logger.warning("Failed to persist manifest cache file", path=path, error=e)
+
+
+async def _load_manifest_entry(
+    key: _ManifestKey,
     origin: str,
     version: str,
     organization_id: OrganizationID,
-) -> str:
-    """Build cache key for manifest entries."""
-    return f"manifest:{organization_id}:{origin}:{version}"
+) -> _ManifestEntry:
+    path = _manifest_disk_path(key)
+    if path is not None and (entry := await asyncio.to_thread(_read_disk_entry, path)):
+        logger.debug("Loaded manifest from disk cache", origin=origin, version=version)
+    else:
+        async with get_async_session_context_manager() as session:
+            manifest = await _fetch_manifest(session, origin, version, organization_id)
+        entry = (manifest, _build_impl_index(manifest, origin))
+        if path is not None:
+            await asyncio.to_thread(_write_disk_entry, path, entry)
+
+    _manifest_cache[key] = entry
+    while len(_manifest_cache) > MANIFEST_CACHE_MAX_ENTRIES:
+        _manifest_cache.popitem(last=False)
+
+    logger.debug(
+        "Cached manifest impl index",
+        origin=origin,
+        version=version,
+        num_actions=len(entry[1]),
+    )
+    return entry
 
 
-@cached(
-    ttl=60,
-    cache=Cache.MEMORY,
-    key_builder=_manifest_key_builder,
-)
 async def _get_manifest_entry(
     origin: str,
     version: str,
     organization_id: OrganizationID,
-) -> tuple[RegistryVersionManifest, dict[str, ActionImplementation]]:
-    """Fetch manifest and build impl index (cached with TTL).
+) -> _ManifestEntry:
+    """Fetch manifest and build impl index, caching by registry version.
 
-    This function handles its own DB session and caching via aiocache.
+    Manifests are immutable per version, so entries are kept until evicted.
+    Concurrent misses for the same version share a single load, which is served
+    from the disk cache when enabled and from the DB otherwise.
     """
-    async with get_async_session_context_manager() as session:
-        manifest = await _fetch_manifest(session, origin, version, organization_id)
-        impl_index = _build_impl_index(manifest, origin)
-
-        logger.debug(
-            "Cached manifest impl index",
-            origin=origin,
-            version=version,
-            num_actions=len(impl_index),
-        )
-
-        return (manifest, impl_index)
+    key = _manifest_key(origin, version, organization_id)
+    if (entry := _manifest_cache.get(key)) is not None:
+        _manifest_cache.move_to_end(key)
+        return entry
+
+    return await single_flight(
+        _manifest_loads,
+        key,
+        lambda: _load_manifest_entry(key, origin, version, organization_id),
+    )
 
 
 async def prefetch_lock(lock: RegistryLock, organization_id: OrganizationID) -> None:
     """Prefetch all manifests for a registry lock into cache.
 
     Call this once at the start of action execution to warm the cache.
-    Uses aiocache with TTL - no session needed (managed internally).
+    No session needed (managed internally).
     """
     tasks = [
         _get_manifest_entry(origin, version, organization_id)
         for origin, version in lock.origins.items()
+        if _manifest_key(origin, version, organization_id) not in _manifest_cache
     ]
-    await asyncio.gather(*tasks)
+    if tasks:
+        await asyncio.gather(*tasks)
 
     logger.debug(
         "Prefetched registry lock",
@@ -187,7 +292,7 @@ async def resolve_action(
     """Resolve action implementation from registry lock.
 
     O(1) lookup using action-level bindings in the lock.
-    Uses aiocache - returns cached value on hit, fetches on miss.
+    Returns cached value on hit, fetches on miss.
 
     Args:
         action_name: Full action name (e.g., "core.transform.reshape")
@@ -322,5 +427,6 @@ async def _collect_secrets_recursive(
 
 
 async def clear_cache() -> None:
-    """Clear the manifest cache. Useful for testing."""
-    await _get_manifest_entry.cache.clear()  # pyright: ignore[reportAttributeAccessIssue]
+    """Clear the in-memory manifest cache. Useful for testing."""
+    _manifest_cache.clear()
+    _manifest_loads.clear()
@@ -2,8 +2,17 @@ from __future__ import annotations
 
 import asyncio
 import itertools
-from collections.abc import Iterator, Mapping, MutableMapping
-from dataclasses import dataclass
+import time
+from collections import deque
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+)
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, cast
 
@@ -13,7 +22,6 @@ from sqlalchemy import and_, or_, select, union_all
 from allama import config
 from allama.auth.executor_tokens import mint_executor_token
 from allama.auth.types import Role
-from allama.concurrency import GatheringTaskGroup
 from allama.contexts import (
     ctx_interaction,
     ctx_logical_time,
@@ -65,6 +73,8 @@ from allama.registry.actions.service import RegistryActionsService
 from allama.registry.constants import DEFAULT_REGISTRY_ORIGIN
 from allama.secrets import secrets_manager
 from allama.secrets.common import apply_masks_object
+from allama.storage.collection import CollectionWriter
+from allama.storage.object import CollectionObject
 from allama.variables.schemas import VariableSearch
 from allama.variables.service import VariablesService
 
@@ -75,9 +85,61 @@ type ArgsT = Mapping[str, Any]
 type ExecutionResult = Any | ExecutorActionErrorInfo
 
 
+@dataclass
+class ResolutionCache:
+    """Single-flight cache for resolution work shared by a dispatch's iterations.
+
+    Concurrent for_each iterations await one in-flight fetch per key instead of
+    each hitting the database. Entries expire after their TTL so long loops
+    still pick up refreshed OAuth tokens and newly minted executor tokens.
+    """
+
+    ttl_seconds: float = field(
+        default_factory=lambda: config.ALLAMA__EXECUTOR_RESOLUTION_CACHE_TTL_SECONDS
+    )
+    _entries: dict[Hashable, tuple[float, asyncio.Future[Any]]] = field(
+        default_factory=dict, repr=False
+    )
+
+    async def get_or_fetch[T](
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[T]],
+        *,
+        ttl_seconds: float | None = None,
+    ) -> T:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            return await fetch()
+
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, future = entry
+            failed = future.done() and (
+                future.cancelled() or future.exception() is not None
+            )
+            if now < expires_at and not failed:
+                return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(fetch())
+        # Retrieve the exception so an unawaited failure isn't logged as lost
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._entries[key] = (now + ttl, future)
+        try:
+            # Shield so one cancelled iteration doesn't cancel its siblings' fetch
+            return await asyncio.shield(future)
+        except BaseException:
+            # Let the next caller retry instead of replaying the failure
+            if self._entries.get(key, (None, None))[1] is future:
+                del self._entries[key]
+            raise
+
+
 @dataclass
 class DispatchActionContext:
     role: Role
+    resolution_cache: ResolutionCache = field(default_factory=ResolutionCache)
 
 
 @dataclass
@@ -380,6 +442,7 @@ async def _prepare_step_context(
     parent_resolved: ResolvedContext,
     input: RunActionInput,
     role: Role,
+    cache: ResolutionCache | None = None,
 ) -> ResolvedContext:
     """Prepare ResolvedContext for a template step, reusing parent secrets.
 
@@ -396,15 +459,10 @@ async def _prepare_step_context(
         step_action, input.registry_lock, role.organization_id
     )
 
-    # Mint new executor token for step (required for SDK authentication)
+    # Executor token for step (required for SDK authentication)
     if role.workspace_id is None:
         raise ValueError("workspace_id is required for template step execution")
-    executor_token = mint_executor_token(
-        workspace_id=role.workspace_id,
-        user_id=role.user_id,
-        wf_id=str(input.run_context.wf_id),
-        wf_exec_id=str(input.run_context.wf_run_id),
-    )
+    executor_token = await _get_executor_token(input, role, cache)
 
     # Reuse parent secrets/variables, use pre-evaluated args
     return ResolvedContext(
@@ -513,6 +571,7 @@ async def _execute_template_action(
             parent_resolved=resolved_context,
             input=input,
             role=role,
+            cache=ctx.resolution_cache,
         )
 
         # Execute step via _invoke_step (handles nested templates)
@@ -611,9 +670,65 @@ class PreparedContext:
     mask_values: set[str] | None
 
 
+def _build_mask_values(secrets: dict[str, Any]) -> set[str] | None:
+    """Collect the secret values to mask in action results."""
+    if config.ALLAMA__UNSAFE_DISABLE_SM_MASKING:
+        logger.warning(
+            "Secrets masking is disabled. This is unsafe in production workflows."
+        )
+        return None
+    mask_values: set[str] = set()
+    for _, secret_value in traverse_leaves(secrets):
+        if secret_value is not None:
+            secret_str = str(secret_value)
+            if len(secret_str) > 1:
+                mask_values.add(secret_str)
+            if isinstance(secret_value, str) and len(secret_value) > 1:
+                mask_values.add(secret_value)
+    return mask_values
+
+
+async def _get_executor_token(
+    input: RunActionInput,
+    role: Role,
+    cache: ResolutionCache | None = None,
+) -> str:
+    """Mint an executor token, reusing a cached one while it has time to spare.
+
+    A cached token is only handed out while it remains valid for at least the
+    executor client timeout, so an action started with it can't outlive it.
+    """
+    if role.workspace_id is None:
+        raise ValueError("workspace_id is required for action execution")
+    workspace_id = role.workspace_id
+    wf_id = str(input.run_context.wf_id)
+    wf_exec_id = str(input.run_context.wf_run_id)
+
+    async def mint() -> str:
+        return mint_executor_token(
+            workspace_id=workspace_id,
+            user_id=role.user_id,
+            wf_id=wf_id,
+            wf_exec_id=wf_exec_id,
+        )
+
+    if cache is None:
+        return await mint()
+    reuse_seconds = (
+        config.ALLAMA__EXECUTOR_TOKEN_TTL_SECONDS
+        - config.ALLAMA__EXECUTOR_CLIENT_TIMEOUT
+    )
+    return await cache.get_or_fetch(
+        ("executor_token", workspace_id, role.user_id, wf_id, wf_exec_id),
+        mint,
+        ttl_seconds=reuse_seconds,
+    )
+
+
 async def prepare_resolved_context(
     input: RunActionInput,
     role: Role,
+    cache: ResolutionCache | None = None,
 ) -> PreparedContext:
     """Prepare all context needed for action execution.
 
@@ -621,6 +736,10 @@ async def prepare_resolved_context(
     once at the service layer. The resulting ResolvedContext is passed to backends
     for execution without requiring DB access in the sandbox.
 
+    When a ``cache`` is given (one per dispatch), secrets, variables and the
+    executor token are shared with the other for_each iterations of the same
+    action instead of being fetched for each one.
+
     Returns:
         PreparedContext containing ResolvedContext and mask_values for post-processing.
     """
@@ -642,31 +761,36 @@ async def prepare_resolved_context(
     # Collect expressions to know what secrets/variables are needed
     collected = collect_expressions(task.args)
 
-    # Fetch secrets and variables
-    secrets = await secrets_manager.get_action_secrets(
-        secret_exprs=collected.secrets, action_secrets=action_secrets
-    )
-    workspace_variables = await get_workspace_variables(
-        variable_exprs=collected.variables,
-        environment=input.run_context.environment,
-        role=role,
-    )
+    # Fetch secrets and variables, and build mask values for secret masking
+    async def fetch_secrets() -> tuple[dict[str, Any], set[str] | None]:
+        secrets = await secrets_manager.get_action_secrets(
+            secret_exprs=collected.secrets, action_secrets=action_secrets
+        )
+        return secrets, _build_mask_values(secrets)
 
-    # Build mask values for secret masking
-    if config.ALLAMA__UNSAFE_DISABLE_SM_MASKING:
-        logger.warning(
-            "Secrets masking is disabled. This is unsafe in production workflows."
+    async def fetch_variables() -> dict[str, dict[str, str]]:
+        return await get_workspace_variables(
+            variable_exprs=collected.variables,
+            environment=input.run_context.environment,
+            role=role,
         )
-        mask_values = None
+
+    if cache is None:
+        secrets, mask_values = await fetch_secrets()
+        workspace_variables = await fetch_variables()
     else:
-        mask_values = set()
-        for _, secret_value in traverse_leaves(secrets):
-            if secret_value is not None:
-                secret_str = str(secret_value)
-                if len(secret_str) > 1:
-                    mask_values.add(secret_str)
-                if isinstance(secret_value, str) and len(secret_value) > 1:
-                    mask_values.add(secret_value)
+        secrets, mask_values = await cache.get_or_fetch(
+            ("secrets", frozenset(collected.secrets), frozenset(action_secrets)),
+            fetch_secrets,
+        )
+        workspace_variables = await cache.get_or_fetch(
+            (
+                "variables",
+                frozenset(collected.variables),
+                input.run_context.environment,
+            ),
+            fetch_variables,
+        )
 
     # Build execution context for SDK calls
     context = input.exec_context.copy()
@@ -707,12 +831,7 @@ async def prepare_resolved_context(
         raise ValueError("workspace_id is required for action execution")
 
     # Generate executor token for SDK authentication
-    executor_token = mint_executor_token(
-        workspace_id=role.workspace_id,
-        user_id=role.user_id,
-        wf_id=str(input.run_context.wf_id),
-        wf_exec_id=str(input.run_context.wf_run_id),
-    )
+    executor_token = await _get_executor_token(input, role, cache)
 
     resolved_context = ResolvedContext(
         secrets=secrets,
@@ -758,7 +877,10 @@ async def invoke_once(
         # Prepare resolved context (secrets, variables, action impl, evaluated args)
         # This is done once here and passed to all backends
         # For templates, secrets are fetched recursively for all steps
-        prepared = await prepare_resolved_context(input, role)
+        # for_each iterations share the dispatch's resolution cache
+        prepared = await prepare_resolved_context(
+            input, role, cache=ctx.resolution_cache
+        )
         resolved_context = prepared.resolved_context
         mask_values = prepared.mask_values
 
@@ -804,21 +926,70 @@ async def invoke_once(
     return action_result
 
 
-async def dispatch_action(backend: ExecutorBackend, input: RunActionInput) -> Any:
+class _LoopResults:
+    """Ordered sink for for_each results.
+
+    Results are kept in memory while the loop is small. Once it grows past
+    ALLAMA__COLLECTION_INLINE_MAX_ITEMS and a collection key is available, they
+    are streamed chunk by chunk to a collection in object storage instead.
+    """
+
+    def __init__(self, collection_key: str | None) -> None:
+        self._collection_key = collection_key
+        self._items: list[ExecutionResult] = []
+        self._writer: CollectionWriter | None = None
+
+    async def append(self, result: ExecutionResult) -> None:
+        if self._writer is not None:
+            await self._writer.append(result)
+            return
+        self._items.append(result)
+        if (
+            self._collection_key is not None
+            and len(self._items) > config.ALLAMA__COLLECTION_INLINE_MAX_ITEMS
+        ):
+            logger.debug(
+                "Streaming for_each results to collection",
+                key=self._collection_key,
+                count=len(self._items),
+            )
+            self._writer = CollectionWriter(self._collection_key)
+            items, self._items = self._items, []
+            await self._writer.extend(items)
+
+    async def close(self) -> list[ExecutionResult] | CollectionObject:
+        if self._writer is not None:
+            return await self._writer.close()
+        return self._items
+
+
+async def dispatch_action(
+    backend: ExecutorBackend,
+    input: RunActionInput,
+    *,
+    collection_key: str | None = None,
+) -> Any:
     """Dispatch action for execution.
 
     This function handles dispatching actions to be executed. It supports
     both single action execution and parallel execution using for_each loops.
 
+    for_each iterations are pulled lazily from the loop iterator and at most
+    ALLAMA__LOOP_MAX_BATCH_SIZE of them are in flight at once.
+
     Called by:
     - ExecutorActivities.execute_action_activity (Temporal activity on shared-action-queue)
 
     Args:
         input: The RunActionInput containing the task definition and execution context
+        collection_key: Storage prefix for streaming large for_each results to a
+            collection. Only used when collection manifests and result
+            externalization are enabled.
 
     Returns:
         Any: For single actions, returns the ExecutionResult. For for_each loops, returns
-             a list of results from all parallel executions.
+             a list of results from all parallel executions, or a CollectionObject
+             if the results were streamed to a collection.
 
     Raises:
         AllamaException: If there are errors evaluating for_each expressions or during execution
@@ -835,7 +1006,19 @@ async def dispatch_action(backend: ExecutorBackend, input: RunActionInput) -> An
     if not task.for_each:
         return await invoke_once(backend, input, ctx)
 
-    logger.info("Running for_each on action in parallel", action=task.action)
+    max_in_flight = max(1, config.ALLAMA__LOOP_MAX_BATCH_SIZE)
+    logger.info(
+        "Running for_each on action in parallel",
+        action=task.action,
+        max_in_flight=max_in_flight,
+    )
+
+    if not (
+        config.ALLAMA__COLLECTION_MANIFESTS_ENABLED
+        and config.ALLAMA__RESULT_EXTERNALIZATION_ENABLED
+    ):
+        collection_key = None
+    results = _LoopResults(collection_key)
 
     # Handle for_each by creating parallel executions
     base_context = input.exec_context
@@ -843,12 +1026,27 @@ async def dispatch_action(backend: ExecutorBackend, input: RunActionInput) -> An
     # and a collection of values as a tuple.
     iterators = get_iterables_from_expression(expr=task.for_each, operand=base_context)
 
-    tasks: list[asyncio.Task[ExecutionResult]] = []
+    # Launched iterations whose results haven't been collected yet, in order.
+    # Bounding this (rather than only running tasks) also bounds buffered results
+    # when an early iteration is slow.
+    in_flight: deque[asyncio.Task[ExecutionResult]] = deque()
+
+    async def collect_next() -> bool:
+        head = in_flight[0]
+        await asyncio.wait((head,))
+        if head.cancelled() or head.exception() is not None:
+            # The task group has been aborted and will raise the error on exit
+            return False
+        in_flight.popleft()
+        await results.append(head.result())
+        return True
+
     try:
-        # Create a generator that zips the iterables together
-        # Iterate over the for_each items
-        async with GatheringTaskGroup() as tg:
+        async with asyncio.TaskGroup() as tg:
+            # Zip the iterables together and pull items only when a slot is free
             for i, items in enumerate(zip(*iterators, strict=False)):
+                if len(in_flight) >= max_in_flight and not await collect_next():
+                    break
                 new_context = base_context.copy()
                 # Patch each loop variable
                 for iterator_path, iterator_value in items:
@@ -860,8 +1058,10 @@ async def dispatch_action(backend: ExecutorBackend, input: RunActionInput) -> An
                 # Create a new task with the patched context
                 new_input = input.model_copy(update={"exec_context": new_context})
                 coro = invoke_once(backend, new_input, ctx, iteration=i)
-                tasks.append(tg.create_task(coro))
-        return tg.results()
+                in_flight.append(tg.create_task(coro))
+            while in_flight and await collect_next():
+                pass
+        return await results.close()
     except* ExecutionError as eg:
         loop_errors = flatten_wrapped_exc_error_group(eg)
         raise LoopExecutionError(loop_errors) from eg
@@ -879,7 +1079,7 @@ async def dispatch_action(backend: ExecutorBackend, input: RunActionInput) -> An
         ) from eg
     finally:
         logger.debug("Shut down any pending tasks")
-        for t in tasks:
+        for t in in_flight:
             t.cancel()
 
 
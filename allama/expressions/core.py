@@ -242,14 +242,33 @@ class SecretPathExtractor(ExprExtractor[Mapping[ExprContext, set[str]]]):
         self._results[ExprContext.SECRETS].add(jsonpath)
 
 
+ACTION_FIELD_ANY = "*"
+"""Marker for an action reference that may access any TaskResult field."""
+
+_ACTION_PATH_PATTERN = re.compile(
+    r"^\.(?P<ref>[a-zA-Z_][a-zA-Z0-9_]*)(?:\.(?P<field>[a-zA-Z_][a-zA-Z0-9_]*))?"
+)
+
+
 @dataclass(slots=True)
 class CollectedExprs:
     secrets: set[str] = field(default_factory=set)
     variables: set[str] = field(default_factory=set)
+    actions: dict[str, set[str]] = field(default_factory=dict)
+    """Action refs mapped to the TaskResult fields they access (e.g. `result`).
+
+    `ACTION_FIELD_ANY` is recorded when the field can't be determined statically.
+    """
+    all_actions: bool = False
+    """Set when an expression addresses ACTIONS without a static ref (e.g. `ACTIONS.*`)."""
+    trigger: bool = False
+    """Set when any expression references TRIGGER."""
+    functions: set[str] = field(default_factory=set)
+    """Names of the `FN.*` functions called, without any `.map` transform."""
 
 
 class ExprPathCollector(ExprExtractor[CollectedExprs]):
-    """Collects secrets and variables from expressions."""
+    """Collects secrets, variables, action and trigger references from expressions."""
 
     def __init__(self) -> None:
         self._results = CollectedExprs()
@@ -276,3 +295,30 @@ class ExprPathCollector(ExprExtractor[CollectedExprs]):
         jsonpath = token.lstrip(".")
         var_name = jsonpath.split(".", 1)[0]
         self._results.variables.add(var_name)
+
+    def actions(self, node: Tree[Token]) -> None:
+        token = node.children[0]
+        self.logger.trace("Visit action expression", node=node, child=token)
+        if not isinstance(token, Token):
+            raise ValueError("Expected a string token")
+        # ACTIONS.<ref>.<field>.<jsonpath...>
+        match = _ACTION_PATH_PATTERN.match(token)
+        if match is None:
+            # Wildcards, recursive descent or bracketed refs
+            self._results.all_actions = True
+            return
+        ref = match.group("ref")
+        task_field = match.group("field") or ACTION_FIELD_ANY
+        self._results.actions.setdefault(ref, set()).add(task_field)
+
+    def trigger(self, node: Tree[Token]) -> None:
+        self.logger.trace("Visit trigger expression", node=node)
+        self._results.trigger = True
+
+    def function(self, node: Tree[Token]) -> None:
+        token = node.children[0]
+        self.logger.trace("Visit function expression", node=node, child=token)
+        if not isinstance(token, Token):
+            raise ValueError("Expected a string token")
+        fn_name = token.removesuffix(".map")
+        self._results.functions.add(fn_name)
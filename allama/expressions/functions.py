@@ -1247,6 +1247,14 @@ def mappable(func: F) -> F:
 FUNCTION_MAPPING = {k: mappable(v) for k, v in _FUNCTION_MAPPING.items()}
 """Mapping of function names to decorated mappable versions."""
 
+NON_DETERMINISTIC_FUNCTIONS = frozenset(
+    {"get_interaction", "now", "today", "utcnow", "uuid4", "wall_clock"}
+)
+"""Functions whose result depends on the clock, randomness or the execution context.
+
+Expressions calling these must not be evaluated inside workflow code.
+"""
+
 BUILTIN_TYPE_MAPPING = {
     "int": int,
     "float": float,
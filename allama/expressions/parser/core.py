@@ -1,16 +1,38 @@
+import functools
+
 from lark import Lark, Token, Tree
 from lark.exceptions import UnexpectedCharacters, UnexpectedEOF, UnexpectedInput
 
+from allama import config
 from allama.exceptions import AllamaExpressionError
 from allama.expressions.parser.grammar import grammar
 from allama.logger import logger
 
 
 class ExprParser:
-    def __init__(self, start_rule: str = "root") -> None:
+    def __init__(
+        self,
+        start_rule: str = "root",
+        cache_size: int = config.ALLAMA__EXPRESSION_PARSE_CACHE_SIZE,
+    ) -> None:
         self.parser = Lark(grammar, start=start_rule, parser="lalr")
+        # Parse trees are never mutated by the evaluator, validators or extractors,
+        # so one tree can be shared by every use of the same expression string.
+        # Failed parses raise and are therefore never cached.
+        self._parse_cached = functools.lru_cache(maxsize=cache_size)(self._parse)
 
     def parse(self, expression: str) -> Tree[Token] | None:
+        return self._parse_cached(expression)
+
+    def cache_info(self) -> "functools._CacheInfo":
+        """Return hit/miss counters and the current size of the parse cache."""
+        return self._parse_cached.cache_info()
+
+    def cache_clear(self) -> None:
+        """Drop all cached parse trees and reset the counters."""
+        self._parse_cached.cache_clear()
+
+    def _parse(self, expression: str) -> Tree[Token] | None:
         try:
             return self.parser.parse(expression)
         except (UnexpectedCharacters, UnexpectedEOF, UnexpectedInput) as e:
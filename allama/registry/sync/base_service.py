@@ -399,15 +399,17 @@ class BaseRegistrySyncService[
             bucket = config.ALLAMA__BLOB_STORAGE_BUCKET_REGISTRY
             await blob.ensure_bucket_exists(bucket)
 
+            namespace = self._get_storage_namespace()
             tarball_s3_key = get_tarball_venv_s3_key(
-                organization_id=self._get_storage_namespace(),
+                organization_id=namespace,
                 repository_origin=origin,
                 version=version_string,
             )
             tarball_uri = await upload_tarball_venv(
-                tarball_path=tarball_result.tarball_path,
+                build=tarball_result,
                 key=tarball_s3_key,
                 bucket=bucket,
+                organization_id=namespace,
             )
             self.logger.info(
                 "Tarball venv uploaded",
@@ -153,7 +153,7 @@ class RegistrySyncRunner:
 
             logger.info(
                 "Tarball venv built",
-                tarball_path=str(tarball_result.tarball_path),
+                num_layers=len(tarball_result.manifest.layers),
                 compressed_size_bytes=tarball_result.compressed_size_bytes,
             )
 
@@ -176,7 +176,7 @@ class RegistrySyncRunner:
 
             # Phase 4: Upload tarball to S3
             tarball_uri = await self._upload_tarball(
-                tarball_path=tarball_result.tarball_path,
+                build=tarball_result,
                 repository_origin=request.origin,
                 commit_sha=commit_sha,
                 storage_namespace=request.storage_namespace,
@@ -405,7 +405,7 @@ class RegistrySyncRunner:
 
     async def _upload_tarball(
         self,
-        tarball_path: Path,
+        build: TarballVenvBuildResult,
         repository_origin: str,
         commit_sha: str | None,
         storage_namespace: str | None,
@@ -413,7 +413,7 @@ class RegistrySyncRunner:
         """Upload the tarball venv to S3.
 
         Args:
-            tarball_path: Local path to the tarball.
+            build: The built tarball venv layers.
             repository_origin: Repository origin for S3 key generation.
             commit_sha: Commit SHA for version string (or timestamp if None).
             storage_namespace: Namespace prefix for tarball storage.
@@ -442,7 +442,8 @@ class RegistrySyncRunner:
 
         # Upload
         return await upload_tarball_venv(
-            tarball_path=tarball_path,
+            build=build,
             key=s3_key,
             bucket=bucket,
+            organization_id=namespace,
         )
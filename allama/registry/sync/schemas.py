@@ -107,7 +107,9 @@ class RegistrySyncResult(BaseModel):
         default_factory=list,
         description="List of discovered registry actions",
     )
-    tarball_uri: str = Field(..., description="S3 URI of the uploaded tarball venv")
+    tarball_uri: str = Field(
+        ..., description="S3 URI of the uploaded tarball venv (or its layer manifest)"
+    )
     commit_sha: str | None = Field(
         default=None,
         description="Resolved commit SHA (None for builtin/local repos)",
@@ -116,3 +118,35 @@ class RegistrySyncResult(BaseModel):
         default_factory=dict,
         description="Map of action name to validation errors",
     )
+
+
+TarballCompression = Literal["gzip", "zstd"]
+"""Compression format of a registry tarball."""
+
+
+class TarballVenvLayer(BaseModel):
+    """A content-addressed layer of a registry venv artifact."""
+
+    name: str = Field(
+        ...,
+        description="Distribution in the layer (name-version), or 'site-packages' for files no distribution owns",
+    )
+    digest: str = Field(..., description="SHA-256 of the compressed layer tarball")
+    size_bytes: int = Field(..., description="Size of the compressed layer tarball")
+    compression: TarballCompression = Field(
+        default="gzip", description="Compression format of the layer tarball"
+    )
+    key: str | None = Field(
+        default=None,
+        description="Object key of the uploaded layer (set on upload)",
+    )
+
+
+class TarballVenvManifest(BaseModel):
+    """Manifest of a layered registry venv artifact.
+
+    Executors extract each layer and assemble them, in order, into one
+    site-packages directory.
+    """
+
+    layers: list[TarballVenvLayer] = Field(default_factory=list)
@@ -3,24 +3,41 @@
 This module provides functionality to build compressed tarball venvs from
 registry packages for upload to S3/MinIO. Tarballs are used by executors
 to install and execute registry actions.
+
+A venv is split into content-addressed layers, one per installed distribution
+(plus one for files no distribution owns), described by a manifest. Layers are
+shared across versions, so changing a repository's own code only transfers the
+layer holding that code. Layers are gzip or zstd compressed (see
+ALLAMA__REGISTRY_TARBALL_COMPRESSION); readers detect the format.
 """
 
 from __future__ import annotations
 
 import asyncio
+import csv
+import gzip
 import hashlib
 import os
 import re
+import tarfile
 import tempfile
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import IO, TYPE_CHECKING, Protocol, cast, get_args
 
 import aiofiles
 import allama_registry
+import zstandard
 
 from allama import config
 from allama.logger import logger
+from allama.registry.sync.schemas import (
+    TarballCompression,
+    TarballVenvLayer,
+    TarballVenvManifest,
+)
 from allama.storage import blob
 
 if TYPE_CHECKING:
@@ -31,16 +48,103 @@ class TarballBuildError(Exception):
     """Raised when tarball building fails."""
 
 
+TARBALL_VENV_MANIFEST_NAME = "manifest.json"
+BASE_LAYER_NAME = "site-packages"
+"""Layer holding site-packages files that no installed distribution owns."""
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+_TARBALL_SUFFIXES: dict[TarballCompression, str] = {
+    "gzip": ".tar.gz",
+    "zstd": ".tar.zst",
+}
+_TARBALL_CONTENT_TYPES: dict[TarballCompression, str] = {
+    "gzip": "application/gzip",
+    "zstd": "application/zstd",
+}
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
 @dataclass
 class TarballVenvBuildResult:
-    """Result of building a compressed tarball venv."""
+    """Result of building a layered tarball venv."""
 
-    tarball_path: Path
-    tarball_name: str
+    manifest: TarballVenvManifest
+    layers_dir: Path
+    """Directory holding the layer tarballs, named {digest}.tar.gz."""
     content_hash: str
     uncompressed_size_bytes: int
     compressed_size_bytes: int
 
+    def layer_path(self, layer: TarballVenvLayer) -> Path:
+        return self.layers_dir / f"{layer.digest}{tarball_suffix(layer.compression)}"
+
+
+def tarball_suffix(compression: TarballCompression) -> str:
+    """File suffix for a tarball with the given compression, e.g. '.tar.gz'."""
+    return _TARBALL_SUFFIXES[compression]
+
+
+def detect_tarball_compression(header: bytes) -> TarballCompression:
+    """Detect a tarball's compression format from its first bytes.
+
+    Raises:
+        ValueError: If the format isn't gzip or zstd.
+    """
+    if header.startswith(_ZSTD_MAGIC):
+        return "zstd"
+    if header.startswith(_GZIP_MAGIC):
+        return "gzip"
+    raise ValueError(f"Unrecognized tarball compression (header {header[:4]!r})")
+
+
+class ReadableStream(Protocol):
+    """A file object that only supports sequential reads."""
+
+    def read(self, size: int = -1, /) -> bytes: ...
+
+
+@contextmanager
+def open_tarball_stream(
+    fileobj: ReadableStream, compression: TarballCompression
+) -> Iterator[tarfile.TarFile]:
+    """Open a compressed tarball for sequential reading (tarfile stream mode).
+
+    The file object only needs to support read().
+    """
+    # Stream mode and zstandard's stream reader only ever call read()
+    source = cast(IO[bytes], fileobj)
+    if compression == "zstd":
+        decompressor = zstandard.ZstdDecompressor()
+        with decompressor.stream_reader(
+            source, read_across_frames=True, closefd=False
+        ) as reader:
+            with tarfile.open(fileobj=reader, mode="r|") as tar:
+                yield tar
+    else:
+        with tarfile.open(fileobj=source, mode="r|gz") as tar:
+            yield tar
+
+
+@contextmanager
+def _compressed_writer(
+    f: IO[bytes], compression: TarballCompression
+) -> Iterator[gzip.GzipFile | zstandard.ZstdCompressionWriter]:
+    """Wrap a file in a reproducible compressing writer."""
+    if compression == "zstd":
+        # Multi-threaded output doesn't depend on the number of threads
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=-1)
+        with compressor.stream_writer(f, closefd=False) as writer:
+            yield writer
+    else:
+        # Empty filename and zero mtime keep the gzip header reproducible
+        with gzip.GzipFile(
+            filename="", mode="wb", fileobj=f, compresslevel=GZIP_LEVEL, mtime=0
+        ) as gz:
+            yield gz
+
 
 def _compute_file_hash(file_path: Path) -> str:
     """Compute SHA256 hash of a file."""
@@ -66,6 +170,96 @@ def _slugify_origin(origin: str) -> str:
     return slug[:100]  # Limit length
 
 
+def _group_site_packages_files(site_packages: Path) -> dict[str, list[str]]:
+    """Group site-packages files by the distribution that installed them.
+
+    Ownership comes from each distribution's RECORD. Bytecode is owned by the
+    owner of its source file. Anything else goes in the base layer.
+
+    Returns:
+        Map of layer name to sorted paths relative to site-packages.
+    """
+    owners: dict[str, str] = {}
+    for record in sorted(site_packages.glob("*.dist-info/RECORD")):
+        layer_name = record.parent.name.removesuffix(".dist-info")
+        with record.open(newline="") as f:
+            for row in csv.reader(f):
+                if not row:
+                    continue
+                path = os.path.normpath(row[0])
+                # Skip files installed outside site-packages (e.g. scripts)
+                if not path.startswith(".."):
+                    owners[path] = layer_name
+
+    layers: dict[str, list[str]] = {}
+    for root, _, files in os.walk(site_packages):
+        for name in files:
+            path = os.path.relpath(os.path.join(root, name), site_packages)
+            owner = owners.get(path)
+            if owner is None and os.path.basename(root) == "__pycache__":
+                # pkg/__pycache__/mod.cpython-312.pyc belongs with pkg/mod.py
+                source = name.split(".", 1)[0] + ".py"
+                owner = owners.get(
+                    os.path.join(os.path.dirname(os.path.dirname(path)), source)
+                )
+            layers.setdefault(owner or BASE_LAYER_NAME, []).append(path)
+    return {name: sorted(paths) for name, paths in sorted(layers.items())}
+
+
+def _write_layer_tarball(
+    site_packages: Path,
+    paths: Iterable[str],
+    output_path: Path,
+    compression: TarballCompression = "gzip",
+) -> None:
+    """Write a reproducible compressed tarball of the given site-packages files.
+
+    Entries are ordered and their metadata normalized, so identical files always
+    produce an identical layer (and digest).
+    """
+    with open(output_path, "wb") as f:
+        with _compressed_writer(f, compression) as writer:
+            with tarfile.open(
+                fileobj=writer, mode="w", format=tarfile.PAX_FORMAT
+            ) as tar:
+                for path in paths:
+                    info = tar.gettarinfo(site_packages / path, arcname=path)
+                    info.mtime = 0
+                    info.uid = info.gid = 0
+                    info.uname = info.gname = ""
+                    if info.isreg():
+                        with open(site_packages / path, "rb") as member:
+                            tar.addfile(info, member)
+                    else:
+                        tar.addfile(info)
+
+
+def _build_layers(
+    site_packages: Path,
+    layers_dir: Path,
+    compression: TarballCompression = "gzip",
+) -> list[TarballVenvLayer]:
+    """Split site-packages into content-addressed layer tarballs."""
+    layers_dir.mkdir(parents=True, exist_ok=True)
+    suffix = tarball_suffix(compression)
+    layers: list[TarballVenvLayer] = []
+    for name, paths in _group_site_packages_files(site_packages).items():
+        temp_path = layers_dir / f"{name}{suffix}.part"
+        _write_layer_tarball(site_packages, paths, temp_path, compression)
+        digest = _compute_file_hash(temp_path)
+        size_bytes = temp_path.stat().st_size
+        temp_path.replace(layers_dir / f"{digest}{suffix}")
+        layers.append(
+            TarballVenvLayer(
+                name=name,
+                digest=digest,
+                size_bytes=size_bytes,
+                compression=compression,
+            )
+        )
+    return layers
+
+
 def get_builtin_registry_source_path() -> Path:
     """Get the path to the builtin allama_registry package source.
 
@@ -104,25 +298,29 @@ async def build_tarball_venv_from_path(
     package_path: Path,
     output_dir: Path | None = None,
     python_version: str = "3.12",
+    compression: TarballCompression | None = None,
 ) -> TarballVenvBuildResult:
-    """Build a complete venv with all dependencies and compress as tarball.
+    """Build a complete venv with all dependencies and compress it as layers.
 
-    This creates a portable venv tarball that can be extracted and used
+    This creates portable venv layer tarballs that can be extracted and used
     directly without running pip install. Faster for deployment since
     extraction is quicker than package installation.
 
     Args:
         package_path: Path to the package directory (must contain pyproject.toml)
-        output_dir: Directory to output the tarball (defaults to temp dir)
+        output_dir: Directory to output the layers (defaults to temp dir)
         python_version: Python version for the venv (default: 3.12)
+        compression: Layer compression (default: ALLAMA__REGISTRY_TARBALL_COMPRESSION)
 
     Returns:
-        TarballVenvBuildResult with the tarball path and metadata
+        TarballVenvBuildResult with the layer manifest and metadata
 
     Raises:
         TarballBuildError: If the build fails
     """
-    import tarfile
+    compression = compression or config.ALLAMA__REGISTRY_TARBALL_COMPRESSION
+    if compression not in get_args(TarballCompression):
+        raise TarballBuildError(f"Unsupported tarball compression: {compression}")
 
     if not package_path.exists():
         raise TarballBuildError(f"Package path does not exist: {package_path}")
@@ -198,7 +396,9 @@ async def build_tarball_venv_from_path(
             raise TarballBuildError(f"Could not find site-packages in {venv_dir}")
 
     # Step 4: Pre-compile Python bytecode for faster imports in sandbox
-    # This avoids runtime compilation overhead when the tarball is extracted
+    # This avoids runtime compilation overhead when the tarball is extracted.
+    # Hash-based pycs stay valid with the normalized mtimes in the layers, and
+    # keep rebuilt layers byte-identical.
     logger.info("Pre-compiling Python bytecode", site_packages=str(site_packages))
     compile_cmd = [
         str(venv_dir / "bin" / "python"),
@@ -206,6 +406,8 @@ async def build_tarball_venv_from_path(
         "compileall",
         "-q",  # Quiet mode
         "-f",  # Force recompile
+        "--invalidation-mode",
+        "unchecked-hash",
         "-j",
         "0",  # Use all CPU cores
         str(site_packages),
@@ -223,34 +425,31 @@ async def build_tarball_venv_from_path(
         f.stat().st_size for f in site_packages.rglob("*") if f.is_file()
     )
 
-    # Step 6: Create compressed tarball of site-packages
-    # Use gzip compression (zstd would be faster but less portable)
-    tarball_name = "site-packages.tar.gz"
-    tarball_path = output_dir / tarball_name
-
+    # Step 6: Split site-packages into content-addressed layers
+    layers_dir = output_dir / "layers"
     logger.info(
-        "Compressing site-packages to tarball",
+        "Compressing site-packages to layers",
         site_packages=str(site_packages),
-        tarball_path=str(tarball_path),
+        layers_dir=str(layers_dir),
         uncompressed_size_bytes=uncompressed_size,
+        compression=compression,
     )
 
     # Run tar compression in a thread to not block async loop
-    def _create_tarball() -> None:
-        with tarfile.open(tarball_path, "w:gz", compresslevel=6) as tar:
-            # Add site-packages contents with relative paths
-            for item in site_packages.iterdir():
-                tar.add(item, arcname=item.name)
-
-    await asyncio.to_thread(_create_tarball)
+    layers = await asyncio.to_thread(
+        _build_layers, site_packages, layers_dir, compression
+    )
+    manifest = TarballVenvManifest(layers=layers)
 
     # Step 7: Compute content hash
-    content_hash = await asyncio.to_thread(_compute_file_hash, tarball_path)
-    compressed_size = tarball_path.stat().st_size
+    content_hash = hashlib.sha256(
+        "\n".join(layer.digest for layer in layers).encode()
+    ).hexdigest()
+    compressed_size = sum(layer.size_bytes for layer in layers)
 
     logger.info(
         "Tarball venv built successfully",
-        tarball_name=tarball_name,
+        num_layers=len(layers),
         content_hash=content_hash[:16],
         uncompressed_size_bytes=uncompressed_size,
         compressed_size_bytes=compressed_size,
@@ -258,8 +457,8 @@ async def build_tarball_venv_from_path(
     )
 
     return TarballVenvBuildResult(
-        tarball_path=tarball_path,
-        tarball_name=tarball_name,
+        manifest=manifest,
+        layers_dir=layers_dir,
         content_hash=content_hash,
         uncompressed_size_bytes=uncompressed_size,
         compressed_size_bytes=compressed_size,
@@ -386,9 +585,9 @@ def get_tarball_venv_s3_key(
     repository_origin: str,
     version: str,
 ) -> str:
-    """Generate the S3 key for a tarball venv file.
+    """Generate the S3 key for a tarball venv manifest.
 
-    Format: {org_id}/tarball-venvs/{origin_slug}/{version}/site-packages.tar.gz
+    Format: {org_id}/tarball-venvs/{origin_slug}/{version}/manifest.json
 
     Args:
         organization_id: Organization UUID
@@ -399,40 +598,85 @@ def get_tarball_venv_s3_key(
         S3 key string
     """
     origin_slug = _slugify_origin(repository_origin)
-    return (
-        f"{organization_id}/tarball-venvs/{origin_slug}/{version}/site-packages.tar.gz"
-    )
+    return f"{organization_id}/tarball-venvs/{origin_slug}/{version}/{TARBALL_VENV_MANIFEST_NAME}"
+
+
+def get_tarball_venv_layer_s3_key(
+    organization_id: str,
+    digest: str,
+    compression: TarballCompression = "gzip",
+) -> str:
+    """Generate the S3 key for a tarball venv layer.
+
+    Layers are content-addressed and shared by every version in the organization.
+
+    Format: {org_id}/tarball-venvs/layers/{digest}.tar.gz (or .tar.zst)
+    """
+    suffix = tarball_suffix(compression)
+    return f"{organization_id}/tarball-venvs/layers/{digest}{suffix}"
 
 
 async def upload_tarball_venv(
-    tarball_path: Path,
+    build: TarballVenvBuildResult,
     key: str,
     bucket: str,
+    organization_id: str,
 ) -> str:
-    """Upload a tarball venv file to S3/MinIO.
+    """Upload a layered tarball venv to S3/MinIO.
+
+    Layers already in the bucket are skipped, so only layers that changed since
+    any earlier version are transferred.
 
     Args:
-        tarball_path: Local path to the tarball file
-        key: The S3 object key
+        build: The layered tarball venv to upload
+        key: The S3 object key for the manifest
         bucket: Bucket name
+        organization_id: Organization (storage namespace) the layers are shared in
 
     Returns:
-        The S3 URI of the uploaded tarball (s3://{bucket}/{key})
+        The S3 URI of the uploaded manifest (s3://{bucket}/{key})
 
     Raises:
-        FileNotFoundError: If the tarball file doesn't exist
+        FileNotFoundError: If a layer file doesn't exist
     """
-    if not tarball_path.exists():
-        raise FileNotFoundError(f"Tarball file not found: {tarball_path}")
 
-    # Use asyncio.to_thread to avoid blocking the event loop for large files
-    content = await asyncio.to_thread(tarball_path.read_bytes)
+    async def _upload_layer(layer: TarballVenvLayer) -> TarballVenvLayer:
+        layer_key = get_tarball_venv_layer_s3_key(
+            organization_id, layer.digest, layer.compression
+        )
+        uploaded = layer.model_copy(update={"key": layer_key})
+        if await blob.file_exists(key=layer_key, bucket=bucket):
+            return uploaded
+
+        layer_path = build.layer_path(layer)
+        if not layer_path.exists():
+            raise FileNotFoundError(f"Layer file not found: {layer_path}")
+        # Use asyncio.to_thread to avoid blocking the event loop for large files
+        content = await asyncio.to_thread(layer_path.read_bytes)
+        await blob.upload_file(
+            content=content,
+            key=layer_key,
+            bucket=bucket,
+            content_type=_TARBALL_CONTENT_TYPES[layer.compression],
+        )
+        nonlocal uploaded_bytes
+        uploaded_bytes += len(content)
+        uploaded_layers.append(layer.name)
+        return uploaded
+
+    uploaded_bytes = 0
+    uploaded_layers: list[str] = []
+    layers = await asyncio.gather(
+        *(_upload_layer(layer) for layer in build.manifest.layers)
+    )
 
+    # Upload the manifest last, so it never references a missing layer
+    manifest = TarballVenvManifest(layers=list(layers))
     await blob.upload_file(
-        content=content,
+        content=manifest.model_dump_json().encode(),
         key=key,
         bucket=bucket,
-        content_type="application/gzip",
+        content_type="application/json",
     )
 
     s3_uri = f"s3://{bucket}/{key}"
@@ -441,7 +685,10 @@ async def upload_tarball_venv(
         key=key,
         bucket=bucket,
         s3_uri=s3_uri,
-        size=len(content),
+        num_layers=len(layers),
+        uploaded_layers=uploaded_layers,
+        uploaded_bytes=uploaded_bytes,
+        total_bytes=build.compressed_size_bytes,
     )
     return s3_uri
 
@@ -449,29 +696,49 @@ async def upload_tarball_venv(
 async def download_tarball_venv(
     key: str,
     bucket: str,
-    output_path: Path,
-) -> Path:
-    """Download a tarball venv file from S3/MinIO.
+    output_dir: Path,
+) -> TarballVenvManifest:
+    """Download a layered tarball venv from S3/MinIO.
+
+    Layers are saved as {digest}.tar.gz (or .tar.zst, per the layer's compression)
+    in the output directory. Layers already there are skipped, so output
+    directories can be reused across versions.
 
     Args:
-        key: The S3 object key
+        key: The S3 object key of the manifest
         bucket: Bucket name
-        output_path: Local path to save the tarball file
+        output_dir: Local directory to save the layer tarballs in
 
     Returns:
-        The local path to the downloaded tarball
+        The venv manifest, listing the layers in extraction order
     """
-    size_bytes = await blob.download_file_to_path(
-        key=key,
-        bucket=bucket,
-        output_path=output_path,
+    manifest = TarballVenvManifest.model_validate_json(
+        await blob.download_file(key=key, bucket=bucket)
+    )
+
+    async def _download_layer(layer: TarballVenvLayer) -> int:
+        if layer.key is None:
+            raise ValueError(f"Layer {layer.name} in {key} has no object key")
+        output_path = output_dir / f"{layer.digest}{tarball_suffix(layer.compression)}"
+        if output_path.exists():
+            return 0
+        return await blob.download_file_to_path(
+            key=layer.key,
+            bucket=bucket,
+            output_path=output_path,
+            expected_sha256=layer.digest,
+        )
+
+    downloaded = await asyncio.gather(
+        *(_download_layer(layer) for layer in manifest.layers)
     )
 
     logger.info(
         "Tarball venv downloaded successfully",
         key=key,
         bucket=bucket,
-        output_path=str(output_path),
-        size=size_bytes,
+        output_dir=str(output_dir),
+        num_layers=len(manifest.layers),
+        downloaded_bytes=sum(downloaded),
     )
-    return output_path
+    return manifest
@@ -1,31 +1,69 @@
 import re
 from collections.abc import Iterable, Mapping, Sequence
+from functools import lru_cache
+from typing import Any, cast
 
 from allama.secrets.constants import MASK_VALUE
 
+MASK_PATTERN_CACHE_SIZE = 64
+"""Maximum number of compiled secret sets kept per process.
 
-def apply_masks(value: str, masks: Iterable[str]) -> str:
-    if not masks:
-        return value
+Compiled patterns embed secret values, so keep this small.
+"""
 
-    # Filter out single-character masks to prevent over-aggressive masking
-    filtered_masks = [mask for mask in masks if len(mask) > 1]
 
+@lru_cache(maxsize=MASK_PATTERN_CACHE_SIZE)
+def compile_masks(masks: tuple[str, ...]) -> re.Pattern[str] | None:
+    """Compile secret values into a single multi-pattern matcher.
+
+    Each string is then masked in one left-to-right scan. Where secrets overlap,
+    the earliest one in ``masks`` wins.
+
+    Returns:
+        The compiled pattern, or None if there is nothing to mask.
+    """
+    # Filter out single-character masks to prevent over-aggressive masking
+    filtered_masks = [mask for mask in dict.fromkeys(masks) if len(mask) > 1]
     if not filtered_masks:
-        return value
+        return None
+    return re.compile("|".join(map(re.escape, filtered_masks)))
 
-    pattern = "|".join(map(re.escape, filtered_masks))
-    return re.sub(pattern, MASK_VALUE, value)
 
+def _get_mask_pattern(masks: Iterable[str]) -> re.Pattern[str] | None:
+    if not masks:
+        return None
+    return compile_masks(tuple(masks))
 
-def apply_masks_object[T](obj: T, masks: Iterable[str]) -> T:
-    """Process jsonpaths in strings, sequences, and mappings."""
+
+def apply_masks(value: str, masks: Iterable[str]) -> str:
+    pattern = _get_mask_pattern(masks)
+    if pattern is None:
+        return value
+    return pattern.sub(MASK_VALUE, value)
+
+
+def _apply_pattern_object(obj: Any, pattern: re.Pattern[str]) -> Any:
     match obj:
         case str():
-            return apply_masks(obj, masks)
+            return pattern.sub(MASK_VALUE, obj)
+        case int() | float() | None:
+            # Most leaves in large results are scalars; skip the ABC checks below
+            return obj
         case Sequence():
-            return type(obj)(apply_masks_object(item, masks) for item in obj)  # pyright: ignore[reportCallIssue]
+            return type(obj)(_apply_pattern_object(item, pattern) for item in obj)  # pyright: ignore[reportCallIssue]
         case Mapping():
-            return type(obj)((k, apply_masks_object(v, masks)) for k, v in obj.items())  # pyright: ignore[reportCallIssue]
+            items = ((k, _apply_pattern_object(v, pattern)) for k, v in obj.items())
+            return type(obj)(items)  # pyright: ignore[reportCallIssue]
         case _:
             return obj
+
+
+def apply_masks_object[T](obj: T, masks: Iterable[str]) -> T:
+    """Process jsonpaths in strings, sequences, and mappings.
+
+    The masks are compiled once (and cached per secret set) rather than per leaf.
+    """
+    pattern = _get_mask_pattern(masks)
+    if pattern is None:
+        return obj
+    return cast(T, _apply_pattern_object(obj, pattern))
@@ -16,6 +16,7 @@ from allama.storage.object import (
     StoredObject,
 )
 from allama.storage.utils import (
+    cache_blob,
     cached_blob_download,
     compute_sha256,
     deserialize_object,
@@ -27,7 +28,8 @@ class S3ObjectStorage(ObjectStorage):
     """S3/MinIO storage with threshold-based externalization.
 
     Data below the threshold is kept inline. Data above the threshold
-    is serialized to JSON and uploaded to S3/MinIO.
+    is serialized to JSON and uploaded to S3/MinIO. The data is serialized
+    once: the bytes measured against the threshold are the bytes uploaded.
     """
 
     def __init__(
@@ -50,7 +52,7 @@ class S3ObjectStorage(ObjectStorage):
         data: Any,
     ) -> StoredObject:
         """Store data, externalizing if over threshold."""
-        # Serialize to JSON
+        # Serialize to JSON once; these bytes are both measured and uploaded
         serialized = serialize_object(data)
         size_bytes = len(serialized)
 
@@ -74,6 +76,8 @@ class S3ObjectStorage(ObjectStorage):
             bucket=self.bucket,
             content_type="application/json",
         )
+        # Reads of this object from this worker can skip the download and hash
+        await cache_blob(sha256, serialized)
 
         logger.info(
             "Externalized large object to S3",
@@ -106,21 +110,14 @@ class S3ObjectStorage(ObjectStorage):
                         f"S3ObjectStorage cannot retrieve from backend: {ref.backend}"
                     )
 
-                # Use cached download (cache key is SHA-256 hash)
+                # Use cached download (cache key is SHA-256 hash). Content is
+                # integrity-checked once when downloaded, not on every read.
                 content = await cached_blob_download(
                     sha256=ref.sha256,
                     bucket=ref.bucket,
                     key=ref.key,
+                    size_bytes=ref.size_bytes,
                 )
-
-                # Verify integrity (still needed - cache may return stale data on hash collision)
-                actual_sha256 = compute_sha256(content)
-                if actual_sha256 != ref.sha256:
-                    raise ValueError(
-                        f"Integrity check failed for {ref.key}: "
-                        f"expected {ref.sha256}, got {actual_sha256}"
-                    )
-
                 return deserialize_object(content)
             case CollectionObject() as coll:
                 if coll.index is not None:
@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import os
+import weakref
 from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import aioboto3
 import aiofiles
+from aiobotocore.config import AioConfig
 from botocore.exceptions import ClientError
 
 from allama import config
@@ -28,43 +32,153 @@ if TYPE_CHECKING:
 DEFAULT_DOWNLOAD_CHUNK_SIZE_BYTES = 8 * 1024 * 1024  # 8MB
 
 
-@asynccontextmanager
-async def get_storage_client() -> AsyncIterator[S3Client]:
-    """Get a configured S3 client for either AWS S3.
+_CREDENTIAL_ENV_VARS = (
+    "AWS_ACCESS_KEY_ID",
+    "AWS_SECRET_ACCESS_KEY",
+    "AWS_SESSION_TOKEN",
+    "AWS_PROFILE",
+    "AWS_REGION",
+    "AWS_DEFAULT_REGION",
+)
+"""Environment variables that change how a client authenticates or routes."""
 
-    Yields:
-        Configured aioboto3 S3 client
-    """
-    session = aioboto3.Session()
-    # Configure client based on protocol
+
+@dataclass(slots=True)
+class _PooledClient:
+    """A long-lived S3 client shared by all callers on one event loop."""
+
+    fingerprint: tuple[Any, ...]
+    client: S3Client
+    exit_stack: AsyncExitStack
+    users: int = 0
+    retired: bool = False
+
+    async def close(self) -> None:
+        await self.exit_stack.aclose()
+
+
+# One client per event loop: aiobotocore clients hold an aiohttp session that is
+# bound to the loop it was created on (run_sync uses per-thread loops).
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _PooledClient] = (
+    weakref.WeakKeyDictionary()
+)
+_client_locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+    weakref.WeakKeyDictionary()
+)
+
+# (endpoint, bucket) pairs known to exist, so stores skip head_bucket
+_known_buckets: set[tuple[str | None, str]] = set()
+
+
+def _client_kwargs() -> dict[str, Any]:
+    """Build the session.client() arguments for the configured storage backend."""
     if config.ALLAMA__BLOB_STORAGE_ENDPOINT is not None:
         # MinIO configuration - use AWS_* or MINIO_ROOT_* credentials
-        async with session.client(
-            "s3",
-            endpoint_url=config.ALLAMA__BLOB_STORAGE_ENDPOINT,
+        return {
+            "endpoint_url": config.ALLAMA__BLOB_STORAGE_ENDPOINT,
             # Defaults to minio default credentials. MUST REPLACE WITH PRODUCTION CREDENTIALS.
-            aws_access_key_id=os.environ.get(
+            "aws_access_key_id": os.environ.get(
                 "AWS_ACCESS_KEY_ID",
                 os.environ.get("MINIO_ROOT_USER", "minioadmin"),
             ),
-            aws_secret_access_key=os.environ.get(
+            "aws_secret_access_key": os.environ.get(
                 "AWS_SECRET_ACCESS_KEY",
                 os.environ.get("MINIO_ROOT_PASSWORD", "minioadmin"),
             ),
-        ) as client:
-            yield client
-    else:
-        # AWS S3 configuration - use AWS credentials from environment or default credential chain
-        async with session.client("s3") as client:
-            yield client
+        }
+    # AWS S3 configuration - use AWS credentials from environment or default credential chain
+    return {}
+
+
+async def _acquire_client() -> _PooledClient:
+    """Return this loop's pooled client, (re)creating it if settings changed."""
+    loop = asyncio.get_running_loop()
+    kwargs = _client_kwargs()
+    fingerprint = (
+        tuple(sorted(kwargs.items())),
+        tuple(os.environ.get(name) for name in _CREDENTIAL_ENV_VARS),
+        config.ALLAMA__BLOB_STORAGE_MAX_POOL_CONNECTIONS,
+    )
+
+    pooled = _clients.get(loop)
+    if pooled is None or pooled.fingerprint != fingerprint:
+        if (lock := _client_locks.get(loop)) is None:
+            lock = _client_locks[loop] = asyncio.Lock()
+        async with lock:
+            pooled = _clients.get(loop)
+            if pooled is not None and pooled.fingerprint != fingerprint:
+                # Credentials or endpoint changed: stop handing out the old client
+                # and close it once in-flight requests are done with it
+                logger.info("Storage client settings changed, recreating client")
+                del _clients[loop]
+                pooled.retired = True
+                if pooled.users == 0:
+                    await pooled.close()
+                pooled = None
+            if pooled is None:
+                exit_stack = AsyncExitStack()
+                client = await exit_stack.enter_async_context(
+                    aioboto3.Session().client(
+                        "s3",
+                        config=AioConfig(
+                            max_pool_connections=config.ALLAMA__BLOB_STORAGE_MAX_POOL_CONNECTIONS
+                        ),
+                        **kwargs,
+                    )
+                )
+                pooled = _PooledClient(
+                    fingerprint=fingerprint, client=client, exit_stack=exit_stack
+                )
+                _clients[loop] = pooled
+
+    pooled.users += 1
+    return pooled
+
+
+@asynccontextmanager
+async def get_storage_client() -> AsyncIterator[S3Client]:
+    """Get a configured S3 client for either AWS S3.
+
+    The client is shared process-wide (per event loop) so connections are kept
+    alive across calls. It is recreated when the endpoint or credentials change.
+
+    Yields:
+        Configured aioboto3 S3 client
+    """
+    pooled = await _acquire_client()
+    try:
+        yield pooled.client
+    finally:
+        pooled.users -= 1
+        if pooled.retired and pooled.users == 0:
+            await pooled.close()
+
+
+async def close_storage_clients() -> None:
+    """Close the pooled S3 client for the running event loop.
+
+    Clients still in use are closed when their last caller finishes.
+    """
+    loop = asyncio.get_running_loop()
+    if (pooled := _clients.pop(loop, None)) is None:
+        return
+    pooled.retired = True
+    if pooled.users == 0:
+        await pooled.close()
 
 
 async def ensure_bucket_exists(bucket: str) -> None:
     """Ensure the storage bucket exists, creating it if necessary.
 
+    Buckets are never deleted by the platform, so a bucket seen once is
+    remembered and later calls return without a round trip.
+
     Args:
         bucket: Bucket name (required)
     """
+    memo_key = (config.ALLAMA__BLOB_STORAGE_ENDPOINT, bucket)
+    if memo_key in _known_buckets:
+        return
 
     async with get_storage_client() as s3_client:
         try:
@@ -92,6 +206,8 @@ async def ensure_bucket_exists(bucket: str) -> None:
                 )
                 raise
 
+    _known_buckets.add(memo_key)
+
 
 async def get_bucket_lifecycle(
     bucket: str,
@@ -564,61 +680,3 @@ async def file_exists(key: str, bucket: str) -> bool:
         if e.response.get("Error", {}).get("Code") == "404":
             return False
         raise
-
-
-async def select_object_content(
-    key: str,
-    bucket: str,
-    expression: str,
-) -> bytes:
-    """Execute S3 Select SQL query on a JSON object.
-
-    Uses S3 Select to query JSON documents without downloading the entire object.
-    Useful for extracting specific fields or array elements.
-
-    Args:
-        key: The S3 object key
-        bucket: Bucket name
-        expression: SQL expression (e.g., "SELECT s.items[0] FROM s3object s")
-
-    Returns:
-        Query result as JSON bytes
-
-    Raises:
-        ClientError: If the query fails
-    """
-    async with get_storage_client() as s3_client:
-        try:
-            response = await s3_client.select_object_content(
-                Bucket=bucket,
-                Key=key,
-                ExpressionType="SQL",
-                Expression=expression,
-                InputSerialization={"JSON": {"Type": "DOCUMENT"}},
-                OutputSerialization={"JSON": {}},
-            )
-
-            # Collect streaming response payload
-            result_bytes = b""
-            async for event in response["Payload"]:
-                if records := event.get("Records"):
-                    if payload := records.get("Payload"):
-                        result_bytes += payload
-
-            logger.debug(
-                "S3 Select query executed",
-                key=key,
-                bucket=bucket,
-                expression=expression,
-                result_size=len(result_bytes),
-            )
-            return result_bytes
-        except ClientError as e:
-            logger.error(
-                "S3 Select query failed",
-                key=key,
-                bucket=bucket,
-                expression=expression,
-                error=str(e),
-            )
-            raise
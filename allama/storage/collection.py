@@ -19,14 +19,18 @@ Usage:
 
 from __future__ import annotations
 
+import asyncio
 import math
-from collections.abc import Callable
+from collections import deque
+from collections.abc import Callable, Iterable
 from typing import TYPE_CHECKING, Any, Literal
 
+from cramjam import zstd as cramjam_zstd  # pyright: ignore[reportAttributeAccessIssue]
 from pydantic import BaseModel
 from temporalio import activity
 
 from allama import config
+from allama.concurrency import GatheringTaskGroup
 from allama.logger import logger
 from allama.storage import blob
 from allama.storage.object import (
@@ -37,7 +41,6 @@ from allama.storage.object import (
 )
 from allama.storage.utils import (
     cached_blob_download,
-    cached_select_item,
     compute_sha256,
     deserialize_object,
     serialize_object,
@@ -47,6 +50,19 @@ if TYPE_CHECKING:
     pass
 
 
+type ChunkEncoding = Literal["json", "json+zstd"]
+
+CHUNK_ZSTD_LEVEL = 3
+"""zstd level for compressed chunks. Low levels keep writes fast; chunks are
+small and repetitive, so most of the ratio is already there."""
+
+_CONTENT_TYPES: dict[str, str] = {
+    "json": "application/json",
+    "json+zstd": "application/zstd",
+}
+_KEY_SUFFIXES: dict[str, str] = {"json": ".json", "json+zstd": ".json.zst"}
+
+
 # === Manifest Schemas === #
 
 
@@ -74,9 +90,13 @@ class CollectionManifestV1(BaseModel):
     chunks: list[ObjectRef]
     """References to chunk blobs in order."""
 
+    chunk_encoding: ChunkEncoding = "json"
+    """Encoding of the chunk blobs. Absent in manifests written before chunk
+    compression, which are plain JSON."""
+
 
 class CollectionChunkV1(BaseModel):
-    """Chunk stored at {prefix}/chunks/{index}.json.
+    """Chunk stored at {prefix}/chunks/{index}.json (.json.zst when compressed).
 
     Contains a slice of items from the collection.
     """
@@ -94,19 +114,189 @@ class CollectionChunkV1(BaseModel):
     """Items in this chunk. Type depends on manifest's element_kind."""
 
 
+# === Chunk Encoding === #
+
+
+def _encode_blob(data: Any, encoding: ChunkEncoding) -> bytes:
+    content = serialize_object(data)
+    if encoding == "json+zstd":
+        return bytes(cramjam_zstd.compress(content, CHUNK_ZSTD_LEVEL))
+    return content
+
+
+def _decode_blob(content: bytes, encoding: str) -> Any:
+    match encoding:
+        case "json":
+            return deserialize_object(content)
+        case "json+zstd":
+            return deserialize_object(bytes(cramjam_zstd.decompress(content)))
+        case _:
+            raise ValueError(f"Unsupported collection chunk encoding: {encoding}")
+
+
 # === Storage Functions === #
 
 
+class CollectionWriter:
+    """Incrementally write a chunked collection to blob storage.
+
+    Items are buffered until a full chunk is available, which is then uploaded
+    in the background. At most ALLAMA__COLLECTION_TRANSFER_CONCURRENCY chunk
+    uploads are in flight, so memory stays bounded regardless of the collection
+    size. Call close() to upload the final chunk and the manifest.
+
+    Usage:
+        writer = CollectionWriter(prefix="wf-123/stream-0/action-1")
+        for item in items:
+            await writer.append(item)
+        collection = await writer.close()
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        element_kind: Literal["value", "stored_object"] = "value",
+        chunk_size: int | None = None,
+        bucket: str | None = None,
+        compress: bool | None = None,
+    ) -> None:
+        self.prefix = prefix
+        self.element_kind: Literal["value", "stored_object"] = element_kind
+        self.chunk_size = chunk_size or config.ALLAMA__COLLECTION_CHUNK_SIZE
+        self.bucket = bucket or config.ALLAMA__BLOB_STORAGE_BUCKET_WORKFLOW
+        if compress is None:
+            compress = config.ALLAMA__COLLECTION_CHUNK_COMPRESSION_ENABLED
+        self.chunk_encoding: ChunkEncoding = "json+zstd" if compress else "json"
+        self.count = 0
+        self._buffer: list[Any] = []
+        self._chunk_refs: list[ObjectRef] = []
+        self._uploads: deque[asyncio.Task[None]] = deque()
+        self._max_uploads = max(1, config.ALLAMA__COLLECTION_TRANSFER_CONCURRENCY)
+        self._bucket_ready = False
+        self._closed = False
+
+    async def append(self, item: Any) -> None:
+        """Add an item, uploading the current chunk once it is full."""
+        if self._closed:
+            raise RuntimeError("Cannot append to a closed collection writer")
+        self._buffer.append(item)
+        self.count += 1
+        if len(self._buffer) >= self.chunk_size:
+            await self._flush_chunk()
+
+    async def extend(self, items: Iterable[Any]) -> None:
+        """Add items in order."""
+        for item in items:
+            await self.append(item)
+
+    async def close(self) -> CollectionObject:
+        """Upload any remaining items and the manifest.
+
+        Returns:
+            CollectionObject handle suitable for workflow history.
+        """
+        if self._closed:
+            raise RuntimeError("Collection writer is already closed")
+        # Empty collections still get a single (empty) chunk
+        if self._buffer or not self._chunk_refs:
+            await self._flush_chunk()
+        self._closed = True
+        # The manifest must only become visible once every chunk is stored
+        await self._wait_for_uploads(0)
+
+        manifest = CollectionManifestV1(
+            count=self.count,
+            chunk_size=self.chunk_size,
+            element_kind=self.element_kind,
+            chunks=self._chunk_refs,
+            chunk_encoding=self.chunk_encoding,
+        )
+        manifest_bytes = serialize_object(manifest.model_dump())
+        manifest_ref = self._make_ref(
+            f"{self.prefix}/manifest.json", manifest_bytes, encoding="json"
+        )
+        await self._upload(manifest_ref, manifest_bytes)
+
+        logger.info(
+            "Stored collection manifest",
+            prefix=self.prefix,
+            count=self.count,
+            num_chunks=len(self._chunk_refs),
+        )
+
+        return CollectionObject(
+            manifest_ref=manifest_ref,
+            count=self.count,
+            chunk_size=self.chunk_size,
+            element_kind=self.element_kind,
+            typename="list",
+        )
+
+    async def _flush_chunk(self) -> None:
+        index = len(self._chunk_refs)
+        chunk = CollectionChunkV1(
+            start=index * self.chunk_size,
+            items=self._buffer,
+        )
+        self._buffer = []
+        content = _encode_blob(chunk.model_dump(), self.chunk_encoding)
+        chunk_ref = self._make_ref(
+            f"{self.prefix}/chunks/{index}{_KEY_SUFFIXES[self.chunk_encoding]}",
+            content,
+            encoding=self.chunk_encoding,
+        )
+        self._chunk_refs.append(chunk_ref)
+
+        if not self._bucket_ready:
+            await blob.ensure_bucket_exists(self.bucket)
+            self._bucket_ready = True
+        await self._wait_for_uploads(self._max_uploads - 1)
+        self._uploads.append(asyncio.create_task(self._upload(chunk_ref, content)))
+
+    async def _wait_for_uploads(self, max_pending: int) -> None:
+        """Wait until at most max_pending chunk uploads are still running."""
+        try:
+            while len(self._uploads) > max_pending:
+                await self._uploads.popleft()
+        except BaseException:
+            # The collection can't be completed, so don't leave uploads running
+            for task in self._uploads:
+                task.cancel()
+            self._uploads.clear()
+            raise
+
+    def _make_ref(self, key: str, content: bytes, encoding: ChunkEncoding) -> ObjectRef:
+        return ObjectRef(
+            backend="s3",
+            bucket=self.bucket,
+            key=key,
+            size_bytes=len(content),
+            sha256=compute_sha256(content),
+            content_type=_CONTENT_TYPES[encoding],
+            encoding=encoding,
+        )
+
+    async def _upload(self, ref: ObjectRef, content: bytes) -> None:
+        # The bucket is ensured by _flush_chunk, which always runs before close()
+        await blob.upload_file(
+            content=content,
+            key=ref.key,
+            bucket=ref.bucket,
+            content_type=ref.content_type,
+        )
+
+
 async def store_collection(
     prefix: str,
     items: list[Any],
     element_kind: Literal["value", "stored_object"] = "value",
     chunk_size: int | None = None,
     bucket: str | None = None,
+    compress: bool | None = None,
 ) -> CollectionObject:
     """Store a collection as chunked manifest in blob storage.
 
-    Splits items into chunks, uploads each chunk, then uploads a manifest
+    Splits items into chunks, uploads them in parallel, then uploads a manifest
     referencing all chunks. Returns a small CollectionObject handle.
 
     Args:
@@ -115,118 +305,41 @@ async def store_collection(
         element_kind: Whether items are raw values or StoredObject handles.
         chunk_size: Items per chunk (defaults to config).
         bucket: S3/MinIO bucket (defaults to config).
+        compress: Whether to zstd-compress chunks (defaults to config).
 
     Returns:
         CollectionObject handle suitable for workflow history.
     """
-
-    chunk_size = chunk_size or config.ALLAMA__COLLECTION_CHUNK_SIZE
-    bucket = bucket or config.ALLAMA__BLOB_STORAGE_BUCKET_WORKFLOW
-
-    count = len(items)
-    num_chunks = math.ceil(count / chunk_size) if count > 0 else 1
-
-    logger.debug(
-        "Storing collection",
-        prefix=prefix,
-        count=count,
-        chunk_size=chunk_size,
-        num_chunks=num_chunks,
-    )
-
-    await blob.ensure_bucket_exists(bucket)
-
-    # Upload chunks
-    chunk_refs: list[ObjectRef] = []
-    for i in range(num_chunks):
-        start = i * chunk_size
-        end = min(start + chunk_size, count)
-        chunk_items = items[start:end]
-
-        chunk = CollectionChunkV1(
-            start=start,
-            items=chunk_items,
-        )
-        chunk_key = f"{prefix}/chunks/{i}.json"
-        chunk_bytes = serialize_object(chunk.model_dump())
-
-        await blob.upload_file(
-            content=chunk_bytes,
-            key=chunk_key,
-            bucket=bucket,
-            content_type="application/json",
-        )
-
-        chunk_ref = ObjectRef(
-            backend="s3",
-            bucket=bucket,
-            key=chunk_key,
-            size_bytes=len(chunk_bytes),
-            sha256=compute_sha256(chunk_bytes),
-            content_type="application/json",
-            encoding="json",
-        )
-        chunk_refs.append(chunk_ref)
-
-    # Upload manifest
-    manifest = CollectionManifestV1(
-        count=count,
-        chunk_size=chunk_size,
+    writer = CollectionWriter(
+        prefix,
         element_kind=element_kind,
-        chunks=chunk_refs,
-    )
-    manifest_key = f"{prefix}/manifest.json"
-    manifest_bytes = serialize_object(manifest.model_dump())
-
-    await blob.upload_file(
-        content=manifest_bytes,
-        key=manifest_key,
-        bucket=bucket,
-        content_type="application/json",
-    )
-
-    manifest_ref = ObjectRef(
-        backend="s3",
+        chunk_size=chunk_size,
         bucket=bucket,
-        key=manifest_key,
-        size_bytes=len(manifest_bytes),
-        sha256=compute_sha256(manifest_bytes),
-        content_type="application/json",
-        encoding="json",
+        compress=compress,
     )
 
-    logger.info(
-        "Stored collection manifest",
+    count = len(items)
+    logger.debug(
+        "Storing collection",
         prefix=prefix,
         count=count,
-        num_chunks=len(chunk_refs),
+        chunk_size=writer.chunk_size,
+        num_chunks=math.ceil(count / writer.chunk_size) if count > 0 else 1,
     )
 
-    return CollectionObject(
-        manifest_ref=manifest_ref,
-        count=count,
-        chunk_size=chunk_size,
-        element_kind=element_kind,
-        typename="list",
-    )
+    await writer.extend(items)
+    return await writer.close()
 
 
 async def _fetch_manifest(collection: CollectionObject) -> CollectionManifestV1:
     """Fetch and parse the manifest for a collection."""
+    # Integrity is checked by cached_blob_download when the blob is downloaded
     content = await cached_blob_download(
         sha256=collection.manifest_ref.sha256,
         bucket=collection.manifest_ref.bucket,
         key=collection.manifest_ref.key,
+        size_bytes=collection.manifest_ref.size_bytes,
     )
-
-    # Verify integrity
-    actual_sha256 = compute_sha256(content)
-    if actual_sha256 != collection.manifest_ref.sha256:
-        raise ValueError(
-            f"Manifest integrity check failed: expected {collection.manifest_ref.sha256}, "
-            f"got {actual_sha256}"
-        )
-
     data = deserialize_object(content)
     return CollectionManifestV1.model_validate(data)
 
@@ -237,39 +350,33 @@ async def _fetch_chunk(ref: ObjectRef) -> CollectionChunkV1:
         sha256=ref.sha256,
         bucket=ref.bucket,
         key=ref.key,
+        size_bytes=ref.size_bytes,
     )
-
-    # Verify integrity
-    actual_sha256 = compute_sha256(content)
-    if actual_sha256 != ref.sha256:
-        raise ValueError(
-            f"Chunk integrity check failed: expected {ref.sha256}, got {actual_sha256}"
-        )
-
-    data = deserialize_object(content)
+    data = _decode_blob(content, ref.encoding)
     return CollectionChunkV1.model_validate(data)
 
 
-async def _fetch_chunk_item(ref: ObjectRef, local_index: int) -> Any:
-    """Fetch a single item from a chunk using S3 Select with caching.
+async def _fetch_chunks(refs: list[ObjectRef]) -> list[CollectionChunkV1]:
+    """Fetch chunks, up to ALLAMA__COLLECTION_TRANSFER_CONCURRENCY at a time.
 
-    Uses S3 Select to retrieve only the requested array element instead of
-    downloading the entire chunk. Results are cached by (sha256, index).
-
-    Args:
-        ref: ObjectRef to the chunk.
-        local_index: Index within the chunk's items array.
-
-    Returns:
-        The item at the given index.
+    Results are returned in the order of refs.
     """
-    return await cached_select_item(
-        sha256=ref.sha256,
-        bucket=ref.bucket,
-        key=ref.key,
-        local_index=local_index,
+    if len(refs) == 1:
+        return [await _fetch_chunk(refs[0])]
+
+    semaphore = asyncio.Semaphore(
+        max(1, config.ALLAMA__COLLECTION_TRANSFER_CONCURRENCY)
     )
 
+    async def fetch(ref: ObjectRef) -> CollectionChunkV1:
+        async with semaphore:
+            return await _fetch_chunk(ref)
+
+    async with GatheringTaskGroup[CollectionChunkV1]() as tg:
+        for ref in refs:
+            tg.create_task(fetch(ref))
+    return tg.results()
+
 
 async def get_collection_page(
     collection: CollectionObject,
@@ -304,10 +411,10 @@ async def get_collection_page(
     start_chunk = offset // collection.chunk_size
     end_chunk = (end - 1) // collection.chunk_size
 
-    items: list[Any] = []
-    for chunk_idx in range(start_chunk, end_chunk + 1):
-        chunk = await _fetch_chunk(manifest.chunks[chunk_idx])
+    chunks = await _fetch_chunks(manifest.chunks[start_chunk : end_chunk + 1])
 
+    items: list[Any] = []
+    for chunk_idx, chunk in enumerate(chunks, start=start_chunk):
         # Calculate slice within this chunk
         chunk_start = chunk_idx * collection.chunk_size
         local_start = max(0, offset - chunk_start)
@@ -321,7 +428,10 @@ async def get_collection_page(
 async def get_collection_item(collection: CollectionObject, index: int) -> Any:
     """Get a single item from a collection by index.
 
-    Uses S3 Select to fetch only the requested item instead of the entire chunk.
+    Only the chunk holding the item is fetched. Chunks are cached per worker and
+    concurrent fetches of the same chunk share one download, so reading every
+    item of an N-item collection (e.g. from scatter branches) downloads each
+    chunk once rather than the whole collection N times.
 
     Args:
         collection: CollectionObject handle.
@@ -346,8 +456,28 @@ async def get_collection_item(collection: CollectionObject, index: int) -> Any:
     chunk_idx = index // collection.chunk_size
     local_idx = index % collection.chunk_size
 
-    # Use S3 Select for efficient single-item retrieval
-    return await _fetch_chunk_item(manifest.chunks[chunk_idx], local_idx)
+    chunk = await _fetch_chunk(manifest.chunks[chunk_idx])
+    return chunk.items[local_idx]
+
+
+async def materialize_collection_item(collection: CollectionObject, index: int) -> Any:
+    """Materialize a single collection item to its raw value.
+
+    Like materialize_collection_values, but for one item: StoredObject handles
+    (element_kind="stored_object") are retrieved to their values.
+
+    Args:
+        collection: CollectionObject handle.
+        index: Item index (0-indexed, supports negative indexing).
+
+    Returns:
+        The raw value at the given index.
+    """
+    item = await get_collection_item(collection, index)
+    if collection.element_kind == "value":
+        return item
+    stored = StoredObjectValidator.validate_python(item)
+    return await get_object_storage().retrieve(stored)
 
 
 async def materialize_collection_values(
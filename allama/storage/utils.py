@@ -4,12 +4,21 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
+import os
+import random
+import re
+import tempfile
+import time
 from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import orjson
 from aiocache import Cache
 
+from allama import config
+from allama.concurrency import single_flight
 from allama.logger import logger
 from allama.storage import blob
 
@@ -82,9 +91,166 @@ class SizedMemoryCache:
         return len(self._sizes)
 
 
-# Module-level cache for blob downloads and S3 Select results
+class DiskBlobCache:
+    """Bounded blob cache on local disk, shared by all processes on a node.
+
+    Entries are files named by their SHA-256, written atomically, so readers in
+    other processes never see partial blobs and nothing needs invalidating. Reads
+    refresh the file mtime, and the least recently used files are evicted once the
+    directory grows past max_bytes. Methods block; call them via asyncio.to_thread.
+    """
+
+    _SHA256_RE = re.compile(r"[0-9a-f]{64}")
+    _RESCAN_INTERVAL_SECONDS = 60.0
+    _EVICT_TO_RATIO = 0.9
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # Our estimate of the directory size; other processes write too, so it
+        # is refreshed by a full scan periodically and whenever it looks full
+        self._approx_bytes: int | None = None
+        self._last_scan = 0.0
+
+    def _path(self, sha256: str) -> Path | None:
+        if not self._SHA256_RE.fullmatch(sha256):
+            return None
+        return self.directory / sha256[:2] / sha256
+
+    def get(self, sha256: str) -> bytes | None:
+        if (path := self._path(sha256)) is None:
+            return None
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("Failed to read blob cache file", path=path, error=e)
+            return None
+        if compute_sha256(content) != sha256:
+            logger.warning("Dropping corrupt blob cache file", path=path)
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            # Evicted by another process since we read it
+            pass
+        return content
+
+    def set(self, sha256: str, content: bytes) -> None:
+        if (path := self._path(sha256)) is None or len(content) > self.max_bytes:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(content)
+                os.replace(tmp_name, path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            # The disk tier is best-effort; callers already have the content
+            logger.warning("Failed to write blob cache file", path=path, error=e)
+            return
+
+        if self._approx_bytes is not None:
+            self._approx_bytes += len(content)
+        if (
+            self._approx_bytes is None
+            or self._approx_bytes > self.max_bytes
+            or time.monotonic() - self._last_scan > self._RESCAN_INTERVAL_SECONDS
+        ):
+            self._evict()
+
+    def _evict(self) -> None:
+        """Rescan the directory and drop the least recently used files if full."""
+        entries: list[tuple[float, int, Path]] = []
+        try:
+            for shard in os.scandir(self.directory):
+                if not shard.is_dir():
+                    continue
+                for entry in os.scandir(shard.path):
+                    if entry.name.endswith(".tmp"):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+        except OSError as e:
+            logger.warning("Failed to scan blob cache", path=self.directory, error=e)
+            return
+
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            target = int(self.max_bytes * self._EVICT_TO_RATIO)
+            entries.sort()
+            n_evicted = 0
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                n_evicted += 1
+            logger.debug(
+                "Evicted blob cache files", count=n_evicted, remaining_bytes=total
+            )
+        self._approx_bytes = total
+        self._last_scan = time.monotonic()
+
+
+@dataclass(slots=True)
+class CacheTierStats:
+    """Lookup counters for one blob cache tier."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass(slots=True)
+class BlobCacheStats:
+    """Per-tier hit rates for cached_blob_download in this process.
+
+    The disk tier is only consulted on memory misses, so its hit rate is relative
+    to those.
+    """
+
+    memory: CacheTierStats = field(default_factory=CacheTierStats)
+    disk: CacheTierStats = field(default_factory=CacheTierStats)
+
+    def as_dict(self) -> dict[str, float | int]:
+        return {
+            "memory_hits": self.memory.hits,
+            "memory_misses": self.memory.misses,
+            "memory_hit_rate": round(self.memory.hit_rate, 4),
+            "disk_hits": self.disk.hits,
+            "disk_misses": self.disk.misses,
+            "disk_hit_rate": round(self.disk.hit_rate, 4),
+        }
+
+
+BLOB_CACHE_STATS_LOG_INTERVAL = 1000
+"""Log blob cache hit rates every this many lookups."""
+
+# Module-level cache for blob downloads
 _blob_cache = SizedMemoryCache(max_bytes=BLOB_CACHE_MAX_BYTES, ttl=BLOB_CACHE_TTL)
 
+# Shared node-local tier, created from config on first use
+_disk_cache: DiskBlobCache | None = None
+
+_blob_cache_stats = BlobCacheStats()
+
+# In-flight downloads by SHA-256, so concurrent misses share one S3 request
+_blob_downloads: dict[str, asyncio.Task[bytes]] = {}
+
 
 def serialize_object(data: Any) -> bytes:
     """Serialize data to JSON bytes using orjson.
@@ -110,6 +276,37 @@ def deserialize_object(content: bytes) -> Any:
     return orjson.loads(content)
 
 
+def get_blob_cache_stats() -> BlobCacheStats:
+    """Return this process's blob cache counters."""
+    return _blob_cache_stats
+
+
+def _record_memory_lookup(*, hit: bool) -> None:
+    stats = _blob_cache_stats
+    if hit:
+        stats.memory.hits += 1
+    else:
+        stats.memory.misses += 1
+    if (stats.memory.hits + stats.memory.misses) % BLOB_CACHE_STATS_LOG_INTERVAL == 0:
+        logger.info("Blob cache stats", **stats.as_dict())
+
+
+def _get_disk_cache() -> DiskBlobCache | None:
+    global _disk_cache
+    if not config.ALLAMA__BLOB_CACHE_DIR:
+        return None
+    directory = Path(config.ALLAMA__BLOB_CACHE_DIR)
+    if (
+        _disk_cache is None
+        or _disk_cache.directory != directory
+        or _disk_cache.max_bytes != config.ALLAMA__BLOB_CACHE_DISK_MAX_BYTES
+    ):
+        _disk_cache = DiskBlobCache(
+            directory, max_bytes=config.ALLAMA__BLOB_CACHE_DISK_MAX_BYTES
+        )
+    return _disk_cache
+
+
 def compute_sha256(content: bytes) -> str:
     """Compute SHA-256 hash of content.
 
@@ -122,33 +319,97 @@ def compute_sha256(content: bytes) -> str:
     return hashlib.sha256(content).hexdigest()
 
 
-async def cached_blob_download(sha256: str, bucket: str, key: str) -> bytes:
+async def cache_blob(sha256: str, content: bytes) -> None:
+    """Add content the caller just hashed (e.g. after uploading it) to the memory
+    cache, so a later read in this process skips the download and verification."""
+    if len(content) <= MAX_CACHEABLE_BLOB_SIZE:
+        await _blob_cache.set(sha256, content)
+
+
+async def cached_blob_download(
+    sha256: str, bucket: str, key: str, *, size_bytes: int | None = None
+) -> bytes:
     """Download blob with caching by SHA-256 hash.
 
     Uses content-addressed caching: the SHA-256 hash is the cache key since
-    objects are immutable. Cache hits avoid S3 round-trips.
+    objects are immutable. Cache hits avoid S3 round-trips. Misses in the
+    process-local memory cache fall back to the node-local disk cache (when
+    ALLAMA__BLOB_CACHE_DIR is set) before downloading, so sibling processes
+    share blobs any of them has fetched.
 
     Blobs larger than MAX_CACHEABLE_BLOB_SIZE (50 MB) are not cached to
-    prevent memory bloat.
+    prevent memory bloat. Concurrent misses for the same blob (e.g. scatter
+    branches reading items from one collection chunk) share a single download.
+
+    Downloads are verified against sha256 (or, outside the
+    ALLAMA__BLOB_INTEGRITY_SAMPLE_RATE sample, against size_bytes) before they
+    are cached, so the returned content never needs re-verifying.
 
     Args:
         sha256: SHA-256 hash of the content (cache key).
         bucket: S3/MinIO bucket name.
         key: Object key within the bucket.
+        size_bytes: Expected content size, if known.
 
     Returns:
         Downloaded blob content as bytes.
+
+    Raises:
+        ValueError: If the downloaded content fails the integrity check.
     """
     cached = await _blob_cache.get(sha256)
+    _record_memory_lookup(hit=cached is not None)
     if cached is not None:
         logger.debug("Blob cache hit", sha256=sha256[:16])
         return cached
 
+    return await single_flight(
+        _blob_downloads,
+        sha256,
+        lambda: _download_and_cache(sha256, bucket, key, size_bytes),
+    )
+
+
+def _verify_download(
+    content: bytes, sha256: str, key: str, size_bytes: int | None
+) -> None:
+    if size_bytes is not None and len(content) != size_bytes:
+        raise ValueError(
+            f"Integrity check failed for {key}: "
+            f"expected {size_bytes} bytes, got {len(content)}"
+        )
+    sample_rate = config.ALLAMA__BLOB_INTEGRITY_SAMPLE_RATE
+    if sample_rate >= 1 or random.random() < sample_rate:
+        actual_sha256 = compute_sha256(content)
+        if actual_sha256 != sha256:
+            raise ValueError(
+                f"Integrity check failed for {key}: "
+                f"expected {sha256}, got {actual_sha256}"
+            )
+
+
+async def _download_and_cache(
+    sha256: str, bucket: str, key: str, size_bytes: int | None
+) -> bytes:
+    disk_cache = _get_disk_cache()
+    if disk_cache is not None:
+        content = await asyncio.to_thread(disk_cache.get, sha256)
+        if content is not None:
+            _blob_cache_stats.disk.hits += 1
+            logger.debug("Blob disk cache hit", sha256=sha256[:16])
+            if len(content) <= MAX_CACHEABLE_BLOB_SIZE:
+                await _blob_cache.set(sha256, content)
+            return content
+        _blob_cache_stats.disk.misses += 1
+
     content = await blob.download_file(key=key, bucket=bucket)
+    _verify_download(content, sha256, key, size_bytes)
 
     # Skip caching large blobs to prevent memory bloat
     if len(content) <= MAX_CACHEABLE_BLOB_SIZE:
         await _blob_cache.set(sha256, content)
+        if disk_cache is not None:
+            await asyncio.to_thread(disk_cache.set, sha256, content)
         logger.debug("Cached blob", sha256=sha256[:16], size_bytes=len(content))
     else:
         logger.debug(
@@ -161,57 +422,6 @@ async def cached_blob_download(sha256: str, bucket: str, key: str) -> bytes:
     return content
 
 
-async def cached_select_item(
-    sha256: str, bucket: str, key: str, local_index: int
-) -> Any:
-    """Select a single item from a chunk using S3 Select with caching.
-
-    Uses (sha256, local_index) as the cache key since chunks are immutable.
-    Cache hits avoid S3 Select round-trips. Shares the same cache pool as
-    blob downloads for unified memory management.
-
-    Args:
-        sha256: SHA-256 hash of the chunk (used for cache key).
-        bucket: S3/MinIO bucket name.
-        key: Object key within the bucket.
-        local_index: Index within the chunk's items array.
-
-    Returns:
-        The item at the given index.
-    """
-    cache_key = f"select:{sha256}:{local_index}"
-    cached = await _blob_cache.get(cache_key)
-    if cached is not None:
-        logger.debug("Select cache hit", sha256=sha256[:16], index=local_index)
-        return deserialize_object(cached)
-
-    expression = f"SELECT s.items[{local_index}] FROM s3object s"
-    result_bytes = await blob.select_object_content(
-        key=key,
-        bucket=bucket,
-        expression=expression,
-    )
-
-    # S3 Select returns {"_1": <item>} for indexed array access
-    data = deserialize_object(result_bytes)
-    item = data.get("_1")
-
-    # Serialize item for byte-aware cache
-    item_bytes = serialize_object(item)
-    if len(item_bytes) <= MAX_CACHEABLE_BLOB_SIZE:
-        await _blob_cache.set(cache_key, item_bytes)
-        logger.debug("Cached select item", sha256=sha256[:16], index=local_index)
-    else:
-        logger.debug(
-            "Select item too large to cache",
-            sha256=sha256[:16],
-            index=local_index,
-            size_bytes=len(item_bytes),
-            max_size=MAX_CACHEABLE_BLOB_SIZE,
-        )
-    return item
-
-
 async def resolve_to_inline(stored: StoredObject) -> InlineObject:
     """Resolve any StoredObject to InlineObject by fetching external data.
 
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import uuid
+from collections import OrderedDict
+
 from sqlalchemy import select
 from temporalio import activity
 
+from allama.concurrency import single_flight
 from allama.db.models import WorkflowDefinition
 from allama.dsl.common import DSLInput
 from allama.exceptions import AllamaException
@@ -98,8 +103,24 @@ class WorkflowDefinitionsService(BaseWorkspaceService):
         return defn
 
 
-@activity.defn
-async def get_workflow_definition_activity(
+DEFINITION_CACHE_MAX_ENTRIES = 256
+"""Maximum number of pinned workflow definition versions kept in memory per worker.
+
+A definition version never changes, so entries don't expire; the least recently
+used version is evicted once this many are cached.
+"""
+
+type _DefinitionKey = tuple[uuid.UUID | None, WorkflowID, int]
+
+_definition_cache: OrderedDict[_DefinitionKey, WorkflowDefinitionActivityResult] = (
+    OrderedDict()
+)
+_definition_loads: dict[
+    _DefinitionKey, asyncio.Task[WorkflowDefinitionActivityResult]
+] = {}
+
+
+async def _load_workflow_definition(
     input: GetWorkflowDefinitionActivityInputs,
 ) -> WorkflowDefinitionActivityResult:
     async with WorkflowDefinitionsService.with_session(role=input.role) as service:
@@ -118,6 +139,40 @@ async def get_workflow_definition_activity(
     return WorkflowDefinitionActivityResult(dsl=dsl, registry_lock=registry_lock)
 
 
+async def _get_pinned_workflow_definition(
+    input: GetWorkflowDefinitionActivityInputs, version: int
+) -> WorkflowDefinitionActivityResult:
+    """Fetch a specific definition version, caching it on this worker.
+
+    Child workflows of a loop all pin the same version, so they share one load.
+    """
+    key = (input.role.workspace_id, input.workflow_id, version)
+    if (result := _definition_cache.get(key)) is not None:
+        _definition_cache.move_to_end(key)
+        return result
+
+    def _cache(result: WorkflowDefinitionActivityResult) -> None:
+        _definition_cache[key] = result
+        while len(_definition_cache) > DEFINITION_CACHE_MAX_ENTRIES:
+            _definition_cache.popitem(last=False)
+
+    return await single_flight(
+        _definition_loads,
+        key,
+        lambda: _load_workflow_definition(input),
+        on_result=_cache,
+    )
+
+
+@activity.defn
+async def get_workflow_definition_activity(
+    input: GetWorkflowDefinitionActivityInputs,
+) -> WorkflowDefinitionActivityResult:
+    if input.version is not None:
+        return await _get_pinned_workflow_definition(input, input.version)
+    return await _load_workflow_definition(input)
+
+
 @activity.defn
 async def resolve_registry_lock_activity(
     input: ResolveRegistryLockActivityInputs,
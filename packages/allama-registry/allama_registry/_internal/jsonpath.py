@@ -4,6 +4,9 @@ This module provides a lightweight JSONPath evaluation function that avoids
 importing heavy allama modules during SDK-style invocation.
 """
 
+import functools
+import re
+from dataclasses import dataclass
 from typing import Any
 
 import jsonpath_ng.ext
@@ -14,61 +17,162 @@ from allama_registry._internal.exceptions import AllamaExpressionError
 from allama_registry._internal.logger import logger
 
 
+JSONPATH_CACHE_SIZE = 2048
+"""Maximum number of compiled jsonpath expressions kept per process."""
+
+_SIMPLE_JSONPATH_PATTERN = re.compile(
+    r"^(?:\$|[a-zA-Z_][a-zA-Z0-9_]*)(?:\.[a-zA-Z_][a-zA-Z0-9_]*|\[\d+\])*$"
+)
+_SIMPLE_JSONPATH_SEGMENT = re.compile(r"\.?([a-zA-Z_][a-zA-Z0-9_]*)|\[(\d+)\]")
+# Identifiers the jsonpath_ng.ext lexer doesn't treat as plain field names.
+_JSONPATH_RESERVED_PREFIXES = ("true", "false")
+_JSONPATH_RESERVED_WORDS = frozenset({"where", "wherenot"})
+
+_NO_MATCH = object()
+"""Sentinel for a simple path that didn't match anything."""
+_UNSUPPORTED = object()
+"""Sentinel for a simple path that hit a value the fast path doesn't handle."""
+
+
+@dataclass(frozen=True, slots=True)
+class _CompiledJsonPath:
+    path: jsonpath_nodes.JSONPath
+    returns_list: bool
+    """Whether the expression has a wildcard or filter, so results are always a list."""
+
+
+def _contains_filter(path: jsonpath_nodes.JSONPath) -> bool:
+    stack: list[jsonpath_nodes.JSONPath] = [path]
+    while stack:
+        current = stack.pop()
+        if hasattr(current, "filter_expr"):
+            return True
+
+        for child in (
+            getattr(current, "left", None),
+            getattr(current, "right", None),
+            getattr(current, "child", None),
+            getattr(current, "expression", None),
+        ):
+            if isinstance(child, jsonpath_nodes.JSONPath):
+                stack.append(child)
+
+        for children in (
+            getattr(current, "fields", None),
+            getattr(current, "fields_list", None),
+            getattr(current, "components", None),
+        ):
+            if isinstance(children, list | tuple):
+                stack.extend(
+                    child
+                    for child in children
+                    if isinstance(child, jsonpath_nodes.JSONPath)
+                )
+
+    return False
+
+
+@functools.lru_cache(maxsize=JSONPATH_CACHE_SIZE)
+def _compile_jsonpath(expr: str) -> _CompiledJsonPath:
+    """Parse a jsonpath expression with jsonpath_ng.
+
+    Raises:
+        JsonPathParserError: If the expression is invalid. Errors are not cached.
+    """
+    path = jsonpath_ng.ext.parse(expr)
+    has_wildcard = "[*]" in expr
+    has_filter = "[?(" in expr or "[?@" in expr or _contains_filter(path)
+    return _CompiledJsonPath(path=path, returns_list=has_wildcard or has_filter)
+
+
+@functools.lru_cache(maxsize=JSONPATH_CACHE_SIZE)
+def _simple_jsonpath_segments(expr: str) -> tuple[str | int, ...] | None:
+    """Split a plain dotted/indexed path (e.g. `$.a.b[0].id`) into segments.
+
+    Returns None for anything else (wildcards, filters, slices, quoted fields, ...),
+    which must go through jsonpath_ng.
+    """
+    if not _SIMPLE_JSONPATH_PATTERN.match(expr):
+        return None
+    segments: list[str | int] = []
+    for field_name, index in _SIMPLE_JSONPATH_SEGMENT.findall(expr.removeprefix("$")):
+        if index:
+            segments.append(int(index))
+        elif (
+            field_name.startswith(_JSONPATH_RESERVED_PREFIXES)
+            or field_name in _JSONPATH_RESERVED_WORDS
+        ):
+            return None
+        else:
+            segments.append(field_name)
+    return tuple(segments)
+
+
+def _find_simple_jsonpath(operand: Any, segments: tuple[str | int, ...]) -> Any:
+    """Resolve path segments by direct traversal, mirroring jsonpath_ng semantics.
+
+    Returns `_NO_MATCH` if the path doesn't resolve, or `_UNSUPPORTED` if a value
+    is reached whose jsonpath_ng behavior isn't replicated here.
+    """
+    current = operand
+    for segment in segments:
+        if isinstance(segment, str):
+            if isinstance(current, dict):
+                if segment not in current:
+                    return _NO_MATCH
+                current = current[segment]
+            elif current is None or isinstance(current, list | str | int | float):
+                # jsonpath_ng field lookups only match objects with a `.get`
+                return _NO_MATCH
+            else:
+                return _UNSUPPORTED
+        elif isinstance(current, list):
+            if len(current) <= segment:
+                return _NO_MATCH
+            current = current[segment]
+        else:
+            return _UNSUPPORTED
+    return current
+
+
 def eval_jsonpath(
     expr: str,
     operand: dict[str, Any] | list[Any],
     *,
     strict: bool = False,
 ) -> Any | None:
-    """Evaluate a jsonpath expression on the target object (operand)."""
+    """Evaluate a jsonpath expression on the target object (operand).
+
+    Plain dotted/indexed paths are resolved by direct traversal. Everything else is
+    evaluated with jsonpath_ng, with compiled expressions cached per process.
+    """
 
     if operand is None or not isinstance(operand, dict | list):
         logger.error(f"Invalid operand for jsonpath: {operand}")
         raise AllamaExpressionError(
             f"A dict or list operand is required as jsonpath target. Got {type(operand)}"
         )
-    try:
-        # Try to evaluate the expression
-        jsonpath_expr = jsonpath_ng.ext.parse(expr)
-    except JsonPathParserError as e:
-        logger.error(f"Invalid jsonpath expression: {expr!r}")
-        raise AllamaExpressionError(f"Invalid jsonpath {expr!r}") from e
-    matches = [found.value for found in jsonpath_expr.find(operand)]
-
-    def _contains_filter(path: jsonpath_nodes.JSONPath) -> bool:
-        stack: list[jsonpath_nodes.JSONPath] = [path]
-        while stack:
-            current = stack.pop()
-            if hasattr(current, "filter_expr"):
-                return True
-
-            for child in (
-                getattr(current, "left", None),
-                getattr(current, "right", None),
-                getattr(current, "child", None),
-                getattr(current, "expression", None),
-            ):
-                if isinstance(child, jsonpath_nodes.JSONPath):
-                    stack.append(child)
-
-            for children in (
-                getattr(current, "fields", None),
-                getattr(current, "fields_list", None),
-                getattr(current, "components", None),
-            ):
-                if isinstance(children, list | tuple):
-                    stack.extend(
-                        child
-                        for child in children
-                        if isinstance(child, jsonpath_nodes.JSONPath)
-                    )
-
-        return False
 
-    has_wildcard = "[*]" in expr
-    has_filter = "[?(" in expr or "[?@" in expr or _contains_filter(jsonpath_expr)
+    matches: list[Any] | None = None
+    returns_list = False
+    if (segments := _simple_jsonpath_segments(expr)) is not None:
+        value = _find_simple_jsonpath(operand, segments)
+        if value is _NO_MATCH:
+            matches = []
+        elif value is not _UNSUPPORTED:
+            matches = [value]
+
+    if matches is None:
+        try:
+            # Try to evaluate the expression
+            compiled = _compile_jsonpath(expr)
+        except JsonPathParserError as e:
+            logger.error(f"Invalid jsonpath expression: {expr!r}")
+            raise AllamaExpressionError(f"Invalid jsonpath {expr!r}") from e
+        matches = [found.value for found in compiled.path.find(operand)]
+        returns_list = compiled.returns_list
 
-    if len(matches) > 1 or has_wildcard or has_filter:
+    if len(matches) > 1 or returns_list:
         # If there are multiple matches or array wildcard, return the list
         return matches
     elif len(matches) == 1:
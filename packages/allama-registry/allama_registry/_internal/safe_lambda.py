@@ -7,12 +7,26 @@ importing heavy allama modules during SDK-style invocation.
 import ast
 import functools
 import sys
-from collections.abc import Callable
-from typing import Any
+from collections.abc import (
+    Callable,
+    ItemsView,
+    Iterator,
+    KeysView,
+    Mapping,
+    Sequence,
+    ValuesView,
+)
+from types import CodeType
+from typing import Any, SupportsIndex
 
 from allama_registry._internal.jsonpath import eval_jsonpath
 
 
+MAX_EXPR_LENGTH = 1000
+LAMBDA_CACHE_SIZE = 1024
+"""Number of distinct lambda sources whose validated, compiled code is kept."""
+
+
 class SafeLambdaValidator(ast.NodeVisitor):
     """AST validator for lambda expressions using allow/deny lists."""
 
@@ -249,6 +263,162 @@ class SafeLambdaValidator(ast.NodeVisitor):
         self.generic_visit(node)
 
 
+MAX_ITERATIONS = 10000
+"""Maximum number of items in a dict or list passed to a lambda."""
+
+MAX_RECURSION_DEPTH = 500
+
+
+class _ReadOnlyDict(Mapping[Any, Any]):
+    """Read-only view of a dict passed to a lambda, so it needn't be copied.
+
+    Mutating methods don't exist, so mutation attempts raise AttributeError.
+    The wrapped dict is name-mangled, which lambdas can't reach (no "__").
+    """
+
+    __slots__ = ("__data",)
+
+    def __init__(self, data: dict[Any, Any]):
+        self.__data = data
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.__data[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.__data)
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__data
+
+    def __eq__(self, other: object) -> bool:
+        return self.__data == _unwrap(other)
+
+    __hash__ = None  # pyright: ignore[reportAssignmentType]
+
+    def __or__(self, other: Any) -> dict[Any, Any]:
+        return self.__data | _unwrap(other)
+
+    def __ror__(self, other: Any) -> dict[Any, Any]:
+        return _unwrap(other) | self.__data
+
+    def __repr__(self) -> str:
+        return repr(self.__data)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self.__data.get(key, default)
+
+    def keys(self) -> KeysView[Any]:
+        return self.__data.keys()
+
+    def values(self) -> ValuesView[Any]:
+        return self.__data.values()
+
+    def items(self) -> ItemsView[Any, Any]:
+        return self.__data.items()
+
+    def copy(self) -> dict[Any, Any]:
+        return self.__data.copy()
+
+
+class _ReadOnlyList(Sequence[Any]):
+    """Read-only view of a list passed to a lambda, so it needn't be copied.
+
+    Mutating methods don't exist, so mutation attempts raise AttributeError.
+    The wrapped list is name-mangled, which lambdas can't reach (no "__").
+    """
+
+    __slots__ = ("__data",)
+
+    def __init__(self, data: list[Any]):
+        self.__data = data
+
+    def __getitem__(self, index: Any) -> Any:
+        # Slices are new lists, as with a list
+        return self.__data[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.__data)
+
+    def __reversed__(self) -> Iterator[Any]:
+        return reversed(self.__data)
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __contains__(self, value: object) -> bool:
+        return value in self.__data
+
+    def __eq__(self, other: object) -> bool:
+        return self.__data == _unwrap(other)
+
+    def __lt__(self, other: Any) -> bool:
+        return self.__data < _unwrap(other)
+
+    def __le__(self, other: Any) -> bool:
+        return self.__data <= _unwrap(other)
+
+    def __gt__(self, other: Any) -> bool:
+        return self.__data > _unwrap(other)
+
+    def __ge__(self, other: Any) -> bool:
+        return self.__data >= _unwrap(other)
+
+    __hash__ = None  # pyright: ignore[reportAssignmentType]
+
+    def __add__(self, other: Any) -> list[Any]:
+        return self.__data + _unwrap(other)
+
+    def __radd__(self, other: Any) -> list[Any]:
+        return _unwrap(other) + self.__data
+
+    def __mul__(self, n: int) -> list[Any]:
+        return self.__data * n
+
+    __rmul__ = __mul__
+
+    def __repr__(self) -> str:
+        return repr(self.__data)
+
+    def index(
+        self, value: Any, start: SupportsIndex = 0, stop: SupportsIndex = sys.maxsize
+    ) -> int:
+        return self.__data.index(value, start, stop)
+
+    def count(self, value: Any) -> int:
+        return self.__data.count(value)
+
+    def copy(self) -> list[Any]:
+        return self.__data.copy()
+
+
+def _unwrap(value: Any) -> Any:
+    """Replace a read-only view with a copy of what it wraps."""
+    if isinstance(value, _ReadOnlyDict | _ReadOnlyList):
+        return value.copy()
+    return value
+
+
+def _unwrap_nested(value: Any) -> Any:
+    """Replace read-only views anywhere in a lambda result with copies."""
+    if isinstance(value, _ReadOnlyDict | _ReadOnlyList):
+        return value.copy()
+    if isinstance(value, list):
+        return [_unwrap_nested(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_unwrap_nested(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _unwrap_nested(item) for key, item in value.items()}
+    return value
+
+
+def _jsonpath(expr: str, operand: Any, **kwargs: Any) -> Any:
+    """jsonpath for lambdas, which works on read-only views."""
+    return eval_jsonpath(expr, _unwrap(operand), **kwargs)
+
+
 def _sandbox_lambda(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
     """Wrap a lambda function with runtime protections (internal).
 
@@ -261,27 +431,22 @@ def _sandbox_lambda(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
     @functools.wraps(func)
     def sandboxed_wrapper(x):
         original_recursion_limit = sys.getrecursionlimit()
-        MAX_RECURSION_DEPTH = 500
         sys.setrecursionlimit(MAX_RECURSION_DEPTH)
 
         try:
-            execution_count = 0
-            MAX_ITERATIONS = 10000
-
-            def count_guard(value):
-                nonlocal execution_count
-                execution_count += 1
-                if execution_count > MAX_ITERATIONS:
+            # Pass dicts and lists as read-only views rather than copies
+            if isinstance(x, dict | list):
+                if len(x) > MAX_ITERATIONS:
                     raise ValueError("Expression exceeded maximum iteration limit")
-                return value
-
-            if hasattr(x, "__iter__") and not isinstance(x, str | bytes):
-                if isinstance(x, dict):
-                    x = {k: count_guard(v) for k, v in x.items()}
-                elif isinstance(x, list):
-                    x = [count_guard(item) for item in x]
-
-            result = func(x)
+                view = _ReadOnlyDict(x) if isinstance(x, dict) else _ReadOnlyList(x)
+                refcount = sys.getrefcount(view)
+                result = func(view)
+                # A view only escapes if the result references it (e.g.
+                # `lambda x: [x]`); hand the caller copies, as it used to get
+                if sys.getrefcount(view) > refcount:
+                    result = _unwrap_nested(result)
+            else:
+                result = func(x)
 
             if hasattr(result, "__class__"):
                 result_type = type(result)
@@ -313,10 +478,12 @@ def _sandbox_lambda(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
     return sandboxed_wrapper
 
 
-def build_safe_lambda(lambda_expr: str) -> Callable[[Any], Any]:
-    """Build a safe lambda function from a string expression."""
+@functools.lru_cache(maxsize=LAMBDA_CACHE_SIZE)
+def _compile_safe_lambda(lambda_expr: str) -> CodeType:
+    """Validate a lambda expression and compile it (cached by source text).
 
-    MAX_EXPR_LENGTH = 1000
+    Invalid expressions raise and aren't cached.
+    """
     if len(lambda_expr) > MAX_EXPR_LENGTH:
         raise ValueError(f"Expression too long (max {MAX_EXPR_LENGTH} characters)")
 
@@ -346,7 +513,16 @@ def build_safe_lambda(lambda_expr: str) -> Callable[[Any], Any]:
 
     SafeLambdaValidator().visit(expr_ast)
 
-    code = compile(ast.Expression(expr_ast), "<string>", "eval")
+    return compile(ast.Expression(expr_ast), "<string>", "eval")
+
+
+def build_safe_lambda(lambda_expr: str) -> Callable[[Any], Any]:
+    """Build a safe lambda function from a string expression.
+
+    Validation and compilation are cached by source text. Each call still creates
+    a new function, so mutable default arguments aren't shared between callers.
+    """
+    code = _compile_safe_lambda(lambda_expr)
 
     safe_builtins = {
         "abs": abs,
@@ -377,7 +553,7 @@ def build_safe_lambda(lambda_expr: str) -> Callable[[Any], Any]:
 
     restricted_globals = {
         "__builtins__": safe_builtins,
-        "jsonpath": eval_jsonpath,
+        "jsonpath": _jsonpath,
     }
 
     lambda_func = eval(code, restricted_globals, {})
@@ -56,8 +56,12 @@ async def execute(
         Doc("Version of the subflow definition, if any."),
     ] = None,
     loop_strategy: Annotated[
-        Literal["parallel", "batch", "sequential"],
-        Doc("Execution strategy to use for the subflow."),
+        Literal["parallel", "batch", "sequential", "window"],
+        Doc(
+            "Execution strategy to use for the subflow. "
+            "`batch` waits for each batch of `batch_size` subflows to complete, "
+            "`window` starts a new subflow as soon as any of `batch_size` running ones completes."
+        ),
     ] = "batch",
     batch_size: Annotated[
         int,
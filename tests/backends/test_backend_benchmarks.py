@@ -5,6 +5,18 @@ pytest-benchmark based performance tests measuring:
 - Cold start latency (backend initialization overhead)
 - Concurrent throughput (actions/second under concurrency)
 - Memory usage after burst workloads
+- Pool transport throughput with per-task vs multiplexed worker connections
+- Expression parsing and evaluation over large templated args
+- Blob store latency with a pooled vs per-call storage client
+- Chunked collection store/materialize throughput by transfer concurrency
+- Externalized result store/retrieve latency and integrity-check overhead
+- Temporal payload compression codecs, with and without a zstd dictionary
+- Stream-aware context building for tasks inside nested scatters
+- Registry tarball cold start: download-then-extract vs streamed extraction
+- Registry venv layer pack/unpack by compression format
+- Safe lambda filters with a cached vs per-call compile
+- Safe lambda maps over large records with read-only views vs copies
+- Secret masking of a large result with compiled vs per-leaf patterns
 
 IMPORTANT: These benchmarks require the full development stack to be running:
     - Docker services via `make dev` (PostgreSQL, Redis, MinIO, Temporal)
@@ -37,19 +49,32 @@ Note: Sandboxed backends (pool, ephemeral) require Linux with nsjail.
 from __future__ import annotations
 
 import asyncio
+import functools
 import gc
+import io
+import json
+import random
+import re
 import resource
+import shutil
+import tarfile
+import threading
 import time
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Iterator, Mapping, Sequence
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from importlib import metadata
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import pytest
 
 if TYPE_CHECKING:
     from allama.auth.types import Role
+    from allama.dsl.scheduler import DSLScheduler
     from allama.dsl.schemas import RunActionInput
     from allama.executor.backends.base import ExecutorBackend
     from allama.executor.schemas import ResolvedContext
+    from allama.registry.sync.schemas import TarballCompression
 
 # Mark all tests in this module as integration tests requiring infrastructure
 pytestmark = pytest.mark.integration
@@ -738,3 +763,872 @@ class TestBackendComparison:
         assert results["direct"] >= results["ephemeral"], (
             "Direct should have higher throughput than ephemeral"
         )
+
+
+# =============================================================================
+# Pool Transport Benchmarks
+# =============================================================================
+
+
+@pytest.fixture
+def pool_worker_test_mode(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Spawn pool workers as plain subprocesses that return mock success."""
+    from allama import config
+
+    monkeypatch.setattr(config, "ALLAMA__DISABLE_NSJAIL", True)
+    monkeypatch.setenv("ALLAMA__POOL_WORKER_TEST_MODE", "true")
+
+
+class TestPoolTransport:
+    """Host-to-worker transport throughput of the worker pool.
+
+    Workers run in test mode, so each task is a no-op and the measurement is
+    dominated by the transport. Tasks/second is recorded in the benchmark's
+    extra info.
+    """
+
+    @pytest.mark.parametrize(
+        "multiplex", [False, True], ids=["per-task", "multiplexed"]
+    )
+    def test_throughput(
+        self,
+        benchmark: Any,
+        pool_worker_test_mode: None,  # noqa: ARG002
+        simple_action_input_factory: Callable[..., RunActionInput],
+        resolved_context_factory: Callable[..., ResolvedContext],
+        benchmark_role: Role,
+        multiplex: bool,
+    ) -> None:
+        """Run a burst of concurrent no-op tasks over two workers."""
+        from allama.executor.backends.pool import WorkerPool
+
+        task_count = 400
+        resolved_context = resolved_context_factory(role=benchmark_role)
+        pool = WorkerPool(
+            size=2,
+            max_concurrent_per_worker=8,
+            max_tasks_per_worker=10_000,
+            multiplex_connections=multiplex,
+        )
+
+        async def burst(n: int, timeout: float) -> list[Any]:
+            return await asyncio.gather(
+                *[
+                    pool.execute(
+                        input=simple_action_input_factory(),
+                        role=benchmark_role,
+                        resolved_context=resolved_context,
+                        timeout=timeout,
+                    )
+                    for _ in range(n)
+                ]
+            )
+
+        benchmark.group = "pool-transport"
+        with asyncio.Runner() as runner:
+            runner.run(pool.start())
+            try:
+                # Warm up the workers (and open connections when multiplexing)
+                runner.run(burst(16, 30.0))
+                results = benchmark.pedantic(
+                    lambda: runner.run(burst(task_count, 60.0)), rounds=3
+                )
+            finally:
+                runner.run(pool.shutdown())
+
+        assert all(r.type == "success" for r in results)
+        if benchmark.stats is not None:
+            benchmark.extra_info["tasks_per_sec"] = (
+                task_count / benchmark.stats.stats.mean
+            )
+
+
+# =============================================================================
+# Expression Benchmarks
+# =============================================================================
+
+
+def _large_templated_args(n: int) -> dict[str, Any]:
+    return {
+        f"field_{i}": {
+            "value": f"${{{{ ACTIONS.a.result.items[{i % 20}].name }}}}",
+            "inline": f"Item ${{{{ ACTIONS.a.result.items[{i % 20}].id }}}} of {n}",
+            "flag": "${{ ACTIONS.a.result.count > 10 && TRIGGER.enabled }}",
+        }
+        for i in range(n)
+    }
+
+
+class TestExpressionBenchmarks:
+    """Benchmarks for template expression parsing and evaluation.
+
+    These run in-process and do not need the development stack.
+    """
+
+    @pytest.mark.parametrize("cache_size", [0, 1024], ids=["uncached", "cached"])
+    def test_parse_large_args(self, benchmark: Any, cache_size: int) -> None:
+        """Parse every expression of a large args dict, with and without the cache."""
+        from allama.expressions.parser.core import ExprParser
+        from allama.parse import traverse_expressions
+
+        exprs = list(traverse_expressions(_large_templated_args(n=500)))
+        parser = ExprParser(cache_size=cache_size)
+
+        def parse_all() -> None:
+            for expr in exprs:
+                parser.parse(expr)
+
+        benchmark.group = "expression-parse"
+        benchmark(parse_all)
+
+    def test_eval_templated_object_large_args(self, benchmark: Any) -> None:
+        """Evaluate a large templated args dict against a small operand."""
+        from allama.expressions.common import ExprContext
+        from allama.expressions.eval import eval_templated_object
+
+        args = _large_templated_args(n=100)
+        operand = {
+            ExprContext.ACTIONS: {
+                "a": {
+                    "result": {
+                        "items": [{"id": i, "name": f"n{i}"} for i in range(20)],
+                        "count": 20,
+                    }
+                }
+            },
+            ExprContext.TRIGGER: {"enabled": True},
+        }
+
+        result = benchmark(eval_templated_object, args, operand=operand)
+
+        assert result["field_3"] == {
+            "value": "n3",
+            "inline": "Item 3 of 100",
+            "flag": True,
+        }
+
+
+# =============================================================================
+# Storage Benchmarks
+# =============================================================================
+
+
+@pytest.fixture
+def remote_blob_storage(monkeypatch: pytest.MonkeyPatch) -> dict[str, bytes]:
+    """In-memory blob storage where each upload/download takes 5ms.
+
+    The delay stands in for an object-store round trip.
+    """
+    from allama.storage import blob, utils
+
+    stored: dict[str, bytes] = {}
+
+    async def ensure_bucket_exists(bucket: str) -> None:
+        pass
+
+    async def upload_file(
+        content: bytes, key: str, bucket: str, content_type: str | None = None
+    ) -> None:
+        await asyncio.sleep(0.005)
+        stored[f"{bucket}/{key}"] = content
+
+    async def download_file(key: str, bucket: str) -> bytes:
+        await asyncio.sleep(0.005)
+        return stored[f"{bucket}/{key}"]
+
+    monkeypatch.setattr(blob, "ensure_bucket_exists", ensure_bucket_exists)
+    monkeypatch.setattr(blob, "upload_file", upload_file)
+    monkeypatch.setattr(blob, "download_file", download_file)
+    # Measure downloads, not the worker blob cache
+    monkeypatch.setattr(utils, "_blob_cache", utils.SizedMemoryCache(max_bytes=0))
+    return stored
+
+
+class TestStorageClientPool:
+    """Store latency with a pooled storage client vs a client per call.
+
+    Prerequisites:
+    - MinIO must be running (via `make dev`)
+    """
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize("pooled", [False, True], ids=["per-call", "pooled"])
+    async def test_store_latency(self, minio_bucket: str, pooled: bool) -> None:
+        """Measure ensure-bucket plus upload latency for small objects."""
+        import uuid
+
+        from allama.storage import blob
+
+        async def store() -> None:
+            if not pooled:
+                # Previous behavior: new session/client and head_bucket per store
+                await blob.close_storage_clients()
+                blob._known_buckets.clear()
+            await blob.ensure_bucket_exists(minio_bucket)
+            await blob.upload_file(
+                b'{"value": 1}',
+                key=f"bench/{uuid.uuid4().hex}.json",
+                bucket=minio_bucket,
+                content_type="application/json",
+            )
+
+        try:
+            times = await run_async_benchmark(store, rounds=200, warmup_rounds=5)
+        finally:
+            await blob.close_storage_clients()
+
+        ordered = sorted(times)
+        p50_ms = ordered[len(ordered) // 2] * 1000
+        p99_ms = ordered[int(len(ordered) * 0.99)] * 1000
+        label = "pooled" if pooled else "per-call"
+        print(f"\nStore latency, {label} client (n={len(times)}):")
+        print(f"  p50: {p50_ms:.2f}ms")
+        print(f"  p99: {p99_ms:.2f}ms")
+
+
+@pytest.fixture
+def memory_blob_storage(monkeypatch: pytest.MonkeyPatch) -> dict[str, bytes]:
+    """In-memory blob storage with fresh blob caches."""
+    from allama import config
+    from allama.storage import blob, utils
+
+    stored: dict[str, bytes] = {}
+
+    async def ensure_bucket_exists(bucket: str) -> None:
+        pass
+
+    async def upload_file(
+        content: bytes, key: str, bucket: str, content_type: str | None = None
+    ) -> None:
+        stored[f"{bucket}/{key}"] = content
+
+    async def download_file(key: str, bucket: str) -> bytes:
+        return stored[f"{bucket}/{key}"]
+
+    monkeypatch.setattr(blob, "ensure_bucket_exists", ensure_bucket_exists)
+    monkeypatch.setattr(blob, "upload_file", upload_file)
+    monkeypatch.setattr(blob, "download_file", download_file)
+    monkeypatch.setattr(utils, "_blob_cache", utils.SizedMemoryCache(2**30))
+    monkeypatch.setattr(utils, "_blob_downloads", {})
+    monkeypatch.setattr(config, "ALLAMA__BLOB_CACHE_DIR", "")
+    return stored
+
+
+class TestObjectStorageRoundTrip:
+    """Store and retrieve latency for results externalized to blob storage.
+
+    Blobs over MAX_CACHEABLE_BLOB_SIZE are downloaded (and verified) on every
+    read, so integrity sampling is what avoids the hash for those.
+    """
+
+    @staticmethod
+    def _result(size_mb: int) -> dict[str, Any]:
+        return {"rows": ["x" * 1000] * (size_mb * 1024)}
+
+    @pytest.mark.parametrize("size_mb", [1, 10, 100])
+    def test_store(
+        self,
+        benchmark: Any,
+        memory_blob_storage: dict[str, bytes],  # noqa: ARG002
+        size_mb: int,
+    ) -> None:
+        """Serialize, hash and upload a large result."""
+        from allama.storage.backends import S3ObjectStorage
+        from allama.storage.object import ExternalObject
+
+        storage = S3ObjectStorage(bucket="b", threshold_bytes=256 * 1024)
+        data = self._result(size_mb)
+
+        benchmark.group = "object-store"
+        with asyncio.Runner() as runner:
+            stored = benchmark(lambda: runner.run(storage.store("k", data)))
+
+        assert isinstance(stored, ExternalObject)
+
+    @pytest.mark.parametrize("mode", ["verified", "unsampled", "hash-every-read"])
+    @pytest.mark.parametrize("size_mb", [1, 10, 100])
+    def test_retrieve(
+        self,
+        benchmark: Any,
+        memory_blob_storage: dict[str, bytes],
+        monkeypatch: pytest.MonkeyPatch,
+        size_mb: int,
+        mode: str,
+    ) -> None:
+        """Retrieve a stored result, compared to hashing on every read."""
+        from allama import config
+        from allama.storage.backends import S3ObjectStorage
+        from allama.storage.object import ExternalObject
+        from allama.storage.utils import compute_sha256, deserialize_object
+
+        storage = S3ObjectStorage(bucket="b", threshold_bytes=256 * 1024)
+        data = self._result(size_mb)
+
+        benchmark.group = f"object-retrieve-{size_mb}mb"
+        with asyncio.Runner() as runner:
+            stored = runner.run(storage.store("k", data))
+            assert isinstance(stored, ExternalObject)
+            if mode == "hash-every-read":
+                # Previous behavior: hash on every retrieval, cached or not
+                content = memory_blob_storage["b/k"]
+                sha256 = stored.ref.sha256
+
+                def legacy_read() -> Any:
+                    assert compute_sha256(content) == sha256
+                    return deserialize_object(content)
+
+                result = benchmark(legacy_read)
+            else:
+                if mode == "unsampled":
+                    monkeypatch.setattr(
+                        config, "ALLAMA__BLOB_INTEGRITY_SAMPLE_RATE", 0.0
+                    )
+                result = benchmark(lambda: runner.run(storage.retrieve(stored)))
+
+        assert result == data
+
+
+class TestCollectionThroughput:
+    """Store/materialize throughput for large chunked collections."""
+
+    N_ITEMS = 200_000
+
+    @pytest.mark.parametrize("compress", [False, True], ids=["json", "zstd"])
+    @pytest.mark.parametrize("concurrency", [1, 8], ids=["sequential", "parallel"])
+    def test_store_and_materialize(
+        self,
+        benchmark: Any,
+        remote_blob_storage: dict[str, bytes],
+        monkeypatch: pytest.MonkeyPatch,
+        compress: bool,
+        concurrency: int,
+    ) -> None:
+        """Round-trip a collection through chunked storage."""
+        from allama import config
+        from allama.storage.collection import (
+            materialize_collection_values,
+            store_collection,
+        )
+
+        monkeypatch.setattr(
+            config, "ALLAMA__COLLECTION_TRANSFER_CONCURRENCY", concurrency
+        )
+        items = [
+            {"id": i, "name": f"item-{i}", "ok": True} for i in range(self.N_ITEMS)
+        ]
+
+        async def roundtrip() -> list[Any]:
+            collection = await store_collection(
+                prefix="wf-123/throughput",
+                items=items,
+                chunk_size=1024,
+                bucket="test-bucket",
+                compress=compress,
+            )
+            return await materialize_collection_values(collection)
+
+        benchmark.group = f"collection-{'zstd' if compress else 'json'}"
+        values = benchmark.pedantic(lambda: asyncio.run(roundtrip()), rounds=1)
+
+        assert values == items
+
+
+# =============================================================================
+# Payload Compression Benchmarks
+# =============================================================================
+
+
+def _action_result(rng: random.Random, n_items: int) -> bytes:
+    """A JSON payload shaped like a typical integration action result."""
+    items = [
+        {
+            "id": f"{rng.getrandbits(64):016x}",
+            "type": rng.choice(["alert", "incident", "event"]),
+            "severity": rng.choice(["low", "medium", "high", "critical"]),
+            "status": rng.choice(["open", "closed", "in_progress"]),
+            "created_at": f"2024-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T12:00:00Z",
+            "source": {"ip": f"10.0.{rng.randint(0, 255)}.{rng.randint(0, 255)}"},
+            "tags": rng.sample(["malware", "phishing", "edr", "cloud", "iam"], 2),
+            "score": rng.random(),
+        }
+        for _ in range(n_items)
+    ]
+    return json.dumps({"result": items, "result_typename": "list"}).encode()
+
+
+class TestPayloadCompression:
+    """Encode/decode latency of the payload codec on action results.
+
+    Compression ratios are recorded in the benchmark's extra info.
+    """
+
+    @pytest.mark.parametrize("codec_name", ["zstd", "zstd+dict", "gzip", "brotli"])
+    def test_roundtrip(self, benchmark: Any, codec_name: str) -> None:
+        """Compress and decompress a batch of action result payloads."""
+        from temporalio.api.common.v1 import Payload
+
+        from allama.dsl.compression import (
+            CompressionPayloadCodec,
+            train_zstd_dictionary,
+        )
+
+        rng = random.Random(0)
+        corpus = [_action_result(rng, rng.randint(5, 200)) for _ in range(300)]
+        train, sample = corpus[:200], corpus[200:]
+        algorithm, _, variant = codec_name.partition("+")
+        codec = CompressionPayloadCodec(
+            threshold_bytes=0,
+            algorithm=algorithm,
+            enabled=True,
+            zstd_dictionary=train_zstd_dictionary(train) if variant else None,
+        )
+        payloads = [
+            Payload(metadata={"encoding": b"json/plain"}, data=data) for data in sample
+        ]
+
+        async def roundtrip() -> tuple[list[Payload], list[Payload]]:
+            encoded = await codec.encode(payloads)
+            return encoded, await codec.decode(encoded)
+
+        benchmark.group = "payload-compression"
+        with asyncio.Runner() as runner:
+            encoded, decoded = benchmark(lambda: runner.run(roundtrip()))
+
+        assert decoded == payloads
+        original = sum(len(p.data) for p in payloads)
+        benchmark.extra_info["ratio"] = original / sum(len(p.data) for p in encoded)
+
+
+# =============================================================================
+# Scheduler Benchmarks
+# =============================================================================
+
+
+def _nested_scatter_scheduler() -> DSLScheduler:
+    """A scheduler for root -> scatter -> scatter -> work."""
+    import uuid
+    from datetime import UTC, datetime
+
+    from allama.auth.types import Role
+    from allama.dsl.common import DSLEntrypoint, DSLInput
+    from allama.dsl.scheduler import DSLScheduler
+    from allama.dsl.schemas import ActionStatement, ExecutionContext, RunContext
+    from allama.identifiers.workflow import WorkflowUUID
+
+    async def executor(_: ActionStatement) -> None:
+        return None
+
+    wf_id = WorkflowUUID.new_uuid4()
+    return DSLScheduler(
+        executor=executor,
+        dsl=DSLInput(
+            title="benchmark",
+            description="benchmark",
+            entrypoint=DSLEntrypoint(ref="root"),
+            actions=[
+                ActionStatement(ref="root", action="core.noop"),
+                ActionStatement(
+                    ref="outer",
+                    action="core.transform.scatter",
+                    depends_on=["root"],
+                    args={"collection": "${{ ACTIONS.root.result }}"},
+                ),
+                ActionStatement(
+                    ref="inner",
+                    action="core.transform.scatter",
+                    depends_on=["outer"],
+                    args={"collection": "${{ ACTIONS.outer.result }}"},
+                ),
+                ActionStatement(
+                    ref="work",
+                    action="core.transform.reshape",
+                    depends_on=["inner"],
+                    args={
+                        "value": {
+                            "root": "${{ ACTIONS.root.result }}",
+                            "outer": "${{ ACTIONS.outer.result }}",
+                            "inner": "${{ ACTIONS.inner.result }}",
+                        }
+                    },
+                ),
+            ],
+        ),
+        context=ExecutionContext(ACTIONS={}, TRIGGER=None),
+        role=Role(
+            type="service",
+            service_id="allama-runner",
+            workspace_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+        ),
+        run_context=RunContext(
+            wf_id=wf_id,
+            wf_exec_id=f"{wf_id.short()}/exec_benchmark",
+            wf_run_id=uuid.uuid4(),
+            environment="benchmark",
+            logical_time=datetime.now(UTC),
+        ),
+    )
+
+
+class TestStreamAwareContext:
+    """Context building for every task in a 1000x10 nested scatter."""
+
+    @pytest.mark.parametrize("mode", ["memoized", "uncached"])
+    def test_build_contexts(self, benchmark: Any, mode: str) -> None:
+        """Resolve the action results visible to each inner stream."""
+        from allama.dsl.schemas import (
+            ROOT_STREAM,
+            ExecutionContext,
+            StreamID,
+            TaskResult,
+        )
+
+        scheduler = _nested_scatter_scheduler()
+        scheduler.set_action_result(ROOT_STREAM, "root", TaskResult.from_result([]))
+
+        def add_stream(parent: StreamID, scatter_ref: str, index: int) -> StreamID:
+            # Open a scatter stream the way `_handle_scatter` does
+            stream_id = StreamID.new(scatter_ref, index, base_stream_id=parent)
+            scheduler.stream_hierarchy[stream_id] = parent
+            scheduler.streams[stream_id] = ExecutionContext(
+                ACTIONS={scatter_ref: TaskResult.from_result(index)}, TRIGGER=None
+            )
+            return stream_id
+
+        inner_streams = []
+        for i in range(1000):
+            outer = add_stream(ROOT_STREAM, "outer", i)
+            inner_streams.extend(add_stream(outer, "inner", j) for j in range(10))
+        work = scheduler.tasks["work"]
+
+        def build_contexts() -> None:
+            for stream_id in inner_streams:
+                context = scheduler.build_stream_aware_context(work, stream_id)
+                assert len(context["ACTIONS"]) == 3
+
+        def resolve_uncached() -> None:
+            # What every lookup cost before: re-extracting expressions and
+            # walking streams
+            for stream_id in inner_streams:
+                for ref in scheduler._extract_action_refs(work):
+                    scheduler._find_result_owner(ref, stream_id)
+
+        benchmark.group = "stream-aware-context"
+        benchmark(build_contexts if mode == "memoized" else resolve_uncached)
+
+
+# =============================================================================
+# Registry Tarball Benchmarks
+# =============================================================================
+
+
+class _ThrottledHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    def copyfile(self, source: Any, outputfile: Any) -> None:
+        # Throttle to roughly object storage throughput (~100MB/s)
+        while chunk := source.read(1024 * 1024):
+            outputfile.write(chunk)
+            time.sleep(0.01)
+
+
+@pytest.fixture
+def venv_tarball_url(tmp_path: Path) -> Iterator[str]:
+    """Serve a ~50MB venv tarball over HTTP, as a presigned URL would."""
+    rng = random.Random(0)
+    # Half incompressible (shared objects), half text-like (sources)
+    files = {f"pkg{i // 100}/mod{i}.so": rng.randbytes(50_000) for i in range(500)} | {
+        f"pkg{i // 100}/mod{i}.py": (
+            f"def f{i}(x):\n    return x + {i}\n" * 1600
+        ).encode()
+        for i in range(500)
+    }
+    serve_dir = tmp_path / "served"
+    serve_dir.mkdir()
+    with tarfile.open(serve_dir / "venv.tar.gz", "w:gz", compresslevel=1) as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+
+    handler = functools.partial(_ThrottledHandler, directory=str(serve_dir))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/venv.tar.gz"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class TestTarballColdStart:
+    """Cold-start extraction of a registry venv tarball into an empty cache."""
+
+    @pytest.mark.parametrize("mode", ["download-then-extract", "streamed"])
+    def test_cold_start(
+        self, benchmark: Any, venv_tarball_url: str, tmp_path: Path, mode: str
+    ) -> None:
+        """Fetch and extract the tarball, as the executor does on a cache miss."""
+        from unittest.mock import AsyncMock, patch
+
+        import httpx
+
+        from allama.executor.action_runner import ActionRunner
+
+        async def download_then_extract() -> Path:
+            # What ensure_tarball_extracted did before streaming
+            target_dir = tmp_path / "legacy"
+            async with httpx.AsyncClient() as client:
+                response = await client.get(venv_tarball_url)
+            tarball = tmp_path / "legacy.tar.gz"
+            tarball.write_bytes(response.content)
+            with tarfile.open(tarball, "r:gz") as tar:
+                tar.extractall(path=target_dir, filter="data")
+            return target_dir
+
+        async def streamed() -> Path:
+            runner = ActionRunner(cache_dir=tmp_path / "cache")
+            with patch.object(
+                runner,
+                "_tarball_uri_to_http_url",
+                new_callable=AsyncMock,
+                return_value=venv_tarball_url,
+            ):
+                return await runner.ensure_tarball_extracted(
+                    "venv", "s3://bucket/venv.tar.gz"
+                )
+
+        extract = download_then_extract if mode == "download-then-extract" else streamed
+        benchmark.group = "tarball-cold-start"
+        target_dir = benchmark.pedantic(lambda: asyncio.run(extract()), rounds=1)
+
+        assert len(list(target_dir.rglob("*.so"))) == 500
+
+
+@pytest.fixture(scope="module")
+def representative_site_packages(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Copy some installed distributions, as a registry venv would contain them."""
+    site_packages = tmp_path_factory.mktemp("venv") / "site-packages"
+    for name in ("botocore", "pydantic", "pydantic_core", "sqlalchemy", "httpx"):
+        dist = metadata.distribution(name)
+        for file in dist.files or []:
+            src = Path(str(dist.locate_file(file)))
+            if file.parts[0] == ".." or not src.is_file():
+                continue
+            dst = site_packages / file
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(src, dst)
+    return site_packages
+
+
+class TestRegistryLayerCompression:
+    """Pack/unpack time of registry venv layers by compression format.
+
+    Compressed sizes and ratios are recorded in the benchmark's extra info.
+    """
+
+    @pytest.mark.parametrize("compression", ["gzip", "zstd"])
+    def test_pack(
+        self,
+        benchmark: Any,
+        representative_site_packages: Path,
+        tmp_path: Path,
+        compression: TarballCompression,
+    ) -> None:
+        """Build every layer of the venv, as a registry sync does."""
+        from allama.registry.sync.tarball import _build_layers
+
+        def pack() -> list[Any]:
+            layers_dir = tmp_path / f"layers-{compression}"
+            shutil.rmtree(layers_dir, ignore_errors=True)
+            return _build_layers(representative_site_packages, layers_dir, compression)
+
+        benchmark.group = "registry-layer-pack"
+        layers = benchmark.pedantic(pack, rounds=3)
+
+        uncompressed = sum(
+            f.stat().st_size
+            for f in representative_site_packages.rglob("*")
+            if f.is_file()
+        )
+        size = sum(layer.size_bytes for layer in layers)
+        benchmark.extra_info["size_bytes"] = size
+        benchmark.extra_info["ratio"] = uncompressed / size
+
+    @pytest.mark.parametrize("compression", ["gzip", "zstd"])
+    def test_unpack(
+        self,
+        benchmark: Any,
+        representative_site_packages: Path,
+        tmp_path: Path,
+        compression: TarballCompression,
+    ) -> None:
+        """Extract every layer into an empty venv, as an executor does."""
+        from allama.registry.sync.tarball import (
+            _build_layers,
+            open_tarball_stream,
+            tarball_suffix,
+        )
+
+        layers_dir = tmp_path / "layers"
+        layers = _build_layers(representative_site_packages, layers_dir, compression)
+        paths = [
+            layers_dir / f"{layer.digest}{tarball_suffix(compression)}"
+            for layer in layers
+        ]
+        target_dir = tmp_path / "extracted"
+
+        def unpack() -> None:
+            shutil.rmtree(target_dir, ignore_errors=True)
+            for path in paths:
+                with path.open("rb") as f, open_tarball_stream(f, compression) as tar:
+                    tar.extractall(target_dir, filter="data")
+
+        benchmark.group = "registry-layer-unpack"
+        benchmark.pedantic(unpack, rounds=3)
+
+        assert any(target_dir.rglob("botocore/__init__.py"))
+        benchmark.extra_info["size_bytes"] = sum(layer.size_bytes for layer in layers)
+
+
+# =============================================================================
+# Safe Lambda Benchmarks
+# =============================================================================
+
+
+class TestSafeLambda:
+    """Per-call overhead of building sandboxed lambdas from source."""
+
+    @pytest.mark.parametrize("mode", ["cached", "uncached"])
+    def test_filter_per_item(self, benchmark: Any, mode: str) -> None:
+        """Filter items one at a time, as a filter inside for_each does."""
+        from allama_registry._internal.safe_lambda import _compile_safe_lambda
+        from allama_registry.core.transform import filter
+
+        python_lambda = (
+            "lambda x: x['severity'] in ('high', 'critical') and x['score'] > 0.5"
+        )
+        items = [
+            {"severity": ["low", "high", "critical"][i % 3], "score": (i % 10) / 10}
+            for i in range(10_000)
+        ]
+
+        def run() -> list[list[Any]]:
+            results = []
+            for item in items:
+                if mode == "uncached":
+                    # What every call cost before: validating and compiling
+                    # the source again
+                    _compile_safe_lambda.cache_clear()
+                results.append(filter([item], python_lambda))
+            return results
+
+        benchmark.group = "safe-lambda-filter"
+        results = benchmark.pedantic(run, rounds=3)
+
+        assert sum(len(result) for result in results) == sum(
+            item["severity"] != "low" and item["score"] > 0.5 for item in items
+        )
+
+    @pytest.mark.parametrize("mode", ["views", "copies"])
+    def test_map_large_records(self, benchmark: Any, mode: str) -> None:
+        """Map a lambda over large records."""
+        import builtins
+        import inspect
+
+        from allama_registry._internal.safe_lambda import build_safe_lambda
+        from allama_registry.core.transform import map
+
+        python_lambda = "lambda x: x.get('field_0')"
+        records = [{f"field_{j}": i * j for j in range(200)} for i in range(20_000)]
+
+        def copies() -> list[Any]:
+            # The previous argument guard, which copied inputs through a counter
+            fn = inspect.unwrap(build_safe_lambda(python_lambda))
+
+            def guarded(x: Any) -> Any:
+                count = 0
+
+                def count_guard(value: Any) -> Any:
+                    nonlocal count
+                    count += 1
+                    if count > 10000:
+                        raise ValueError("Expression exceeded maximum iteration limit")
+                    return value
+
+                x = {k: count_guard(v) for k, v in x.items()}
+                return fn(x)
+
+            return list(builtins.map(guarded, records))
+
+        benchmark.group = "safe-lambda-map"
+        run = copies if mode == "copies" else lambda: map(records, python_lambda)
+        result = benchmark.pedantic(run, rounds=3)
+
+        assert result == [0] * len(records)
+
+
+# =============================================================================
+# Secret Masking Benchmarks
+# =============================================================================
+
+
+def _per_leaf_apply_masks_object(obj: Any, masks: list[str]) -> Any:
+    """The previous masking, which rebuilt the pattern for every string leaf."""
+    from allama.secrets.constants import MASK_VALUE
+
+    match obj:
+        case str():
+            filtered_masks = [mask for mask in masks if len(mask) > 1]
+            if not filtered_masks:
+                return obj
+            pattern = "|".join(map(re.escape, filtered_masks))
+            return re.sub(pattern, MASK_VALUE, obj)
+        case Sequence():
+            items = (_per_leaf_apply_masks_object(item, masks) for item in obj)
+            return type(obj)(items)  # pyright: ignore[reportCallIssue]
+        case Mapping():
+            pairs = (
+                (k, _per_leaf_apply_masks_object(v, masks)) for k, v in obj.items()
+            )
+            return type(obj)(pairs)  # pyright: ignore[reportCallIssue]
+        case _:
+            return obj
+
+
+def _masking_row(i: int, masks: list[str]) -> dict[str, Any]:
+    leaked = masks[i % len(masks)] if i % 1000 == 0 else ""
+    return {
+        "id": i,
+        "name": f"user-{i}",
+        "email": f"user{i}@example.com",
+        "score": i * 1.5,
+        "active": i % 2 == 0,
+        "note": f"lorem ipsum dolor sit amet {leaked}",
+        "tags": ["alpha", "beta", None],
+    }
+
+
+class TestSecretMasking:
+    """Masking secrets out of a large action result."""
+
+    @pytest.mark.parametrize("mode", ["compiled", "per-leaf"])
+    def test_apply_masks_object(self, benchmark: Any, mode: str) -> None:
+        """Mask 50 secrets, a few of them leaked, out of a ~10MB result."""
+        from allama.secrets.common import apply_masks_object
+        from allama.secrets.constants import MASK_VALUE
+
+        masks = [f"sk_live_{i:04d}_{'a' * 24}" for i in range(50)]
+        row_size = len(json.dumps(_masking_row(0, masks)))
+        rows = [_masking_row(i, masks) for i in range(10 * 1024 * 1024 // row_size)]
+
+        apply = (
+            apply_masks_object if mode == "compiled" else _per_leaf_apply_masks_object
+        )
+        benchmark.group = "secret-masking"
+        masked = benchmark.pedantic(apply, args=(rows, masks), rounds=1)
+
+        assert MASK_VALUE in masked[0]["note"]
+        assert masked[1] == rows[1]
@@ -33,11 +33,13 @@ from collections.abc import Awaitable, Callable
 from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
+import orjson
 import pytest
 
 from allama.auth.types import Role
 from allama.dsl.schemas import RunActionInput
 from allama.executor.backends.pool import WorkerPool
+from allama.executor.backends.pool.pool import WorkerConnection
 from allama.executor.schemas import (
     ExecutorResult,
     ExecutorResultFailure,
@@ -433,21 +435,18 @@ class TestCacheBehavior:
         runner = ActionRunner(cache_dir=temp_registry_cache)
         download_count = [0]
 
-        async def mock_download(url: str, path: Path) -> None:
+        async def mock_stream_extract(url: str, target_dir: Path) -> int:
             download_count[0] += 1
             await asyncio.sleep(0.1)  # Simulate network latency
-            path.write_bytes(b"mock tarball")
-
-        async def mock_extract(tarball_path: Path, target_dir: Path) -> None:
             shutil.copytree(
                 mock_modules_dir / "workspace_a",
                 target_dir,
                 dirs_exist_ok=True,
             )
+            return 0
 
         with (
-            patch.object(runner, "_download_file", mock_download),
-            patch.object(runner, "_extract_tarball", mock_extract),
+            patch.object(runner, "_stream_extract_tarball", mock_stream_extract),
             patch.object(
                 runner,
                 "_tarball_uri_to_http_url",
@@ -1387,3 +1386,176 @@ class TestPoolExhaustion:
             1 for w in worker_pool._workers if w.process.returncode is None
         )
         assert alive_workers == 2, f"All workers should be alive: {alive_workers}/2"
+
+
+# =============================================================================
+# Test Class 10: Connection Multiplexing
+# =============================================================================
+
+
+class TestConnectionMultiplexing:
+    """Tests for the long-lived, multiplexed host-to-worker connections.
+
+    Verifies that:
+    - Concurrent tasks on a worker share a single connection
+    - The pool reconnects when a connection is lost
+    - The per-task connection transport still works
+    - Connection-level worker errors fail every in-flight request
+    """
+
+    @pytest.mark.anyio
+    async def test_concurrent_tasks_share_one_connection(
+        self,
+        single_worker_pool: WorkerPool,
+        run_action_input_factory: Callable[..., RunActionInput],
+        resolved_context_factory: Callable[..., ResolvedContext],
+        role_workspace_a: Role,
+    ) -> None:
+        """Verify in-flight tasks are multiplexed over the worker's connection.
+
+        Validates:
+        - All concurrent tasks succeed
+        - The worker keeps the same open connection across batches
+        """
+        pool = single_worker_pool
+        resolved_context = resolved_context_factory(role_workspace_a)
+
+        async def run_batch() -> list[ExecutorResult]:
+            return await asyncio.gather(
+                *[
+                    pool.execute(
+                        input=run_action_input_factory(),
+                        role=role_workspace_a,
+                        resolved_context=resolved_context,
+                        timeout=30.0,
+                    )
+                    for _ in range(pool.max_concurrent_per_worker)
+                ]
+            )
+
+        results = await run_batch()
+        worker = pool._workers[0]
+        connection = worker.connection
+        assert connection is not None, "Worker should hold a connection"
+
+        results += await run_batch()
+        assert all(r.type == "success" for r in results), f"Tasks failed: {results}"
+        assert worker.connection is connection, "Connection should be reused"
+        assert not connection.closed, "Connection should stay open between tasks"
+        assert connection.in_flight == 0, "No requests should be left in flight"
+
+    @pytest.mark.anyio
+    async def test_reconnects_after_connection_closed(
+        self,
+        single_worker_pool: WorkerPool,
+        run_action_input_factory: Callable[..., RunActionInput],
+        resolved_context_factory: Callable[..., ResolvedContext],
+        role_workspace_a: Role,
+    ) -> None:
+        """Verify a lost connection is transparently re-established.
+
+        Validates:
+        - Tasks succeed after the previous connection was closed
+        - A new connection replaces the closed one
+        """
+        pool = single_worker_pool
+        resolved_context = resolved_context_factory(role_workspace_a)
+
+        result = await pool.execute(
+            input=run_action_input_factory(),
+            role=role_workspace_a,
+            resolved_context=resolved_context,
+            timeout=30.0,
+        )
+        assert result.type == "success"
+
+        worker = pool._workers[0]
+        old_connection = worker.connection
+        assert old_connection is not None
+        await old_connection.close()
+
+        result = await pool.execute(
+            input=run_action_input_factory(),
+            role=role_workspace_a,
+            resolved_context=resolved_context,
+            timeout=30.0,
+        )
+        assert result.type == "success", "Task should succeed after reconnecting"
+        assert worker.connection is not old_connection
+        assert worker.connection is not None and not worker.connection.closed
+
+    @pytest.mark.anyio
+    async def test_per_task_connections_still_supported(
+        self,
+        run_action_input_factory: Callable[..., RunActionInput],
+        resolved_context_factory: Callable[..., ResolvedContext],
+        role_workspace_a: Role,
+    ) -> None:
+        """Verify workers still serve one request per connection.
+
+        Validates:
+        - Concurrent tasks succeed without a long-lived connection
+        - No connection is kept on the worker
+        """
+        pool = WorkerPool(
+            size=1, max_concurrent_per_worker=4, multiplex_connections=False
+        )
+        await pool.start()
+        resolved_context = resolved_context_factory(role_workspace_a)
+        try:
+            results = await asyncio.gather(
+                *[
+                    pool.execute(
+                        input=run_action_input_factory(),
+                        role=role_workspace_a,
+                        resolved_context=resolved_context,
+                        timeout=30.0,
+                    )
+                    for _ in range(8)
+                ]
+            )
+            assert all(r.type == "success" for r in results), f"Tasks failed: {results}"
+            assert pool._workers[0].connection is None
+        finally:
+            await pool.shutdown()
+
+    @pytest.mark.anyio
+    async def test_connection_error_fails_pending_requests(
+        self, tmp_path: Path
+    ) -> None:
+        """Verify a worker error without a request_id reaches every waiter.
+
+        Validates:
+        - In-flight requests resolve with the worker's failure instead of
+          waiting for their timeout
+        """
+        failure = {"type": "failure", "error": {"message": "bad frame"}}
+
+        async def handle(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            for _ in range(2):
+                length = int.from_bytes(await reader.readexactly(4), "big")
+                await reader.readexactly(length)
+            body = orjson.dumps(failure)
+            writer.write(len(body).to_bytes(4, "big") + body)
+            await writer.drain()
+            await reader.read()  # Hold the connection open until the host closes
+            writer.close()
+
+        socket_path = tmp_path / "task.sock"
+        server = await asyncio.start_unix_server(handle, path=str(socket_path))
+        connection = await WorkerConnection.open(socket_path, worker_id=0)
+        try:
+            results = await asyncio.wait_for(
+                asyncio.gather(
+                    connection.request({"input": {}}, timeout=30.0),
+                    connection.request({"input": {}}, timeout=30.0),
+                ),
+                timeout=5.0,
+            )
+            assert results == [failure, failure]
+        finally:
+            await connection.close()
+            server.close()
+            await server.wait_closed()
@@ -10,6 +10,7 @@ Objectives
 
 import os
 import re
+import time
 import uuid
 from collections.abc import AsyncGenerator, Callable, Mapping
 from dataclasses import dataclass
@@ -24,6 +25,7 @@ import yaml
 pytestmark = pytest.mark.temporal
 from pydantic import SecretStr, TypeAdapter, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
+from temporalio.api.enums.v1 import EventType
 from temporalio.api.enums.v1.workflow_pb2 import ParentClosePolicy
 from temporalio.client import Client, WorkflowExecutionStatus, WorkflowFailureError
 from temporalio.common import RetryPolicy
@@ -85,7 +87,7 @@ from allama.tables.schemas import TableColumnCreate, TableCreate, TableRowInsert
 from allama.tables.service import TablesService
 from allama.variables.schemas import VariableCreate
 from allama.variables.service import VariablesService
-from allama.workflow.executions.common import unwrap_action_result
+from allama.workflow.executions.common import extract_first, unwrap_action_result
 from allama.workflow.executions.enums import WorkflowEventType
 from allama.workflow.executions.schemas import (
     EventGroup,
@@ -1042,6 +1044,7 @@ def child_dsl():
         pytest.param(LoopStrategy.PARALLEL, {}, id="parallel"),
         pytest.param(LoopStrategy.SEQUENTIAL, {}, id="sequential"),
         pytest.param(LoopStrategy.BATCH, {"batch_size": 2}, id="batch"),
+        pytest.param(LoopStrategy.WINDOW, {"batch_size": 2}, id="window"),
     ],
 )
 @pytest.mark.anyio
@@ -1140,6 +1143,160 @@ async def test_child_workflow_loop(
     await assert_context_equal(result, expected)
 
 
+@pytest.mark.anyio
+async def test_child_workflow_loop_passes_dsl_by_reference(
+    test_role: Role,
+    temporal_client: Client,
+    child_dsl: DSLInput,
+    test_worker_factory: Callable[[Client], Worker],
+    test_executor_worker_factory: Callable[[Client], Worker],
+):
+    """Looped children get the definition version, not a copy of the DSL."""
+    test_name = test_child_workflow_loop_passes_dsl_by_reference.__name__
+    wf_exec_id = generate_test_exec_id(test_name)
+    n_children = 20
+    # Pad the child definition so a per-child copy would dominate history size
+    child_dsl.description = "x" * 50_000
+    child_dsl.actions[0].args["value"]["dispatch_type"] = (
+        "${{ ENV.workflow.dispatch_type }}"
+    )
+    child_workflow = await _create_and_commit_workflow(child_dsl, test_role)
+
+    parent_dsl = DSLInput(
+        title="Parent",
+        description="Run a child workflow in a loop",
+        entrypoint=DSLEntrypoint(ref="run_child", expects={}),
+        actions=[
+            ActionStatement(
+                ref="run_child",
+                action="core.workflow.execute",
+                args={
+                    "workflow_id": child_workflow.id,
+                    "trigger_inputs": {"data": "Test", "index": "${{ var.x }}"},
+                    "loop_strategy": LoopStrategy.PARALLEL.value,
+                },
+                for_each=f"${{{{ for var.x in FN.range(0, {n_children}) }}}}",
+            ),
+        ],
+        returns="${{ ACTIONS.run_child.result }}",
+        triggers=[],
+    )
+    run_args = DSLRunArgs(
+        dsl=parent_dsl,
+        role=test_role,
+        wf_id=WorkflowUUID.new("wf-00000000000000000000000000000002"),
+    )
+    worker = test_worker_factory(temporal_client)
+    executor_worker = test_executor_worker_factory(temporal_client)
+    result = await _run_workflow(wf_exec_id, run_args, worker, executor_worker)
+
+    # Children fetch the pinned definition but are still dispatched by the parent
+    assert await to_data(result) == [
+        {"data": "Test", "index": i, "dispatch_type": "push"} for i in range(n_children)
+    ]
+
+    history = await temporal_client.get_workflow_handle(wf_exec_id).fetch_history()
+    child_starts = [
+        event.start_child_workflow_execution_initiated_event_attributes
+        for event in history.events
+        if event.event_type
+        == EventType.EVENT_TYPE_START_CHILD_WORKFLOW_EXECUTION_INITIATED
+    ]
+    assert len(child_starts) == n_children
+    dsl_size = len(child_dsl.model_dump_json())
+    for attrs in child_starts:
+        child_args = DSLRunArgs(**await extract_first(attrs.input))
+        assert child_args.dsl is None
+        assert child_args.definition_version == 1
+        assert attrs.input.ByteSize() < dsl_size
+    # The DSL is recorded once (in the prepare activity result), not per child
+    history_size = sum(event.ByteSize() for event in history.events)
+    assert history_size < 3 * dsl_size
+
+
+@pytest.mark.slow
+@pytest.mark.anyio
+async def test_child_workflow_loop_window_vs_batch(
+    test_role: Role,
+    temporal_client: Client,
+    test_worker_factory: Callable[[Client], Worker],
+    test_executor_worker_factory: Callable[[Client], Worker],
+):
+    """With skewed child durations, a sliding window beats batch barriers."""
+    slow_delay = 3.0
+    # One slow child per batch of 4: batches wait on each, a window overlaps them
+    children = [{"index": i, "slow": i % 4 == 0} for i in range(16)]
+    skewed_child_dsl = DSLInput(
+        title="Skewed child",
+        description="Child whose duration depends on its input",
+        entrypoint=DSLEntrypoint(expects={}, ref="slow"),
+        actions=[
+            ActionStatement(
+                ref="slow",
+                action="core.transform.reshape",
+                args={"value": "${{ TRIGGER.index }}"},
+                run_if="${{ TRIGGER.slow }}",
+                start_delay=slow_delay,
+            )
+        ],
+        returns="${{ TRIGGER.index }}",
+        triggers=[],
+    )
+    child_workflow = await _create_and_commit_workflow(skewed_child_dsl, test_role)
+
+    elapsed: dict[LoopStrategy, float] = {}
+    for loop_strategy in (LoopStrategy.BATCH, LoopStrategy.WINDOW):
+        parent_dsl = DSLInput(
+            title="Parent",
+            description="Run skewed children in a loop",
+            entrypoint=DSLEntrypoint(ref="run_child", expects={}),
+            actions=[
+                ActionStatement(
+                    ref="run_child",
+                    action="core.workflow.execute",
+                    args={
+                        "workflow_id": child_workflow.id,
+                        "trigger_inputs": {
+                            "index": "${{ var.x.index }}",
+                            "slow": "${{ var.x.slow }}",
+                        },
+                        "loop_strategy": loop_strategy.value,
+                        "batch_size": 4,
+                    },
+                    for_each="${{ for var.x in TRIGGER.children }}",
+                ),
+            ],
+            returns="${{ ACTIONS.run_child.result }}",
+            triggers=[],
+        )
+        run_args = DSLRunArgs(
+            dsl=parent_dsl,
+            role=test_role,
+            wf_id=WorkflowUUID.new("wf-00000000000000000000000000000002"),
+            trigger_inputs=InlineObject(data={"children": children}),
+        )
+        wf_exec_id = generate_test_exec_id(
+            f"{test_child_workflow_loop_window_vs_batch.__name__}_{loop_strategy}"
+        )
+        worker = test_worker_factory(temporal_client)
+        executor_worker = test_executor_worker_factory(temporal_client)
+
+        start = time.perf_counter()
+        result = await _run_workflow(wf_exec_id, run_args, worker, executor_worker)
+        elapsed[loop_strategy] = time.perf_counter() - start
+
+        # Results stay in input order regardless of completion order
+        assert await to_data(result) == [child["index"] for child in children]
+
+    logger.info(
+        "Child workflow loop wall time",
+        batch=elapsed[LoopStrategy.BATCH],
+        window=elapsed[LoopStrategy.WINDOW],
+    )
+    # Batches wait on 4 slow children in turn; the window runs them concurrently
+    assert elapsed[LoopStrategy.WINDOW] < elapsed[LoopStrategy.BATCH] - slow_delay
+
+
 # Test workflow alias
 @pytest.mark.anyio
 async def test_single_child_workflow_alias(
@@ -6,14 +6,22 @@ These tests cover tarball caching, cache key computation, and execution logic.
 from __future__ import annotations
 
 import asyncio
+import functools
+import io
+import os
+import tarfile
 import tempfile
+import threading
+import time
 import uuid
 from datetime import UTC, datetime
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from allama import config
 from allama.auth.types import Role
 from allama.dsl.common import create_default_execution_context
 from allama.dsl.schemas import ActionStatement, RunActionInput, RunContext
@@ -21,6 +29,8 @@ from allama.executor.action_runner import ActionRunner, _parse_s3_uri
 from allama.executor.schemas import ExecutorActionErrorInfo
 from allama.identifiers.workflow import WorkflowUUID
 from allama.registry.lock.types import RegistryLock
+from allama.registry.sync.schemas import TarballVenvLayer, TarballVenvManifest
+from allama.registry.sync.tarball import _write_layer_tarball
 
 
 @pytest.fixture
@@ -172,19 +182,16 @@ class TestActionRunner:
         cache_key = "concurrent-test"
         download_count = 0
 
-        async def mock_download(_url, path):
+        async def mock_stream_extract(_url, target_dir):
             nonlocal download_count
             download_count += 1
             await asyncio.sleep(0.1)  # Simulate download time
-            path.write_bytes(b"fake tarball content")
-
-        async def mock_extract(_tarball_path, target_dir):
             # Create a dummy file to simulate extraction
             (target_dir / "extracted.txt").write_text("extracted")
+            return 9
 
         with (
-            patch.object(runner, "_download_file", mock_download),
-            patch.object(runner, "_extract_tarball", mock_extract),
+            patch.object(runner, "_stream_extract_tarball", mock_stream_extract),
             patch.object(
                 runner,
                 "_tarball_uri_to_http_url",
@@ -205,6 +212,47 @@ class TestActionRunner:
             # Should only download once due to locking
             assert download_count == 1
 
+    @pytest.mark.anyio
+    async def test_concurrent_extractions_use_separate_temp_dirs(self, temp_cache_dir):
+        """Test that overlapping extractions of one entry don't share scratch space.
+
+        An extraction on another event loop isn't joined, so two can overlap.
+        """
+        runner = ActionRunner(cache_dir=temp_cache_dir)
+        temp_dirs: list[Path] = []
+
+        async def mock_stream_extract(_url, target_dir):
+            temp_dirs.append(target_dir)
+            (target_dir / "extracted.txt").write_text("extracted")
+            await asyncio.sleep(0.05)
+            # The other extraction finishing must not remove this one's files
+            assert (target_dir / "extracted.txt").exists()
+            return 9
+
+        target_dir = temp_cache_dir / "tarball-overlap"
+        with (
+            patch.object(runner, "_stream_extract_tarball", mock_stream_extract),
+            patch.object(
+                runner,
+                "_tarball_uri_to_http_url",
+                new_callable=AsyncMock,
+                return_value="http://test",
+            ),
+        ):
+            results = await asyncio.gather(
+                runner._extract_and_cache(
+                    "tarball-overlap", "s3://bucket/test.tar.gz", target_dir
+                ),
+                runner._extract_and_cache(
+                    "tarball-overlap", "s3://bucket/test.tar.gz", target_dir
+                ),
+            )
+
+        assert results == [target_dir, target_dir]
+        assert temp_dirs[0] != temp_dirs[1]
+        assert (target_dir / "extracted.txt").read_text() == "extracted"
+        assert not any(path.exists() for path in temp_dirs)
+
     @pytest.mark.anyio
     async def test_ensure_registry_environment_no_tarball(self, temp_cache_dir):
         """Test that None is returned when no tarball URI provided."""
@@ -381,21 +429,236 @@ class TestActionRunner:
             assert result.type == "ProtocolError"
 
     @pytest.mark.anyio
-    async def test_get_extraction_lock_same_key(self, temp_cache_dir):
-        """Test that same cache key returns same lock."""
+    async def test_cancelled_waiter_does_not_cancel_extraction(self, temp_cache_dir):
+        """Test that a cancelled request leaves the shared extraction running."""
+        runner = ActionRunner(cache_dir=temp_cache_dir)
+        started = asyncio.Event()
+        download_count = 0
+
+        async def mock_stream_extract(_url, target_dir):
+            nonlocal download_count
+            download_count += 1
+            started.set()
+            await asyncio.sleep(0.1)
+            (target_dir / "extracted.txt").write_text("extracted")
+            return 9
+
+        with (
+            patch.object(runner, "_stream_extract_tarball", mock_stream_extract),
+            patch.object(
+                runner,
+                "_tarball_uri_to_http_url",
+                new_callable=AsyncMock,
+                return_value="http://test",
+            ),
+        ):
+            cancelled = asyncio.create_task(
+                runner.ensure_tarball_extracted("key", "s3://bucket/test.tar.gz")
+            )
+            await started.wait()
+            cancelled.cancel()
+
+            result = await runner.ensure_tarball_extracted(
+                "key", "s3://bucket/test.tar.gz"
+            )
+
+        assert (result / "extracted.txt").read_text() == "extracted"
+        assert download_count == 1
+
+
+@pytest.fixture
+def tarball_server(temp_cache_dir: Path):
+    """Serve files from a directory over HTTP, as presigned URLs would."""
+    serve_dir = temp_cache_dir / "served"
+    serve_dir.mkdir()
+    handler = functools.partial(_QuietHandler, directory=str(serve_dir))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield serve_dir, f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+    def copyfile(self, source, outputfile):
+        # Throttle to roughly object storage throughput (~100MB/s)
+        while chunk := source.read(1024 * 1024):
+            outputfile.write(chunk)
+            time.sleep(0.01)
+
+
+def _write_tarball(path: Path, files: dict[str, bytes], compresslevel: int = 9):
+    with tarfile.open(path, "w:gz", compresslevel=compresslevel) as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+
+
+class TestTarballCache:
+    """Tests for streaming extraction and LRU eviction of the tarball cache."""
+
+    @pytest.mark.anyio
+    async def test_stream_extract_tarball(self, temp_cache_dir, tarball_server):
+        """Test that a served tarball is extracted and its size reported."""
+        serve_dir, base_url = tarball_server
+        _write_tarball(
+            serve_dir / "venv.tar.gz",
+            {"pkg/__init__.py": b"VALUE = 1\n", "pkg/data.bin": b"x" * 100_000},
+        )
+        runner = ActionRunner(cache_dir=temp_cache_dir)
+        target_dir = temp_cache_dir / "extract"
+        target_dir.mkdir()
+
+        size = await runner._stream_extract_tarball(
+            f"{base_url}/venv.tar.gz", target_dir
+        )
+
+        assert size == 100_010
+        assert (target_dir / "pkg" / "__init__.py").read_bytes() == b"VALUE = 1\n"
+
+    @pytest.mark.anyio
+    async def test_stream_extract_zstd_tarball(self, temp_cache_dir, tarball_server):
+        """Test that zstd tarballs are detected and extracted."""
+        serve_dir, base_url = tarball_server
+        source_dir = temp_cache_dir / "source"
+        (source_dir / "pkg").mkdir(parents=True)
+        (source_dir / "pkg" / "__init__.py").write_bytes(b"VALUE = 1\n")
+        _write_layer_tarball(
+            source_dir, ["pkg/__init__.py"], serve_dir / "venv.tar.zst", "zstd"
+        )
+        runner = ActionRunner(cache_dir=temp_cache_dir)
+        target_dir = temp_cache_dir / "extract"
+        target_dir.mkdir()
+
+        size = await runner._stream_extract_tarball(
+            f"{base_url}/venv.tar.zst", target_dir
+        )
+
+        assert size == 10
+        assert (target_dir / "pkg" / "__init__.py").read_bytes() == b"VALUE = 1\n"
+
+    @pytest.mark.anyio
+    async def test_stream_extract_rejects_path_traversal(
+        self, temp_cache_dir, tarball_server
+    ):
+        """Test that the data filter still applies to streamed extraction."""
+        serve_dir, base_url = tarball_server
+        _write_tarball(serve_dir / "evil.tar.gz", {"../escape.txt": b"owned"})
+        runner = ActionRunner(cache_dir=temp_cache_dir)
+        target_dir = temp_cache_dir / "extract"
+        target_dir.mkdir()
+
+        with pytest.raises(tarfile.FilterError):
+            await runner._stream_extract_tarball(f"{base_url}/evil.tar.gz", target_dir)
+        assert not (temp_cache_dir / "escape.txt").exists()
+
+    @pytest.mark.anyio
+    async def test_assembles_layered_venv(self, temp_cache_dir, tarball_server):
+        """Test that layers are cached by digest and shared across versions."""
+        serve_dir, base_url = tarball_server
+        (serve_dir / "layers").mkdir()
+        layer_files = {
+            "base": {"pkg/__init__.py": b"VALUE = 1\n", "pkg/util.py": b"old\n"},
+            "udfs_v1": {"pkg/util.py": b"v1\n"},
+            "udfs_v2": {"pkg/util.py": b"v2\n"},
+        }
+        for name, files in layer_files.items():
+            _write_tarball(serve_dir / "layers" / f"{name}.tar.gz", files)
+
+        def write_manifest(version: str, udfs: str) -> None:
+            manifest = TarballVenvManifest(
+                layers=[
+                    TarballVenvLayer(
+                        name=name,
+                        digest=name,
+                        size_bytes=0,
+                        key=f"layers/{name}.tar.gz",
+                    )
+                    for name in ("base", udfs)
+                ]
+            )
+            (serve_dir / f"{version}.json").write_text(manifest.model_dump_json())
+
+        write_manifest("v1", "udfs_v1")
+        write_manifest("v2", "udfs_v2")
+        runner = ActionRunner(cache_dir=temp_cache_dir)
+        fetched: list[str] = []
+
+        async def to_http_url(uri: str) -> str:
+            _, key = _parse_s3_uri(uri)
+            fetched.append(key)
+            return f"{base_url}/{key}"
+
+        with patch.object(runner, "_tarball_uri_to_http_url", to_http_url):
+            v1 = await runner.ensure_tarball_extracted("v1", "s3://bucket/v1.json")
+            v2 = await runner.ensure_tarball_extracted("v2", "s3://bucket/v2.json")
+
+        # Later layers win where files overlap
+        assert (v1 / "pkg" / "util.py").read_bytes() == b"v1\n"
+        assert (v2 / "pkg" / "util.py").read_bytes() == b"v2\n"
+        assert (v2 / "pkg" / "__init__.py").read_bytes() == b"VALUE = 1\n"
+        # The base layer is only downloaded once
+        assert fetched.count("layers/base.tar.gz") == 1
+        assert sorted(fetched) == sorted(
+            [
+                "v1.json",
+                "v2.json",
+                "layers/base.tar.gz",
+                "layers/udfs_v1.tar.gz",
+                "layers/udfs_v2.tar.gz",
+            ]
+        )
+
+    @pytest.mark.anyio
+    async def test_evicts_least_recently_used(self, temp_cache_dir, monkeypatch):
+        """Test that eviction removes the oldest unused entries past the bound."""
+        monkeypatch.setattr(config, "ALLAMA__EXECUTOR_REGISTRY_CACHE_MAX_SIZE_MB", 1)
+        monkeypatch.setattr(config, "ALLAMA__EXECUTOR_CLIENT_TIMEOUT", 60)
+        runner = ActionRunner(cache_dir=temp_cache_dir)
+        now = time.time()
+        for i, key in enumerate(["oldest", "older", "pinned", "recent"]):
+            entry = temp_cache_dir / f"tarball-{key}"
+            entry.mkdir()
+            (entry / "data.bin").write_bytes(b"x" * 400_000)
+            # "recent" was used too recently to rule out another process using it
+            mtime = now if key == "recent" else now - 3600 + i
+            os.utime(entry, (mtime, mtime))
+
+        with runner._pinned(["pinned"]):
+            await runner._evict_lru()
+
+        remaining = sorted(p.name for p in temp_cache_dir.iterdir())
+        assert remaining == ["tarball-pinned", "tarball-recent"]
+
+    @pytest.mark.anyio
+    async def test_cache_hit_refreshes_recency(self, temp_cache_dir):
+        """Test that using a cached entry marks it as recently used."""
         runner = ActionRunner(cache_dir=temp_cache_dir)
+        entry = temp_cache_dir / "tarball-key"
+        entry.mkdir()
+        os.utime(entry, (0, 0))
 
-        lock1 = await runner._get_extraction_lock("key1")
-        lock2 = await runner._get_extraction_lock("key1")
+        await runner.ensure_tarball_extracted("key", "s3://bucket/test.tar.gz")
 
-        assert lock1 is lock2
+        assert entry.stat().st_mtime > time.time() - 60
 
     @pytest.mark.anyio
-    async def test_get_extraction_lock_different_keys(self, temp_cache_dir):
-        """Test that different cache keys return different locks."""
+    async def test_eviction_disabled(self, temp_cache_dir, monkeypatch):
+        """Test that a zero size bound keeps every entry."""
+        monkeypatch.setattr(config, "ALLAMA__EXECUTOR_REGISTRY_CACHE_MAX_SIZE_MB", 0)
         runner = ActionRunner(cache_dir=temp_cache_dir)
+        entry = temp_cache_dir / "tarball-key"
+        entry.mkdir()
+        (entry / "data.bin").write_bytes(b"x" * 10)
+        os.utime(entry, (0, 0))
 
-        lock1 = await runner._get_extraction_lock("key1")
-        lock2 = await runner._get_extraction_lock("key2")
+        await runner._evict_lru()
 
-        assert lock1 is not lock2
+        assert entry.exists()
@@ -5,7 +5,12 @@ from unittest.mock import patch
 
 import pytest
 
-from allama.concurrency import GatheringTaskGroup, apartial, cooperative
+from allama.concurrency import (
+    GatheringTaskGroup,
+    apartial,
+    cooperative,
+    single_flight,
+)
 
 
 @pytest.mark.anyio
@@ -498,3 +503,90 @@ async def test_cooperative_exception_during_sleep():
     assert len(result) >= 1
     assert result[0] == 1
     assert len(result) <= 2  # At most 2 items before exception
+
+
+@pytest.mark.anyio
+async def test_single_flight_shares_one_task():
+    in_flight: dict[str, asyncio.Task[int]] = {}
+    results: list[int] = []
+    calls = 0
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    values = await asyncio.gather(
+        *(
+            single_flight(in_flight, "key", load, on_result=results.append)
+            for _ in range(5)
+        )
+    )
+
+    assert values == [42] * 5
+    assert calls == 1
+    assert results == [42]
+    assert in_flight == {}
+
+
+@pytest.mark.anyio
+async def test_single_flight_cancelled_waiter_does_not_cancel_task():
+    in_flight: dict[str, asyncio.Task[str]] = {}
+    release = asyncio.Event()
+
+    async def load() -> str:
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(single_flight(in_flight, "key", load))
+    second = asyncio.create_task(single_flight(in_flight, "key", load))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.anyio
+async def test_single_flight_failure_is_not_cached():
+    in_flight: dict[str, asyncio.Task[int]] = {}
+    results: list[int] = []
+    attempts = 0
+
+    async def load() -> int:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise ValueError("boom")
+        return attempts
+
+    with pytest.raises(ValueError, match="boom"):
+        await single_flight(in_flight, "key", load, on_result=results.append)
+    assert in_flight == {}
+
+    assert await single_flight(in_flight, "key", load, on_result=results.append) == 2
+    assert results == [2]
+
+
+def test_single_flight_replaces_task_from_another_loop():
+    in_flight: dict[str, asyncio.Task[int]] = {}
+    calls = 0
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async def orphan() -> None:
+        # Leave a pending task behind on a loop that is then closed
+        in_flight["key"] = asyncio.get_running_loop().create_task(
+            asyncio.sleep(1, result=0)
+        )
+
+    asyncio.run(orphan())
+
+    assert asyncio.run(single_flight(in_flight, "key", load)) == 1
+    assert in_flight == {}
@@ -0,0 +1,165 @@
+"""Tests for the Temporal payload compression codec."""
+
+import asyncio
+import json
+import random
+
+import pytest
+from cramjam import zstd as cramjam_zstd  # pyright: ignore[reportAttributeAccessIssue]
+from temporalio.api.common.v1 import Payload
+
+from allama.dsl.compression import (
+    DICT_ID_METADATA_KEY,
+    CompressionPayloadCodec,
+    train_zstd_dictionary,
+)
+
+
+def _action_result(rng: random.Random, n_items: int) -> bytes:
+    """A JSON payload shaped like a typical integration action result."""
+    items = [
+        {
+            "id": f"{rng.getrandbits(64):016x}",
+            "type": rng.choice(["alert", "incident", "event"]),
+            "severity": rng.choice(["low", "medium", "high", "critical"]),
+            "status": rng.choice(["open", "closed", "in_progress"]),
+            "created_at": f"2024-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T12:00:00Z",
+            "source": {"ip": f"10.0.{rng.randint(0, 255)}.{rng.randint(0, 255)}"},
+            "tags": rng.sample(["malware", "phishing", "edr", "cloud", "iam"], 2),
+            "score": rng.random(),
+        }
+        for _ in range(n_items)
+    ]
+    return json.dumps({"result": items, "result_typename": "list"}).encode()
+
+
+def _payload(data: bytes) -> Payload:
+    return Payload(metadata={"encoding": b"json/plain"}, data=data)
+
+
+@pytest.fixture
+def corpus() -> list[bytes]:
+    rng = random.Random(0)
+    return [_action_result(rng, rng.randint(5, 200)) for _ in range(300)]
+
+
+class TestCompressionPayloadCodec:
+    @pytest.mark.anyio
+    @pytest.mark.parametrize("algorithm", ["zstd", "gzip", "brotli"])
+    async def test_roundtrip(self, algorithm: str, corpus: list[bytes]):
+        codec = CompressionPayloadCodec(
+            threshold_bytes=0, algorithm=algorithm, enabled=True
+        )
+        payload = _payload(corpus[0])
+
+        [encoded] = await codec.encode([payload])
+        assert encoded.metadata["encoding"] == f"binary/{algorithm}".encode()
+        assert DICT_ID_METADATA_KEY not in encoded.metadata
+
+        [decoded] = await codec.decode([encoded])
+        assert decoded == payload
+
+    @pytest.mark.anyio
+    async def test_decodes_legacy_payload(self, corpus: list[bytes]):
+        """Payloads written before dictionary support still decode."""
+        data = corpus[0]
+        legacy = Payload(
+            metadata={
+                "encoding": b"binary/zstd",
+                "original_encoding": b"json/plain",
+                "original_size": str(len(data)).encode(),
+            },
+            data=bytes(cramjam_zstd.compress(data, 11)),
+        )
+        codec = CompressionPayloadCodec(enabled=False, offload_threshold_bytes=0)
+
+        [decoded] = await codec.decode([legacy])
+        assert decoded == _payload(data)
+
+    @pytest.mark.anyio
+    async def test_offloads_large_payloads(
+        self, monkeypatch: pytest.MonkeyPatch, corpus: list[bytes]
+    ):
+        offloaded: list[str] = []
+        to_thread = asyncio.to_thread
+
+        async def record_to_thread(func, /, *args, **kwargs):
+            offloaded.append(func.__name__)
+            return await to_thread(func, *args, **kwargs)
+
+        monkeypatch.setattr(asyncio, "to_thread", record_to_thread)
+        small = corpus[0]
+        large = small * 100
+        codec = CompressionPayloadCodec(
+            threshold_bytes=0,
+            algorithm="zstd",
+            enabled=True,
+            offload_threshold_bytes=len(small),
+        )
+
+        encoded = await codec.encode([_payload(small), _payload(large)])
+        decoded = await codec.decode(encoded)
+
+        assert decoded == [_payload(small), _payload(large)]
+        # Both payloads compress to below the cutoff, so decoding stays inline
+        assert offloaded == ["_compress"]
+
+    @pytest.mark.anyio
+    async def test_dictionary_roundtrip(self, corpus: list[bytes]):
+        dictionary = train_zstd_dictionary(corpus[1:], dict_size=16 * 1024)
+        codec = CompressionPayloadCodec(
+            threshold_bytes=0,
+            algorithm="zstd",
+            enabled=True,
+            zstd_dictionary=dictionary,
+        )
+        payload = _payload(corpus[0])
+
+        [encoded] = await codec.encode([payload])
+        assert encoded.metadata[DICT_ID_METADATA_KEY] == codec.zstd_dict_id
+
+        [decoded] = await codec.decode([encoded])
+        assert decoded == payload
+
+    @pytest.mark.anyio
+    async def test_dictionary_codec_decodes_plain_zstd(self, corpus: list[bytes]):
+        plain = CompressionPayloadCodec(threshold_bytes=0, enabled=True)
+        with_dict = CompressionPayloadCodec(
+            threshold_bytes=0,
+            enabled=True,
+            zstd_dictionary=train_zstd_dictionary(corpus[1:], dict_size=16 * 1024),
+        )
+        payload = _payload(corpus[0])
+
+        [decoded] = await with_dict.decode(await plain.encode([payload]))
+        assert decoded == payload
+
+    @pytest.mark.anyio
+    async def test_missing_dictionary_leaves_payload_compressed(
+        self, corpus: list[bytes]
+    ):
+        with_dict = CompressionPayloadCodec(
+            threshold_bytes=0,
+            enabled=True,
+            zstd_dictionary=train_zstd_dictionary(corpus[1:], dict_size=16 * 1024),
+        )
+        plain = CompressionPayloadCodec(threshold_bytes=0, enabled=True)
+
+        [encoded] = await with_dict.encode([_payload(corpus[0])])
+        [decoded] = await plain.decode([encoded])
+        assert decoded == encoded
+
+    @pytest.mark.anyio
+    async def test_dictionary_improves_ratio(self, corpus: list[bytes]):
+        train, sample = corpus[:200], corpus[200:]
+        plain = CompressionPayloadCodec(threshold_bytes=0, enabled=True)
+        with_dict = CompressionPayloadCodec(
+            threshold_bytes=0,
+            enabled=True,
+            zstd_dictionary=train_zstd_dictionary(train),
+        )
+        payloads = [_payload(data) for data in sample]
+
+        plain_size = sum(len(p.data) for p in await plain.encode(payloads))
+        dict_size = sum(len(p.data) for p in await with_dict.encode(payloads))
+        assert dict_size < plain_size
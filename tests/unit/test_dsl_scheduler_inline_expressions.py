@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+from temporalio import workflow
+from temporalio.exceptions import ApplicationError
+
+from allama.auth.types import Role
+from allama.dsl.action import EvaluatedExpression
+from allama.dsl.common import DSLEntrypoint, DSLInput
+from allama.dsl.scheduler import DSLScheduler
+from allama.dsl.schemas import (
+    ROOT_STREAM,
+    ActionStatement,
+    ExecutionContext,
+    RunContext,
+    StreamID,
+    TaskResult,
+)
+from allama.identifiers.workflow import WorkflowUUID
+from allama.storage.object import ExternalObject, InlineObject, ObjectRef
+
+
+def _external(key: str) -> ExternalObject:
+    return ExternalObject(
+        ref=ObjectRef(bucket="test", key=key, size_bytes=100, sha256="x")
+    )
+
+
+async def _noop_executor(_: ActionStatement) -> None:
+    return None
+
+
+def _scheduler(
+    actions: list[ActionStatement] | None = None,
+    executor: Callable[[ActionStatement], Awaitable[Any]] = _noop_executor,
+) -> DSLScheduler:
+    actions = actions or [ActionStatement(ref="a", action="core.noop")]
+    wf_id = WorkflowUUID.new_uuid4()
+    return DSLScheduler(
+        executor=executor,
+        dsl=DSLInput(
+            title="test",
+            description="test",
+            entrypoint=DSLEntrypoint(ref=actions[0].ref),
+            actions=actions,
+        ),
+        context=ExecutionContext(ACTIONS={}, TRIGGER=None),
+        role=Role(
+            type="service",
+            service_id="allama-runner",
+            workspace_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+        ),
+        run_context=RunContext(
+            wf_id=wf_id,
+            wf_exec_id=f"{wf_id.short()}/exec_test",
+            wf_run_id=uuid.uuid4(),
+            environment="test",
+            logical_time=datetime.now(UTC),
+        ),
+    )
+
+
+@pytest.fixture
+def activity_calls(monkeypatch: pytest.MonkeyPatch) -> list[tuple[Any, ...]]:
+    """Stub out the Temporal APIs and record evaluation activities."""
+    calls: list[tuple[Any, ...]] = []
+
+    async def execute_activity(_activity: Any, *, args: tuple[Any, ...], **_: Any):
+        calls.append(args)
+        return "from-activity"
+
+    monkeypatch.setattr(workflow, "patched", lambda _patch_id: True)
+    monkeypatch.setattr(workflow, "execute_activity", execute_activity)
+    return calls
+
+
+@pytest.mark.anyio
+async def test_resolve_expression_inline_results_skip_activity(
+    activity_calls: list[tuple[Any, ...]],
+) -> None:
+    scheduler = _scheduler()
+    context = ExecutionContext(
+        ACTIONS={
+            "a": TaskResult.from_result({"ok": True, "count": 3}),
+            # Externalized but not referenced
+            "b": TaskResult(result=_external("b.json"), result_typename="dict"),
+        },
+        TRIGGER=InlineObject(data={"enabled": True}),
+    )
+
+    assert await scheduler.resolve_expression(
+        "${{ ACTIONS.a.result.ok == True && TRIGGER.enabled }}", context
+    )
+    assert (
+        await scheduler.resolve_expression("${{ ACTIONS.a.result.count > 5 }}", context)
+        is False
+    )
+    assert activity_calls == []
+    assert scheduler.expression_activities_avoided == 2
+
+
+@pytest.mark.anyio
+async def test_resolve_expression_matches_activity_serialization(
+    activity_calls: list[tuple[Any, ...]],
+) -> None:
+    scheduler = _scheduler()
+    started = datetime(2024, 1, 1, tzinfo=UTC)
+    context = ExecutionContext(
+        ACTIONS={},
+        TRIGGER=None,
+        ENV={"workflow": {"start_time": started}},
+    )
+
+    # The activity sees ENV after JSON serialization, so datetimes are strings
+    result = await scheduler.resolve_expression(
+        "${{ ENV.workflow.start_time }}", context
+    )
+    assert result == started.isoformat()
+    assert activity_calls == []
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "expression",
+    [
+        pytest.param("${{ ACTIONS.b.result.ok }}", id="external-action"),
+        pytest.param("${{ TRIGGER.enabled }}", id="external-trigger"),
+        pytest.param("${{ ACTIONS.a.result.ok && FN.now() }}", id="now"),
+        pytest.param("${{ FN.uuid4() }}", id="uuid4"),
+        pytest.param("${{ ACTIONS.a.result.ok == }}", id="unparseable"),
+    ],
+)
+async def test_resolve_expression_falls_back_to_activity(
+    activity_calls: list[tuple[Any, ...]], expression: str
+) -> None:
+    scheduler = _scheduler()
+    context = ExecutionContext(
+        ACTIONS={
+            "a": TaskResult.from_result({"ok": True}),
+            "b": TaskResult(result=_external("b.json"), result_typename="dict"),
+        },
+        TRIGGER=_external("trigger.json"),
+    )
+
+    assert await scheduler.resolve_expression(expression, context) == "from-activity"
+    assert activity_calls == [(expression, context)]
+    assert scheduler.expression_activities_avoided == 0
+
+
+@pytest.mark.anyio
+async def test_resolve_expression_replays_without_patch(
+    activity_calls: list[tuple[Any, ...]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(workflow, "patched", lambda _patch_id: False)
+    scheduler = _scheduler()
+    context = ExecutionContext(
+        ACTIONS={"a": TaskResult.from_result({"ok": True})}, TRIGGER=None
+    )
+
+    assert (
+        await scheduler.resolve_expression("${{ ACTIONS.a.result.ok }}", context)
+        == "from-activity"
+    )
+    assert scheduler.expression_activities_avoided == 0
+
+
+@pytest.mark.anyio
+async def test_resolve_expression_inline_error_is_application_error(
+    activity_calls: list[tuple[Any, ...]],
+) -> None:
+    scheduler = _scheduler()
+    context = ExecutionContext(
+        ACTIONS={"a": TaskResult.from_result({"ok": True})}, TRIGGER=None
+    )
+
+    with pytest.raises(ApplicationError) as exc_info:
+        await scheduler.resolve_expression("${{ ACTIONS.a.result.ok + 'x' }}", context)
+    assert exc_info.value.non_retryable
+    assert activity_calls == []
+
+
+@pytest.fixture
+def batch_calls(monkeypatch: pytest.MonkeyPatch) -> list[Any]:
+    """Stub out the Temporal APIs and evaluate batches against their operands."""
+    calls: list[Any] = []
+
+    async def execute_activity(_activity: Any, *, arg: Any, **_: Any):
+        calls.append(arg)
+        results = []
+        for expression, idx in arg.expressions:
+            if "bad" in expression:
+                results.append(
+                    EvaluatedExpression(error="boom", error_type="ValueError")
+                )
+            else:
+                results.append(
+                    EvaluatedExpression(result=sorted(arg.operands[idx]["ACTIONS"]))
+                )
+        return results
+
+    monkeypatch.setattr(workflow, "patched", lambda _patch_id: True)
+    monkeypatch.setattr(workflow, "execute_activity", execute_activity)
+    return calls
+
+
+def _external_context(*refs: str) -> ExecutionContext:
+    return ExecutionContext(
+        ACTIONS={
+            ref: TaskResult(result=_external(f"{ref}.json"), result_typename="dict")
+            for ref in refs
+        },
+        TRIGGER=None,
+    )
+
+
+@pytest.mark.anyio
+async def test_resolve_expression_batches_per_tick(batch_calls: list[Any]) -> None:
+    scheduler = _scheduler()
+    other = StreamID.new("scatter", 0)
+
+    results = await asyncio.gather(
+        scheduler.resolve_expression(
+            "${{ ACTIONS.a.result.ok }}", _external_context("a"), stream_id=ROOT_STREAM
+        ),
+        scheduler.resolve_expression(
+            "${{ ACTIONS.b.result.ok }}", _external_context("b"), stream_id=ROOT_STREAM
+        ),
+        scheduler.resolve_expression(
+            "${{ ACTIONS.c.result.ok }}", _external_context("c"), stream_id=other
+        ),
+    )
+
+    # One activity, with one operand per stream holding every referenced result
+    [batch] = batch_calls
+    assert batch.expressions == [
+        ("${{ ACTIONS.a.result.ok }}", 0),
+        ("${{ ACTIONS.b.result.ok }}", 0),
+        ("${{ ACTIONS.c.result.ok }}", 1),
+    ]
+    assert results == [["a", "b"], ["a", "b"], ["c"]]
+    assert scheduler.expression_activities_batched == 2
+
+
+@pytest.mark.anyio
+async def test_resolve_expression_batch_errors_are_per_expression(
+    batch_calls: list[Any],
+) -> None:
+    scheduler = _scheduler()
+
+    good, bad = await asyncio.gather(
+        scheduler.resolve_expression(
+            "${{ ACTIONS.a.result.ok }}", _external_context("a"), stream_id=ROOT_STREAM
+        ),
+        scheduler.resolve_expression(
+            "${{ ACTIONS.a.result.bad }}", _external_context("a"), stream_id=ROOT_STREAM
+        ),
+        return_exceptions=True,
+    )
+
+    assert good == ["a"]
+    assert isinstance(bad, ApplicationError)
+    assert bad.type == "ValueError" and bad.non_retryable
+    assert len(batch_calls) == 1
+
+
+@pytest.mark.anyio
+async def test_resolve_expression_single_pending_uses_single_activity(
+    activity_calls: list[tuple[Any, ...]],
+) -> None:
+    scheduler = _scheduler()
+    context = _external_context("a")
+
+    assert (
+        await scheduler.resolve_expression(
+            "${{ ACTIONS.a.result.ok }}", context, stream_id=ROOT_STREAM
+        )
+        == "from-activity"
+    )
+    assert activity_calls == [("${{ ACTIONS.a.result.ok }}", context)]
+    assert scheduler.expression_activities_batched == 0
+
+
+@pytest.mark.anyio
+async def test_run_if_replays_unbatched_history_in_order(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Before batching, a run_if evaluation was issued before its siblings' actions.
+
+    Histories recorded then replay only if commands come out in that order.
+    """
+    commands: list[tuple[str, str]] = []
+
+    async def executor(stmt: ActionStatement) -> None:
+        commands.append(("execute", stmt.ref))
+
+    async def execute_activity(_activity: Any, *, args: tuple[Any, ...], **_: Any):
+        commands.append(("evaluate", args[0]))
+        # The result arrives in a later workflow task
+        await asyncio.sleep(0)
+        return True
+
+    monkeypatch.setattr(workflow, "patched", lambda _patch_id: False)
+    monkeypatch.setattr(workflow, "execute_activity", execute_activity)
+    scheduler = _scheduler(
+        [
+            ActionStatement(ref="root", action="core.noop"),
+            ActionStatement(
+                ref="gated",
+                action="core.noop",
+                depends_on=["root"],
+                run_if="${{ FN.uuid4() }}",
+            ),
+            ActionStatement(ref="sibling", action="core.noop", depends_on=["root"]),
+        ],
+        executor=executor,
+    )
+
+    assert await scheduler.start() is None
+    assert commands == [
+        ("execute", "root"),
+        ("evaluate", "${{ FN.uuid4() }}"),
+        ("execute", "sibling"),
+        ("execute", "gated"),
+    ]
+
+
+@pytest.mark.anyio
+async def test_resolve_expression_batch_failure_raises_per_waiter(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def execute_activity(_activity: Any, **_: Any):
+        raise ApplicationError("batch failed", type="RuntimeError")
+
+    monkeypatch.setattr(workflow, "patched", lambda _patch_id: True)
+    monkeypatch.setattr(workflow, "execute_activity", execute_activity)
+    scheduler = _scheduler()
+
+    errors = await asyncio.gather(
+        scheduler.resolve_expression(
+            "${{ ACTIONS.a.result.ok }}", _external_context("a"), stream_id=ROOT_STREAM
+        ),
+        scheduler.resolve_expression(
+            "${{ ACTIONS.b.result.ok }}", _external_context("b"), stream_id=ROOT_STREAM
+        ),
+        return_exceptions=True,
+    )
+
+    first, second = errors
+    assert first is not second
+    for error in errors:
+        assert isinstance(error, ApplicationError)
+        assert error.message == "batch failed"
+        assert error.type == "RuntimeError"
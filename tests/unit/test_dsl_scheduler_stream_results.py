@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime
+
+from allama.auth.types import Role
+from allama.dsl.common import DSLEntrypoint, DSLInput
+from allama.dsl.scheduler import DSLScheduler
+from allama.dsl.schemas import (
+    ROOT_STREAM,
+    ActionStatement,
+    ExecutionContext,
+    RunContext,
+    StreamID,
+    TaskResult,
+)
+from allama.identifiers.workflow import WorkflowUUID
+
+ACTIONS = [
+    ActionStatement(ref="root", action="core.noop"),
+    ActionStatement(
+        ref="outer",
+        action="core.transform.scatter",
+        depends_on=["root"],
+        args={"collection": "${{ ACTIONS.root.result }}"},
+    ),
+    ActionStatement(
+        ref="inner",
+        action="core.transform.scatter",
+        depends_on=["outer"],
+        args={"collection": "${{ ACTIONS.outer.result }}"},
+    ),
+    ActionStatement(
+        ref="work",
+        action="core.transform.reshape",
+        depends_on=["inner"],
+        args={
+            "value": {
+                "root": "${{ ACTIONS.root.result }}",
+                "outer": "${{ ACTIONS.outer.result }}",
+                "inner": "${{ ACTIONS.inner.result }}",
+            }
+        },
+    ),
+]
+
+
+def _scheduler() -> DSLScheduler:
+    async def executor(_: ActionStatement) -> None:
+        return None
+
+    wf_id = WorkflowUUID.new_uuid4()
+    return DSLScheduler(
+        executor=executor,
+        dsl=DSLInput(
+            title="test",
+            description="test",
+            entrypoint=DSLEntrypoint(ref="root"),
+            actions=ACTIONS,
+        ),
+        context=ExecutionContext(ACTIONS={}, TRIGGER=None),
+        role=Role(
+            type="service",
+            service_id="allama-runner",
+            workspace_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+        ),
+        run_context=RunContext(
+            wf_id=wf_id,
+            wf_exec_id=f"{wf_id.short()}/exec_test",
+            wf_run_id=uuid.uuid4(),
+            environment="test",
+            logical_time=datetime.now(UTC),
+        ),
+    )
+
+
+def _add_stream(
+    scheduler: DSLScheduler, parent: StreamID, scatter_ref: str, index: int
+) -> StreamID:
+    """Open a scatter stream the way `_handle_scatter` does."""
+    stream_id = StreamID.new(scatter_ref, index, base_stream_id=parent)
+    scheduler.stream_hierarchy[stream_id] = parent
+    scheduler.streams[stream_id] = ExecutionContext(
+        ACTIONS={scatter_ref: TaskResult.from_result(index)}, TRIGGER=None
+    )
+    return stream_id
+
+
+def test_task_action_refs_are_precomputed() -> None:
+    scheduler = _scheduler()
+
+    assert scheduler.task_action_refs == {
+        "root": (),
+        "outer": ("root",),
+        "inner": ("outer",),
+        "work": ("inner", "outer", "root"),
+    }
+
+
+def test_stream_aware_result_resolves_through_hierarchy() -> None:
+    scheduler = _scheduler()
+    scheduler.set_action_result(ROOT_STREAM, "root", TaskResult.from_result([1, 2]))
+    outer = _add_stream(scheduler, ROOT_STREAM, "outer", 1)
+    inner = _add_stream(scheduler, outer, "inner", 0)
+
+    context = scheduler.build_stream_aware_context(scheduler.tasks["work"], inner)
+
+    assert {ref: result.get_data() for ref, result in context["ACTIONS"].items()} == {
+        "root": [1, 2],
+        "outer": 1,
+        "inner": 0,
+    }
+
+
+def test_stream_aware_result_cache_tracks_new_results() -> None:
+    scheduler = _scheduler()
+    outer = _add_stream(scheduler, ROOT_STREAM, "outer", 0)
+    inner = _add_stream(scheduler, outer, "inner", 0)
+
+    # Not found anywhere yet
+    assert scheduler.get_stream_aware_action_result("work", inner) is None
+
+    scheduler.set_action_result(ROOT_STREAM, "work", TaskResult.from_result("root"))
+    result = scheduler.get_stream_aware_action_result("work", inner)
+    assert result is not None and result.get_data() == "root"
+
+    # A nearer stream shadows the ancestor's result
+    scheduler.set_action_result(outer, "work", TaskResult.from_result("outer"))
+    result = scheduler.get_stream_aware_action_result("work", inner)
+    assert result is not None and result.get_data() == "outer"
+
+    # Replacing a result is visible without invalidation
+    scheduler.set_action_result(outer, "work", TaskResult.from_result("replaced"))
+    result = scheduler.get_stream_aware_action_result("work", inner)
+    assert result is not None and result.get_data() == "replaced"
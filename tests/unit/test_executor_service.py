@@ -1,16 +1,33 @@
+import asyncio
+import tracemalloc
+import uuid
 from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from typing import Any
 
+import orjson
 import pytest
-from pydantic import SecretStr
 from allama_registry import (
     RegistryOAuthSecret,
     RegistrySecret,
     RegistrySecretType,
 )
+from pydantic import SecretStr
 
+from allama import config
+from allama.auth.types import Role
+from allama.contexts import ctx_role
+from allama.dsl.common import create_default_execution_context
+from allama.dsl.schemas import ActionStatement, RunActionInput, RunContext
 from allama.exceptions import AllamaCredentialsError
+from allama.executor.schemas import ActionImplementation, ExecutorResultSuccess
+from allama.executor.service import ResolutionCache, dispatch_action
+from allama.identifiers.workflow import WorkflowUUID, generate_exec_id
 from allama.integrations.enums import OAuthGrantType
+from allama.registry.lock.types import RegistryLock
 from allama.secrets import secrets_manager
+from allama.storage import blob
+from allama.storage.object import CollectionObject
 
 
 @pytest.mark.anyio
@@ -254,3 +271,300 @@ async def test_extract_templated_secrets_detects_nested_complex_expressions():
             "zendesk.ZENDESK_API_TOKEN",
         ]
     )
+
+
+class _RecordingBackend:
+    """Backend stub that echoes the evaluated args and records resolved contexts."""
+
+    def __init__(self) -> None:
+        self.contexts = []
+
+    async def execute(self, *, input, role, resolved_context, timeout):
+        self.contexts.append(resolved_context)
+        return ExecutorResultSuccess(result=resolved_context.evaluated_args)
+
+
+def _for_each_input(n_items: int, for_each: str | None = None) -> RunActionInput:
+    wf_id = WorkflowUUID.new_uuid4()
+    return RunActionInput(
+        task=ActionStatement(
+            ref="a",
+            action="core.echo",
+            args={
+                "item": "${{ var.item }}",
+                "token": "${{ SECRETS.api.KEY }}",
+                "region": "${{ VARS.settings.region }}",
+            },
+            for_each=for_each or f"${{{{ for var.item in {list(range(n_items))} }}}}",
+        ),
+        exec_context=create_default_execution_context(),
+        run_context=RunContext(
+            wf_id=wf_id,
+            wf_exec_id=generate_exec_id(wf_id),
+            wf_run_id=uuid.uuid4(),
+            environment="default",
+            logical_time=datetime.now(UTC),
+        ),
+        registry_lock=RegistryLock(
+            origins={"allama_registry": "v1"},
+            actions={"core.echo": "allama_registry"},
+        ),
+    )
+
+
+@pytest.fixture
+def dispatch_mocks(mocker):
+    """Stub registry resolution and count secret, variable and token lookups."""
+    ctx_role.set(
+        Role(
+            type="service",
+            service_id="allama-executor",
+            organization_id=uuid.uuid4(),
+            workspace_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+        )
+    )
+    mocker.patch("allama.executor.service.registry_resolver.prefetch_lock")
+    mocker.patch(
+        "allama.executor.service.registry_resolver.resolve_action",
+        return_value=ActionImplementation(
+            type="udf", action_name="core.echo", module="m", name="echo"
+        ),
+    )
+    mocker.patch(
+        "allama.executor.service.registry_resolver.collect_action_secrets_from_manifest",
+        return_value=set(),
+    )
+    return {
+        "secrets": mocker.patch(
+            "allama.executor.service.secrets_manager.get_action_secrets",
+            return_value={"api": {"KEY": "s3cr3t"}},
+        ),
+        "variables": mocker.patch(
+            "allama.executor.service.get_workspace_variables",
+            return_value={"settings": {"region": "us-east-1"}},
+        ),
+        "token": mocker.patch(
+            "allama.executor.service.mint_executor_token", return_value="jwt"
+        ),
+    }
+
+
+@pytest.mark.anyio
+async def test_dispatch_for_each_resolves_secrets_and_variables_once(dispatch_mocks):
+    n_items = 25
+    backend = _RecordingBackend()
+
+    results = await dispatch_action(backend, _for_each_input(n_items))  # type: ignore[arg-type]
+
+    assert [r["item"] for r in results] == list(range(n_items))
+    assert all(r["region"] == "us-east-1" for r in results)
+    # Masking still applies to every iteration's result
+    assert all(r["token"] == "***" for r in results)
+    assert dispatch_mocks["secrets"].await_count == 1
+    assert dispatch_mocks["variables"].await_count == 1
+    assert dispatch_mocks["token"].call_count == 1
+    assert {ctx.executor_token for ctx in backend.contexts} == {"jwt"}
+
+
+@pytest.mark.anyio
+async def test_dispatch_for_each_remints_token_without_reuse_window(
+    dispatch_mocks, monkeypatch
+):
+    # A token that can't outlive the client timeout must never be reused
+    monkeypatch.setattr(config, "ALLAMA__EXECUTOR_TOKEN_TTL_SECONDS", 300)
+    monkeypatch.setattr(config, "ALLAMA__EXECUTOR_CLIENT_TIMEOUT", 300.0)
+
+    await dispatch_action(_RecordingBackend(), _for_each_input(5))  # type: ignore[arg-type]
+
+    assert dispatch_mocks["secrets"].await_count == 1
+    assert dispatch_mocks["token"].call_count == 5
+
+
+@pytest.mark.anyio
+async def test_resolution_cache_expires_and_drops_failures():
+    cache = ResolutionCache(ttl_seconds=60)
+    calls: list[str] = []
+
+    async def fetch() -> str:
+        calls.append("fetch")
+        if len(calls) == 1:
+            raise RuntimeError("transient")
+        return "value"
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_fetch("key", fetch)
+    assert await cache.get_or_fetch("key", fetch) == "value"
+    assert await cache.get_or_fetch("key", fetch) == "value"
+    assert len(calls) == 2
+
+    # Expired entries are fetched again
+    assert await cache.get_or_fetch("key", fetch, ttl_seconds=0) == "value"
+    assert len(calls) == 3
+    cache._entries["key"] = (0.0, cache._entries["key"][1])
+    await cache.get_or_fetch("key", fetch)
+    assert len(calls) == 4
+
+
+@pytest.mark.anyio
+async def test_resolution_cache_single_flight():
+    cache = ResolutionCache(ttl_seconds=60)
+    calls = 0
+
+    async def fetch() -> dict[str, Any]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"ok": True}
+
+    results = await asyncio.gather(*(cache.get_or_fetch("k", fetch) for _ in range(10)))
+
+    assert calls == 1
+    assert all(r == {"ok": True} for r in results)
+
+
+@pytest.fixture
+def loop_invocations(mocker):
+    """Replace invoke_once with a cheap stub that tracks in-flight iterations."""
+    state = {"in_flight": 0, "max_in_flight": 0, "calls": 0}
+
+    async def invoke_once(backend, input, ctx, iteration=None):
+        state["calls"] += 1
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            # Finish out of order to exercise result ordering
+            assert iteration is not None
+            await asyncio.sleep(0.001 * (iteration % 3))
+            return {"i": iteration}
+        finally:
+            state["in_flight"] -= 1
+
+    ctx_role.set(
+        Role(
+            type="service",
+            service_id="allama-executor",
+            organization_id=uuid.uuid4(),
+            workspace_id=uuid.uuid4(),
+        )
+    )
+    mocker.patch("allama.executor.service.invoke_once", invoke_once)
+    return state
+
+
+@pytest.fixture
+def uploaded_blobs(monkeypatch) -> dict[str, bytes]:
+    blobs: dict[str, bytes] = {}
+
+    async def ensure_bucket_exists(bucket: str) -> None:
+        pass
+
+    async def upload_file(content: bytes, key: str, bucket: str, content_type: str):
+        blobs[key] = content
+
+    monkeypatch.setattr(blob, "ensure_bucket_exists", ensure_bucket_exists)
+    monkeypatch.setattr(blob, "upload_file", upload_file)
+    return blobs
+
+
+@pytest.mark.anyio
+async def test_dispatch_for_each_bounds_in_flight_iterations(
+    loop_invocations, monkeypatch
+):
+    monkeypatch.setattr(config, "ALLAMA__LOOP_MAX_BATCH_SIZE", 8)
+
+    results = await dispatch_action(None, _for_each_input(200))  # type: ignore[arg-type]
+
+    assert results == [{"i": i} for i in range(200)]
+    assert loop_invocations["max_in_flight"] == 8
+
+
+@pytest.mark.anyio
+async def test_dispatch_for_each_streams_large_results_to_collection(
+    loop_invocations, uploaded_blobs, monkeypatch
+):
+    monkeypatch.setattr(config, "ALLAMA__COLLECTION_MANIFESTS_ENABLED", True)
+    monkeypatch.setattr(config, "ALLAMA__RESULT_EXTERNALIZATION_ENABLED", True)
+    monkeypatch.setattr(config, "ALLAMA__COLLECTION_INLINE_MAX_ITEMS", 10)
+    monkeypatch.setattr(config, "ALLAMA__COLLECTION_CHUNK_SIZE", 16)
+
+    result = await dispatch_action(
+        None,  # type: ignore[arg-type]
+        _for_each_input(100),
+        collection_key="ws/exec/actions/stream/a",
+    )
+
+    assert isinstance(result, CollectionObject)
+    assert result.count == 100
+    assert sorted(uploaded_blobs) == sorted(
+        [f"ws/exec/actions/stream/a/chunks/{i}.json" for i in range(7)]
+        + ["ws/exec/actions/stream/a/manifest.json"]
+    )
+    chunk = orjson.loads(uploaded_blobs["ws/exec/actions/stream/a/chunks/6.json"])
+    assert chunk["start"] == 96
+    assert chunk["items"] == [{"i": i} for i in range(96, 100)]
+
+
+@pytest.mark.anyio
+async def test_dispatch_for_each_small_results_stay_inline(
+    loop_invocations, uploaded_blobs, monkeypatch
+):
+    monkeypatch.setattr(config, "ALLAMA__COLLECTION_MANIFESTS_ENABLED", True)
+    monkeypatch.setattr(config, "ALLAMA__RESULT_EXTERNALIZATION_ENABLED", True)
+    monkeypatch.setattr(config, "ALLAMA__COLLECTION_INLINE_MAX_ITEMS", 10)
+
+    result = await dispatch_action(
+        None,  # type: ignore[arg-type]
+        _for_each_input(10),
+        collection_key="ws/exec/actions/stream/a",
+    )
+
+    assert result == [{"i": i} for i in range(10)]
+    assert uploaded_blobs == {}
+
+
+@pytest.mark.anyio
+@pytest.mark.slow
+async def test_dispatch_for_each_100k_iterations_bounded_memory(
+    loop_invocations, uploaded_blobs, monkeypatch
+):
+    n_items = 100_000
+    monkeypatch.setattr(config, "ALLAMA__LOOP_MAX_BATCH_SIZE", 64)
+    monkeypatch.setattr(config, "ALLAMA__COLLECTION_MANIFESTS_ENABLED", True)
+    monkeypatch.setattr(config, "ALLAMA__RESULT_EXTERNALIZATION_ENABLED", True)
+    monkeypatch.setattr(config, "ALLAMA__COLLECTION_INLINE_MAX_ITEMS", 100)
+    monkeypatch.setattr(config, "ALLAMA__COLLECTION_CHUNK_SIZE", 256)
+
+    class _DiscardedBlobs(dict):
+        # Keep the keys only so uploaded chunks don't count towards peak memory
+        def __setitem__(self, key, value):
+            super().__setitem__(key, len(value))
+
+    discarded = _DiscardedBlobs()
+
+    async def upload_file(content: bytes, key: str, bucket: str, content_type: str):
+        discarded[key] = content
+
+    monkeypatch.setattr(blob, "upload_file", upload_file)
+    input = _for_each_input(
+        n_items, for_each=f"${{{{ for var.item in FN.range(0, {n_items}) }}}}"
+    )
+
+    tracemalloc.start()
+    try:
+        result = await dispatch_action(
+            None,  # type: ignore[arg-type]
+            input,
+            collection_key="ws/exec/actions/stream/a",
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert isinstance(result, CollectionObject)
+    assert result.count == n_items
+    assert loop_invocations["calls"] == n_items
+    assert loop_invocations["max_in_flight"] == 64
+    assert len(discarded) == n_items // 256 + 2
+    # The loop range itself is ~4MB. Memory must not grow with the iteration count.
+    assert peak < 16 * 1024 * 1024, f"peak traced memory {peak / 1e6:.1f}MB"
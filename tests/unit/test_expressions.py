@@ -4,8 +4,15 @@ from datetime import datetime, timedelta
 from typing import Any, Literal
 
 import httpx
+import jsonpath_ng.ext
 import pytest
 import respx
+from allama_registry._internal.exceptions import (
+    AllamaExpressionError as RegistryExpressionError,
+)
+from allama_registry._internal.jsonpath import (
+    eval_jsonpath as registry_eval_jsonpath,
+)
 from httpx import Response
 from pydantic import SecretStr
 
@@ -17,6 +24,8 @@ from allama.expressions.common import (
     ExprContext,
     ExprType,
     IterableExpr,
+    _compile_jsonpath,
+    _simple_jsonpath_segments,
     eval_jsonpath,
 )
 from allama.expressions.core import TemplateExpression
@@ -125,6 +134,112 @@ def test_eval_jsonpath():
     )
 
 
+def _reference_eval_jsonpath(path: Any, expr: str, operand: Any) -> Any:
+    """jsonpath_ng evaluation, as eval_jsonpath behaved before the fast path."""
+    matches = [found.value for found in path.find(operand)]
+    has_wildcard = "[*]" in expr
+    if len(matches) > 1 or has_wildcard:
+        return matches
+    return matches[0] if matches else None
+
+
+_PARITY_OPERANDS: list[Any] = [
+    {"a": {"b": [1, {"c": "x"}], "items": []}, "where": 1},
+    {"a": {"b": {"items": [{"c": None}, {"c": [0, 1]}]}, "trueish": {"b": 2}}},
+    {"a": [{"b": "str"}, {"b": {"c": 3}}], "b": None},
+    {"a": {"b": "hello", "c": True, "items": [[1, 2], [3]]}},
+    [{"a": 1}, {"a": {"b": 2}}],
+    {"a": {"b": {"c": {"items": 0}}}, "false_flag": False},
+]
+
+
+def _random_jsonpaths(rng, n: int) -> list[str]:
+    fields = ["a", "b", "c", "items", "trueish", "where", "false_flag"]
+    paths: set[str] = {"$", "$.a", "a[0]", "a.b[1].c", "a.items[0][1]", "a.b.c"}
+    while len(paths) < n:
+        path = rng.choice(["$", rng.choice(fields)])
+        for _ in range(rng.randint(0, 4)):
+            if rng.random() < 0.3:
+                path += f"[{rng.randint(0, 2)}]"
+            else:
+                path += f".{rng.choice(fields)}"
+        paths.add(path)
+    return sorted(paths)
+
+
+@pytest.mark.parametrize(
+    "eval_fn,error_cls",
+    [
+        pytest.param(eval_jsonpath, AllamaExpressionError, id="allama"),
+        pytest.param(
+            registry_eval_jsonpath, RegistryExpressionError, id="allama_registry"
+        ),
+    ],
+)
+def test_eval_jsonpath_fast_path_parity(eval_fn, error_cls):
+    """Simple paths resolved by direct traversal match jsonpath_ng results and errors."""
+    import random
+
+    rng = random.Random(1234)
+    for expr in _random_jsonpaths(rng, 120):
+        try:
+            path = jsonpath_ng.ext.parse(expr)
+        except Exception:
+            with pytest.raises(error_cls):
+                eval_fn(expr, _PARITY_OPERANDS[0])
+            continue
+        for operand in _PARITY_OPERANDS:
+            try:
+                expected = _reference_eval_jsonpath(path, expr, operand)
+            except Exception:
+                with pytest.raises(Exception):  # noqa: B017
+                    eval_fn(expr, operand)
+                continue
+            assert eval_fn(expr, operand) == expected, (expr, operand)
+
+
+@pytest.mark.parametrize(
+    "expr,expected",
+    [
+        ("ACTIONS.a.result[0].id", ("ACTIONS", "a", "result", 0, "id")),
+        ("$.webhook.data", ("webhook", "data")),
+        ("$", ()),
+        ("a.trueish", None),
+        ("a.where", None),
+        ("a[*]", None),
+        ("a[-1]", None),
+        ("$..a", None),
+        ("a.'b c'", None),
+        ("a.b-c", None),
+        ("a[?(@.b == 1)]", None),
+    ],
+)
+def test_simple_jsonpath_segments(expr, expected):
+    assert _simple_jsonpath_segments(expr) == expected
+
+
+def test_eval_jsonpath_fast_path_skips_jsonpath_ng(monkeypatch: pytest.MonkeyPatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("jsonpath_ng should not be used for simple paths")
+
+    monkeypatch.setattr(jsonpath_ng.ext, "parse", fail)
+    operand: dict[str, Any] = {ExprContext.ACTIONS: {"a": {"result": [{"id": 7}]}}}
+    assert eval_jsonpath("ACTIONS.a.result[0].id", operand) == 7
+    assert eval_jsonpath("ACTIONS.a.result[3].id", operand) is None
+    with pytest.raises(AllamaExpressionError):
+        eval_jsonpath("ACTIONS.a.missing", operand, strict=True)
+
+
+def test_eval_jsonpath_caches_compiled_paths():
+    _compile_jsonpath.cache_clear()
+    operand = {"a": [{"b": 1}, {"b": 2}]}
+    for _ in range(3):
+        assert eval_jsonpath("$.a[*].b", operand) == [1, 2]
+    info = _compile_jsonpath.cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+
+
 @pytest.mark.parametrize(
     "expression,expected_result",
     [
@@ -1766,3 +1881,103 @@ def test_collect_expressions_captures_vars_references():
     result = collect_expressions(obj)
     assert result.variables == set()  # No VARS expressions
     assert result.secrets == set()  # No SECRETS expressions
+
+
+def test_collect_expressions_captures_action_and_trigger_references():
+    obj = {
+        "a": "${{ ACTIONS.first.result.data }}",
+        "b": "${{ ACTIONS.second.error }} and ${{ ACTIONS.second.result }}",
+        "c": "${{ FN.length(ACTIONS.third) }}",
+        "d": "${{ ACTIONS.fourth.result[0] if TRIGGER.flag else None }}",
+    }
+    result = collect_expressions(obj)
+    assert result.actions == {
+        "first": {"result"},
+        "second": {"error", "result"},
+        "third": {"*"},
+        "fourth": {"result"},
+    }
+    assert result.all_actions is False
+    assert result.trigger is True
+
+    result = collect_expressions({"x": "${{ ACTIONS.*.result }}"})
+    assert result.all_actions is True
+    assert result.trigger is False
+
+
+def _large_templated_args(n: int = 2_000) -> dict[str, Any]:
+    return {
+        f"field_{i}": {
+            "value": f"${{{{ ACTIONS.a.result.items[{i % 20}].name }}}}",
+            "inline": f"Item ${{{{ ACTIONS.a.result.items[{i % 20}].id }}}} of {n}",
+            "flag": "${{ ACTIONS.a.result.count > 10 && TRIGGER.enabled }}",
+        }
+        for i in range(n)
+    }
+
+
+def _large_templated_operand() -> dict[str, Any]:
+    return {
+        ExprContext.ACTIONS: {
+            "a": {
+                "result": {
+                    "items": [{"id": i, "name": f"n{i}"} for i in range(20)],
+                    "count": 20,
+                }
+            }
+        },
+        ExprContext.TRIGGER: {"enabled": True},
+    }
+
+
+def test_expression_parse_cache_is_shared_across_entry_points():
+    from allama.expressions.parser.core import parser
+
+    parser.cache_clear()
+    args = {"x": "${{ ACTIONS.a.result.count }}", "s": "${{ SECRETS.s.KEY }}"}
+    operand = _large_templated_operand()
+
+    eval_templated_object({"x": args["x"]}, operand=operand)
+    assert parser.cache_info().misses == 1
+    assert parser.cache_info().hits == 0
+
+    collect_expressions(args)
+    extract_templated_secrets(args)
+    eval_templated_object({"x": args["x"]}, operand=operand)
+
+    info = parser.cache_info()
+    assert info.misses == 2  # Only the SECRETS expression is new
+    assert info.hits == 4
+    assert info.currsize == 2
+
+
+def test_expression_parse_cache_does_not_cache_errors():
+    parser = ExprParser(cache_size=8)
+    for _ in range(2):
+        with pytest.raises(AllamaExpressionError):
+            parser.parse("ACTIONS.a.result -> str -> int")
+    assert parser.cache_info().currsize == 0
+
+
+def test_expression_parse_cache_is_bounded():
+    parser = ExprParser(cache_size=4)
+    for i in range(10):
+        parser.parse(f"ACTIONS.a.result[{i}]")
+    assert parser.cache_info().currsize == 4
+
+
+def test_expression_parse_cache_hits_repeated_expressions():
+    """Parsing a large args dict twice only parses each distinct expression once."""
+    from allama.parse import traverse_expressions
+
+    exprs = list(traverse_expressions(_large_templated_args(n=500)))
+    cached = ExprParser()
+
+    for _ in range(2):
+        for expr in exprs:
+            cached.parse(expr)
+
+    info = cached.cache_info()
+    # 20 distinct values + 20 distinct inlines + 1 flag expression
+    assert info.misses == 41
+    assert info.hits == 2 * len(exprs) - info.misses
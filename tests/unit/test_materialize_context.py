@@ -1,10 +1,25 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+from typing import Any
+
 import pytest
 
-from allama.dsl.action import materialize_context
+from allama.dsl.action import (
+    MaterializationStats,
+    collect_context_refs,
+    materialize_context,
+)
 from allama.dsl.schemas import ExecutionContext, TaskResult
-from allama.storage.object import InlineObject
+from allama.storage.object import (
+    ExternalObject,
+    InlineObject,
+    ObjectRef,
+    ObjectStorage,
+    StoredObject,
+    reset_object_storage,
+    set_object_storage,
+)
 
 
 @pytest.mark.anyio
@@ -24,3 +39,130 @@ async def test_materialize_context_rehydrates_task_result_dicts() -> None:
     assert materialized["ACTIONS"]["a1"]["result"] == {"ok": True}
     assert materialized["ACTIONS"]["a1"]["result_typename"] == "dict"
     assert materialized["TRIGGER"] == {"trigger": 1}
+
+
+class _RecordingStorage(ObjectStorage):
+    """Serves ExternalObjects from memory and records which keys were read."""
+
+    def __init__(self, blobs: dict[str, Any]) -> None:
+        self.blobs = blobs
+        self.retrieved: list[str] = []
+
+    async def store(self, key: str, data: Any) -> StoredObject:
+        raise NotImplementedError
+
+    async def retrieve(self, stored: StoredObject) -> Any:
+        match stored:
+            case InlineObject(data=data):
+                return data
+            case ExternalObject(ref=ref):
+                self.retrieved.append(ref.key)
+                return self.blobs[ref.key]
+            case _:
+                raise NotImplementedError
+
+
+def _external(key: str, size_bytes: int = 100) -> ExternalObject:
+    return ExternalObject(
+        ref=ObjectRef(bucket="test", key=key, size_bytes=size_bytes, sha256="x")
+    )
+
+
+@pytest.fixture
+def recording_storage() -> Iterator[_RecordingStorage]:
+    storage = _RecordingStorage(
+        {"a.json": {"ok": True}, "b.json": [1, 2, 3], "trigger.json": {"t": 1}}
+    )
+    set_object_storage(storage)
+    try:
+        yield storage
+    finally:
+        reset_object_storage()
+
+
+def _external_ctx() -> ExecutionContext:
+    return ExecutionContext(
+        ACTIONS={
+            "a": TaskResult(result=_external("a.json"), result_typename="dict"),
+            "b": TaskResult(
+                result=_external("b.json", 5_000),
+                result_typename="list",
+                error={"message": "boom"},
+            ),
+        },
+        TRIGGER=_external("trigger.json"),
+    )
+
+
+@pytest.mark.anyio
+async def test_materialize_context_only_fetches_referenced_actions(
+    recording_storage: _RecordingStorage,
+) -> None:
+    refs = collect_context_refs({"x": "${{ ACTIONS.a.result.ok }}"})
+
+    materialized = await materialize_context(_external_ctx(), refs=refs)
+
+    assert recording_storage.retrieved == ["a.json"]
+    actions = materialized.get("ACTIONS", {})
+    assert set(actions) == {"a"}
+    assert actions["a"]["result"] == {"ok": True}
+    assert "TRIGGER" not in materialized
+
+
+@pytest.mark.anyio
+async def test_materialize_context_skips_result_for_metadata_references(
+    recording_storage: _RecordingStorage,
+) -> None:
+    refs = collect_context_refs("${{ ACTIONS.b.error.message }}", "${{ TRIGGER.t }}")
+
+    materialized = await materialize_context(_external_ctx(), refs=refs)
+
+    assert recording_storage.retrieved == ["trigger.json"]
+    actions = materialized.get("ACTIONS", {})
+    assert actions["b"]["result"] is None
+    assert actions["b"]["error"] == {"message": "boom"}
+    assert materialized.get("TRIGGER") == {"t": 1}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "expr",
+    [
+        "${{ ACTIONS.*.result }}",
+        "${{ ACTIONS..ok }}",
+        "${{ ACTIONS['a'].result }}",
+    ],
+)
+async def test_materialize_context_dynamic_action_refs_fetch_all(
+    recording_storage: _RecordingStorage, expr: str
+) -> None:
+    refs = collect_context_refs(expr)
+
+    await materialize_context(_external_ctx(), refs=refs)
+
+    assert sorted(recording_storage.retrieved) == ["a.json", "b.json"]
+
+
+@pytest.mark.anyio
+async def test_materialize_context_without_refs_fetches_everything(
+    recording_storage: _RecordingStorage,
+) -> None:
+    await materialize_context(_external_ctx())
+
+    assert sorted(recording_storage.retrieved) == ["a.json", "b.json", "trigger.json"]
+
+
+def test_collect_context_refs_falls_back_on_invalid_expression() -> None:
+    assert collect_context_refs("${{ ACTIONS.a.result ->-> }}") is None
+
+
+def test_materialization_stats_accounts_fetched_and_skipped_bytes() -> None:
+    stats = MaterializationStats()
+    stats.record(_external("a.json", 100), fetched=True)
+    stats.record(_external("b.json", 5_000), fetched=False)
+    stats.record(InlineObject(data=[1, 2, 3]), fetched=True)
+
+    assert stats.bytes_fetched == 100
+    assert stats.bytes_skipped == 5_000
+    assert stats.objects_fetched == 1
+    assert stats.objects_skipped == 1
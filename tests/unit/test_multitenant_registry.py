@@ -63,17 +63,14 @@ class TestTarballCacheBehavior:
 
         download_count = [0]  # Use list to allow mutation in nested function
 
-        async def mock_download(url: str, path: Path):
+        async def mock_stream_extract(url: str, target_dir: Path) -> int:
             download_count[0] += 1
             await asyncio.sleep(0.1)  # Simulate network delay
-            path.write_bytes(b"fake tarball")
-
-        async def mock_extract(tarball_path: Path, target_dir: Path):
             (target_dir / "extracted.txt").write_text("content")
+            return 7
 
         with (
-            patch.object(runner, "_download_file", mock_download),
-            patch.object(runner, "_extract_tarball", mock_extract),
+            patch.object(runner, "_stream_extract_tarball", mock_stream_extract),
             patch.object(
                 runner,
                 "_tarball_uri_to_http_url",
@@ -117,16 +114,13 @@ class TestTarballCacheBehavior:
 
         download_calls: list[str] = []
 
-        async def mock_download(url: str, path: Path):
+        async def mock_stream_extract(url: str, target_dir: Path) -> int:
             download_calls.append(url)
-            path.write_bytes(b"fake tarball")
-
-        async def mock_extract(tarball_path: Path, target_dir: Path):
             (target_dir / "extracted.txt").write_text("content")
+            return 7
 
         with (
-            patch.object(runner, "_download_file", mock_download),
-            patch.object(runner, "_extract_tarball", mock_extract),
+            patch.object(runner, "_stream_extract_tarball", mock_stream_extract),
             patch.object(
                 runner,
                 "_tarball_uri_to_http_url",
@@ -166,15 +160,12 @@ class TestTarballCacheBehavior:
         cache_key = "failed-extraction-test"
         tarball_uri = "s3://bucket/bad.tar.gz"
 
-        async def mock_download(url: str, path: Path):
-            path.write_bytes(b"corrupt tarball")
-
-        async def mock_extract(tarball_path: Path, target_dir: Path):
+        async def mock_stream_extract(url: str, target_dir: Path) -> int:
+            (target_dir / "partial.txt").write_text("corrupt tarball")
             raise RuntimeError("Extraction failed - corrupt tarball")
 
         with (
-            patch.object(runner, "_download_file", mock_download),
-            patch.object(runner, "_extract_tarball", mock_extract),
+            patch.object(runner, "_stream_extract_tarball", mock_stream_extract),
             patch.object(
                 runner,
                 "_tarball_uri_to_http_url",
@@ -186,7 +177,7 @@ class TestTarballCacheBehavior:
                 await runner.ensure_tarball_extracted(cache_key, tarball_uri)
 
         # Verify no temp files remain
-        temp_files = list(temp_cache_dir.glob(f"{cache_key}*"))
+        temp_files = list(temp_cache_dir.glob(f"*{cache_key}*"))
         assert len(temp_files) == 0, f"Temp files not cleaned up: {temp_files}"
 
         # Target directory should not exist
@@ -211,16 +202,13 @@ class TestTarballCacheBehavior:
 
         download_count = [0]
 
-        async def mock_download(url: str, path: Path):
+        async def mock_stream_extract(url: str, target_dir: Path) -> int:
             download_count[0] += 1
-            path.write_bytes(b"tarball")
-
-        async def mock_extract(tarball_path: Path, target_dir: Path):
             (target_dir / "file.txt").write_text("content")
+            return 7
 
         with (
-            patch.object(runner, "_download_file", mock_download),
-            patch.object(runner, "_extract_tarball", mock_extract),
+            patch.object(runner, "_stream_extract_tarball", mock_stream_extract),
             patch.object(
                 runner,
                 "_tarball_uri_to_http_url",
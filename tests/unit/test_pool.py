@@ -424,6 +424,80 @@ class TestWorkerPool:
 
         assert pool._lock_acquisitions > initial_acquisitions
 
+    @pytest.mark.anyio
+    async def test_release_wakes_exactly_one_waiter(self):
+        """Test that a released slot is handed to a single waiting task."""
+        pool = WorkerPool(size=1, max_concurrent_per_worker=1)
+        pool._started = True
+
+        proc = MagicMock()
+        proc.returncode = None
+        worker = WorkerInfo(
+            worker_id=0,
+            pid=1000,
+            process=proc,
+            work_dir=Path("/tmp/sandbox-0/work"),
+            socket_path=Path("/tmp/sandbox-0/work/task.sock"),
+            active_tasks=1,  # At capacity
+            tasks_completed=0,
+        )
+        pool._workers.append(worker)
+
+        waiters = [
+            asyncio.create_task(pool._get_available_worker(timeout=5.0))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.05)
+        assert not any(w.done() for w in waiters)
+        assert pool._tasks_waiting == 2
+
+        await pool._release_worker(worker)
+        done, pending = await asyncio.wait(waiters, timeout=1.0)
+
+        assert len(done) == 1
+        assert len(pending) == 1
+        assert done.pop().result() is worker
+        assert worker.active_tasks == 1
+        assert pool._tasks_waiting == 1
+
+        pending.pop().cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        assert pool._tasks_waiting == 0
+
+    @pytest.mark.anyio
+    async def test_queue_wait_metrics(self):
+        """Test that time spent waiting for a slot is recorded."""
+        pool = WorkerPool(size=1, max_concurrent_per_worker=1)
+        pool._started = True
+
+        proc = MagicMock()
+        proc.returncode = None
+        worker = WorkerInfo(
+            worker_id=0,
+            pid=1000,
+            process=proc,
+            work_dir=Path("/tmp/sandbox-0/work"),
+            socket_path=Path("/tmp/sandbox-0/work/task.sock"),
+            active_tasks=0,
+            tasks_completed=0,
+        )
+        pool._workers.append(worker)
+
+        # Uncontended acquisition doesn't count as a queue wait
+        await pool._get_available_worker(timeout=1.0)
+        assert pool.get_lifetime_metrics()["queue_waits"] == 0
+
+        waiter = asyncio.create_task(pool._get_available_worker(timeout=5.0))
+        await asyncio.sleep(0.05)
+        await pool._release_worker(worker)
+        assert await waiter is worker
+
+        metrics = pool.get_lifetime_metrics()
+        assert metrics["tasks_queued"] == 1
+        assert metrics["queue_waits"] == 1
+        assert metrics["max_queue_wait_ms"] >= 40
+        assert metrics["avg_queue_wait_ms"] == metrics["max_queue_wait_ms"]
+
 
 class TestWorkerInfo:
     """Tests for WorkerInfo dataclass."""
@@ -1,10 +1,13 @@
 """Unit tests for registry resolver module."""
 
+import asyncio
 import uuid
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from allama import config
 from allama.exceptions import RegistryError
 from allama.executor import registry_resolver
 from allama.registry.lock.types import RegistryLock
@@ -264,3 +267,135 @@ class TestCollectActionSecretsFromManifest:
             )
 
         assert "not bound in registry_lock" in str(exc_info.value)
+
+
+class TestManifestCache:
+    """Tests for the version-keyed, single-flight manifest cache."""
+
+    MANIFEST = _make_manifest(
+        {
+            "tools.custom.run": {
+                "type": "udf",
+                "url": "git+ssh://git@github.com/org/repo.git",
+                "module": "custom.module",
+                "name": "run",
+            }
+        }
+    )
+    ORIGIN = "git+ssh://git@github.com/org/repo.git"
+    LOCK = RegistryLock(
+        origins={ORIGIN: "abc123"},
+        actions={"tools.custom.run": ORIGIN},
+    )
+
+    @pytest.fixture
+    def fetch_manifest(self, mocker):
+        """Count DB manifest fetches without a database."""
+
+        @asynccontextmanager
+        async def _session_cm():
+            yield None
+
+        async def _fetch(session, origin, version, organization_id):
+            await asyncio.sleep(0.01)
+            return self.MANIFEST
+
+        mocker.patch.object(
+            registry_resolver, "get_async_session_context_manager", _session_cm
+        )
+        return mocker.patch.object(
+            registry_resolver, "_fetch_manifest", side_effect=_fetch
+        )
+
+    @pytest.mark.anyio
+    async def test_concurrent_misses_load_once(self, fetch_manifest):
+        org_id = uuid.uuid4()
+
+        impls = await asyncio.gather(
+            *(
+                registry_resolver.resolve_action("tools.custom.run", self.LOCK, org_id)
+                for _ in range(20)
+            )
+        )
+        await registry_resolver.prefetch_lock(self.LOCK, org_id)
+
+        assert fetch_manifest.call_count == 1
+        assert all(impl.module == "custom.module" for impl in impls)
+
+    @pytest.mark.anyio
+    async def test_entries_are_scoped_by_organization(self, fetch_manifest):
+        await registry_resolver.prefetch_lock(self.LOCK, uuid.uuid4())
+        await registry_resolver.prefetch_lock(self.LOCK, uuid.uuid4())
+        assert fetch_manifest.call_count == 2
+
+        # The platform registry is shared by all organizations
+        platform_lock = RegistryLock(
+            origins={"allama_registry": "2024.12.10"},
+            actions={"tools.custom.run": "allama_registry"},
+        )
+        await registry_resolver.prefetch_lock(platform_lock, uuid.uuid4())
+        await registry_resolver.prefetch_lock(platform_lock, uuid.uuid4())
+        assert fetch_manifest.call_count == 3
+
+    @pytest.mark.anyio
+    async def test_failed_load_is_not_cached(self, fetch_manifest):
+        org_id = uuid.uuid4()
+        fetch_manifest.side_effect = [RegistryError("not found"), self.MANIFEST]
+
+        with pytest.raises(RegistryError):
+            await registry_resolver.prefetch_lock(self.LOCK, org_id)
+        impl = await registry_resolver.resolve_action(
+            "tools.custom.run", self.LOCK, org_id
+        )
+
+        assert impl.name == "run"
+        assert fetch_manifest.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_disk_cache_survives_restart(
+        self, fetch_manifest, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(
+            config, "ALLAMA__EXECUTOR_MANIFEST_CACHE_DIR", str(tmp_path)
+        )
+        org_id = uuid.uuid4()
+
+        await registry_resolver.prefetch_lock(self.LOCK, org_id)
+        assert len(list(tmp_path.glob(f"{org_id}/*.json"))) == 1
+
+        # Simulate a restarted executor that can't reach the DB
+        await registry_resolver.clear_cache()
+        fetch_manifest.side_effect = AssertionError("DB should not be queried")
+
+        await registry_resolver.prefetch_lock(self.LOCK, org_id)
+        impl = await registry_resolver.resolve_action(
+            "tools.custom.run", self.LOCK, org_id
+        )
+        secrets = await registry_resolver.collect_action_secrets_from_manifest(
+            "tools.custom.run", self.LOCK, org_id
+        )
+
+        assert impl.module == "custom.module"
+        assert impl.origin == self.ORIGIN
+        assert secrets == set()
+        assert fetch_manifest.call_count == 1
+
+    @pytest.mark.anyio
+    async def test_corrupt_disk_cache_falls_back_to_db(
+        self, fetch_manifest, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(
+            config, "ALLAMA__EXECUTOR_MANIFEST_CACHE_DIR", str(tmp_path)
+        )
+        org_id = uuid.uuid4()
+        await registry_resolver.prefetch_lock(self.LOCK, org_id)
+        (cache_file,) = tmp_path.glob(f"{org_id}/*.json")
+        cache_file.write_bytes(b"{not json")
+        await registry_resolver.clear_cache()
+
+        impl = await registry_resolver.resolve_action(
+            "tools.custom.run", self.LOCK, org_id
+        )
+
+        assert impl.name == "run"
+        assert fetch_manifest.call_count == 2
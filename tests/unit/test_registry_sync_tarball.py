@@ -0,0 +1,175 @@
+"""Tests for building and uploading layered registry tarball venvs."""
+
+from __future__ import annotations
+
+import io
+import os
+from pathlib import Path
+
+import pytest
+
+from allama.registry.sync import tarball
+from allama.registry.sync.schemas import TarballCompression, TarballVenvManifest
+from allama.registry.sync.tarball import (
+    BASE_LAYER_NAME,
+    TarballVenvBuildResult,
+    _build_layers,
+    _group_site_packages_files,
+    _write_layer_tarball,
+    detect_tarball_compression,
+    get_tarball_venv_layer_s3_key,
+    open_tarball_stream,
+    upload_tarball_venv,
+)
+
+COMPRESSIONS: list[TarballCompression] = ["gzip", "zstd"]
+
+
+def _install(site_packages: Path, dist: str, files: dict[str, str]) -> None:
+    """Write a distribution's files and a RECORD listing them."""
+    dist_info = f"{dist}.dist-info"
+    files = {**files, f"{dist_info}/METADATA": f"Name: {dist}\n"}
+    for path, content in files.items():
+        (site_packages / path).parent.mkdir(parents=True, exist_ok=True)
+        (site_packages / path).write_text(content)
+    record = [f"{path},," for path in files] + [f"{dist_info}/RECORD,,"]
+    (site_packages / dist_info / "RECORD").write_text("\n".join(record) + "\n")
+
+
+@pytest.fixture
+def site_packages(tmp_path: Path) -> Path:
+    site_packages = tmp_path / "site-packages"
+    _install(
+        site_packages,
+        "requests-2.32.0",
+        {
+            "requests/__init__.py": "VERSION = 1\n",
+            "requests/api.py": "def get(): ...\n",
+        },
+    )
+    _install(site_packages, "my_registry-0.1.0", {"my_registry/udfs.py": "X = 1\n"})
+    # Bytecode isn't in RECORD when compiled after install
+    pycache = site_packages / "requests" / "__pycache__"
+    pycache.mkdir()
+    (pycache / "api.cpython-312.pyc").write_bytes(b"\x00")
+    (site_packages / "_virtualenv.pth").write_text("import _virtualenv\n")
+    return site_packages
+
+
+def _build(site_packages: Path, output_dir: Path) -> TarballVenvBuildResult:
+    layers = _build_layers(site_packages, output_dir)
+    return TarballVenvBuildResult(
+        manifest=TarballVenvManifest(layers=layers),
+        layers_dir=output_dir,
+        content_hash="",
+        uncompressed_size_bytes=0,
+        compressed_size_bytes=sum(layer.size_bytes for layer in layers),
+    )
+
+
+def test_group_site_packages_files(site_packages: Path):
+    groups = _group_site_packages_files(site_packages)
+
+    assert groups == {
+        BASE_LAYER_NAME: ["_virtualenv.pth"],
+        "my_registry-0.1.0": [
+            "my_registry-0.1.0.dist-info/METADATA",
+            "my_registry-0.1.0.dist-info/RECORD",
+            "my_registry/udfs.py",
+        ],
+        "requests-2.32.0": [
+            "requests-2.32.0.dist-info/METADATA",
+            "requests-2.32.0.dist-info/RECORD",
+            "requests/__init__.py",
+            "requests/__pycache__/api.cpython-312.pyc",
+            "requests/api.py",
+        ],
+    }
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_layers_are_reproducible(
+    site_packages: Path, tmp_path: Path, compression: TarballCompression
+):
+    first = _build_layers(site_packages, tmp_path / "first", compression)
+    # Rebuilding later (e.g. a fresh install) must not change any digest
+    for path in site_packages.rglob("*"):
+        os.utime(path, (0, 0))
+    second = _build_layers(site_packages, tmp_path / "second", compression)
+
+    assert first == second
+    for layer in first:
+        assert layer.compression == compression
+        path = (
+            tmp_path / "first" / f"{layer.digest}{tarball.tarball_suffix(compression)}"
+        )
+        assert tarball._compute_file_hash(path) == layer.digest
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_layer_roundtrip(
+    site_packages: Path, tmp_path: Path, compression: TarballCompression
+):
+    output_path = tmp_path / "layer"
+    _write_layer_tarball(
+        site_packages,
+        ["requests/__init__.py", "requests/api.py"],
+        output_path,
+        compression,
+    )
+    content = output_path.read_bytes()
+
+    assert detect_tarball_compression(content[:4]) == compression
+    with open_tarball_stream(io.BytesIO(content), compression) as tar:
+        tar.extractall(tmp_path / "extracted", filter="data")
+    assert (tmp_path / "extracted" / "requests" / "api.py").read_text() == (
+        "def get(): ...\n"
+    )
+
+
+def test_detect_tarball_compression_rejects_unknown():
+    with pytest.raises(ValueError, match="Unrecognized tarball compression"):
+        detect_tarball_compression(b"PK\x03\x04")
+
+
+@pytest.mark.anyio
+async def test_upload_skips_existing_layers(
+    site_packages: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    bucket_contents: dict[str, bytes] = {}
+
+    async def file_exists(key: str, bucket: str) -> bool:
+        return key in bucket_contents
+
+    async def upload_file(
+        content: bytes, key: str, bucket: str, content_type: str | None = None
+    ) -> None:
+        bucket_contents[key] = content
+
+    monkeypatch.setattr(tarball.blob, "file_exists", file_exists)
+    monkeypatch.setattr(tarball.blob, "upload_file", upload_file)
+
+    v1 = _build(site_packages, tmp_path / "v1")
+    await upload_tarball_venv(v1, "org/v1/manifest.json", "bucket", "org")
+    assert len(bucket_contents) == len(v1.manifest.layers) + 1
+
+    # Changing only the repository's own code re-uploads only its layer
+    (site_packages / "my_registry" / "udfs.py").write_text("X = 2\n")
+    v2 = _build(site_packages, tmp_path / "v2")
+    before = set(bucket_contents)
+    await upload_tarball_venv(v2, "org/v2/manifest.json", "bucket", "org")
+
+    [udf_layer] = [
+        layer for layer in v2.manifest.layers if layer.name == "my_registry-0.1.0"
+    ]
+    assert set(bucket_contents) - before == {
+        get_tarball_venv_layer_s3_key("org", udf_layer.digest),
+        "org/v2/manifest.json",
+    }
+    manifest = TarballVenvManifest.model_validate_json(
+        bucket_contents["org/v2/manifest.json"]
+    )
+    assert [layer.key for layer in manifest.layers] == [
+        get_tarball_venv_layer_s3_key("org", layer.digest)
+        for layer in v2.manifest.layers
+    ]
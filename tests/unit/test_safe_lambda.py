@@ -4,9 +4,13 @@ These tests verify that the SafeLambdaValidator and related security functions
 correctly block dangerous expressions while allowing safe operations.
 """
 
+import ast
+import copy
 import sys
+from collections.abc import Callable
 from typing import Any
 
+import orjson
 import pytest
 
 from allama.sandbox.safe_lambda import build_safe_lambda
@@ -349,3 +353,134 @@ def test_build_lambda_input_sanitization() -> None:
     # Test with string input (should not be wrapped)
     str_lambda = build_safe_lambda("lambda x: x.upper()")
     assert str_lambda("hello") == "HELLO"
+
+
+def test_build_lambda_caches_validation(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Validation and compilation run once per distinct lambda source."""
+    from allama.sandbox import safe_lambda
+
+    visits: list[str] = []
+    original_visit = safe_lambda.SafeLambdaValidator.visit
+
+    def counting_visit(self, node):
+        if isinstance(node, ast.Lambda):
+            visits.append(ast.unparse(node))
+        return original_visit(self, node)
+
+    monkeypatch.setattr(safe_lambda.SafeLambdaValidator, "visit", counting_visit)
+    safe_lambda._compile_safe_lambda.cache_clear()
+
+    for i in range(3):
+        assert build_safe_lambda("lambda x: x + 1")(i) == i + 1
+    assert build_safe_lambda("lambda x: x * 2")(2) == 4
+    assert visits == ["lambda x: x + 1", "lambda x: x * 2"]
+
+    # Rejected expressions aren't cached, so they're rejected every time
+    for _ in range(2):
+        with pytest.raises(ValueError, match="restricted"):
+            build_safe_lambda("lambda x: open(x)")
+
+
+def test_build_lambda_cached_defaults_not_shared() -> None:
+    """Each build gets fresh default arguments, even for a cached source."""
+    lambda_str = "lambda x, seen=[]: seen.append(x) or len(seen)"
+    assert build_safe_lambda(lambda_str)(1) == 1
+    assert build_safe_lambda(lambda_str)(1) == 1
+
+
+@pytest.mark.parametrize(
+    "lambda_str,test_input",
+    [
+        ("lambda x: x.append(4)", [1, 2, 3]),
+        ("lambda x: x.extend([4])", [1, 2, 3]),
+        ("lambda x: x.pop()", [1, 2, 3]),
+        ("lambda x: x.sort()", [3, 2, 1]),
+        ("lambda x: x.clear()", [1, 2, 3]),
+        ("lambda x: x.update({'b': 2})", {"a": 1}),
+        ("lambda x: x.pop('a')", {"a": 1}),
+        ("lambda x: x.setdefault('b', 2)", {"a": 1}),
+        ("lambda x: x.clear()", {"a": 1}),
+    ],
+)
+def test_build_lambda_blocks_mutation(lambda_str: str, test_input: Any) -> None:
+    """Dicts and lists are passed as read-only views."""
+    original = copy.deepcopy(test_input)
+    fn = build_safe_lambda(lambda_str)
+
+    with pytest.raises(AttributeError):
+        fn(test_input)
+    assert test_input == original
+
+
+def test_build_lambda_view_internals_unreachable() -> None:
+    with pytest.raises(ValueError, match="dangerous pattern"):
+        build_safe_lambda("lambda x: x._ReadOnlyList__data.append(1)")
+
+
+@pytest.mark.parametrize("size", [10000, 10001])
+def test_build_lambda_size_limit(size: int) -> None:
+    """Inputs larger than the iteration limit are rejected."""
+    fn = build_safe_lambda("lambda x: len(x)")
+    for test_input in (list(range(size)), dict.fromkeys(range(size))):
+        if size > 10000:
+            with pytest.raises(ValueError, match="maximum iteration limit"):
+                fn(test_input)
+        else:
+            assert fn(test_input) == size
+
+
+@pytest.mark.parametrize(
+    "lambda_str,test_input,expected_result",
+    [
+        ("lambda x: x + [4]", [1, 2, 3], [1, 2, 3, 4]),
+        ("lambda x: [0] + x", [1, 2, 3], [0, 1, 2, 3]),
+        ("lambda x: x[1:]", [1, 2, 3], [2, 3]),
+        ("lambda x: x[-1]", [1, 2, 3], 3),
+        ("lambda x: x * 2", [1], [1, 1]),
+        ("lambda x: x == [1, 2, 3]", [1, 2, 3], True),
+        ("lambda x: [1, 2, 3] == x", [1, 2, 3], True),
+        ("lambda x: 2 in x", [1, 2, 3], True),
+        ("lambda x: x.index(2)", [1, 2, 3], 1),
+        ("lambda x: x.index(2, 2, 4)", [1, 2, 3, 2], 3),
+        ("lambda x: list(reversed(x))", [1, 2, 3], [3, 2, 1]),
+        ("lambda x: sorted(x, reverse=True)", [1, 3, 2], [3, 2, 1]),
+        ("lambda x: f'{x}'", [1, 2], "[1, 2]"),
+        ("lambda x: x | {'b': 2}", {"a": 1}, {"a": 1, "b": 2}),
+        ("lambda x: {'b': 2} | x", {"a": 1}, {"b": 2, "a": 1}),
+        ("lambda x: {**x, 'b': 2}", {"a": 1}, {"a": 1, "b": 2}),
+        ("lambda x: dict(x)", {"a": 1}, {"a": 1}),
+        ("lambda x: x == {'a': 1}", {"a": 1}, True),
+        ("lambda x: 'a' in x", {"a": 1}, True),
+        ("lambda x: [k for k, v in x.items() if v]", {"a": 1, "b": 0}, ["a"]),
+        ("lambda x: f'{x}'", {"a": 1}, "{'a': 1}"),
+        ("lambda x: jsonpath('$.a', x)", {"a": 1}, 1),
+        ("lambda x: jsonpath('$[1]', x)", [1, 2], 2),
+    ],
+)
+def test_build_lambda_read_only_views(
+    lambda_str: str, test_input: Any, expected_result: Any
+) -> None:
+    """Read-only views behave like the dicts and lists they wrap."""
+    assert build_safe_lambda(lambda_str)(test_input) == expected_result
+
+
+@pytest.mark.parametrize(
+    "lambda_str,get_returned",
+    [
+        ("lambda x: x", lambda result: result),
+        ("lambda x: [x]", lambda result: result[0]),
+        ("lambda x: {'item': (x, 1)}", lambda result: result["item"][0]),
+    ],
+)
+def test_build_lambda_returned_input_is_copied(
+    lambda_str: str, get_returned: Callable[[Any], Any]
+) -> None:
+    """Inputs returned from a lambda come back as plain copies, not views."""
+    test_input = {"a": [1, 2]}
+    result = build_safe_lambda(lambda_str)(test_input)
+
+    returned = get_returned(result)
+    assert type(returned) is dict
+    assert returned == test_input
+    assert returned is not test_input
+    orjson.dumps(result)
@@ -3,7 +3,8 @@ import os
 import pytest
 from cryptography.fernet import Fernet, InvalidToken
 
-from allama.secrets.common import apply_masks, apply_masks_object
+from allama.secrets.common import apply_masks, apply_masks_object, compile_masks
+from allama.secrets.constants import MASK_VALUE
 from allama.secrets.encryption import (
     decrypt_bytes,
     decrypt_value,
@@ -679,3 +680,34 @@ class TestExecutorServiceMasking:
 
         # Verify this is clearly different
         assert masked_result != unmasked_result
+
+
+class TestCompiledMasks:
+    """Secret masks are compiled once per secret set."""
+
+    def test_compile_masks_is_cached_per_secret_set(self):
+        compile_masks.cache_clear()
+        masks = ["secret1", "secret2", "x"]
+        for _ in range(3):
+            apply_masks_object({"a": ["secret1", "secret2"]}, masks)
+        info = compile_masks.cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
+        assert compile_masks(("x", "")) is None
+
+    def test_masks_string_leaves_and_keeps_other_leaves(self):
+        masks = ["secret1", "secret2"]
+        data = {
+            "rows": [{"id": 1, "score": 1.5, "active": True, "note": "a secret1"}],
+            "tags": ["secret2", None],
+            "raw": b"secret1",
+            "tuple": ("a", "secret2"),
+        }
+        assert apply_masks_object(data, masks) == {
+            "rows": [
+                {"id": 1, "score": 1.5, "active": True, "note": f"a {MASK_VALUE}"}
+            ],
+            "tags": [MASK_VALUE, None],
+            "raw": b"secret1",
+            "tuple": ("a", MASK_VALUE),
+        }
@@ -1,9 +1,10 @@
 """Tests for the storage module."""
 
+import asyncio
 import hashlib
 from contextlib import asynccontextmanager
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from unittest.mock import ANY, AsyncMock, patch
 from urllib.parse import urlparse
 
 import pytest
@@ -25,6 +26,16 @@ from allama.storage.blob import (
 )
 
 
+@pytest.fixture(autouse=True)
+def reset_storage_clients():
+    """Start each test without pooled clients or remembered buckets."""
+    blob_module._clients.clear()
+    blob_module._known_buckets.clear()
+    yield
+    blob_module._clients.clear()
+    blob_module._known_buckets.clear()
+
+
 class TestS3Operations:
     """Test S3/MinIO operations."""
 
@@ -82,6 +93,7 @@ class TestS3Operations:
                 assert client is mock_client
             mock_session.client.assert_called_once_with(
                 "s3",
+                config=ANY,
                 endpoint_url="http://localhost:9002",
                 aws_access_key_id="minioadmin",
                 aws_secret_access_key="minioadmin",
@@ -104,7 +116,12 @@ class TestS3Operations:
 
             async with get_storage_client() as client:
                 assert client is mock_client
-            mock_session.client.assert_called_once_with("s3")
+            mock_session.client.assert_called_once_with("s3", config=ANY)
+            client_config = mock_session.client.call_args.kwargs["config"]
+            assert (
+                client_config.max_pool_connections
+                == blob_module.config.ALLAMA__BLOB_STORAGE_MAX_POOL_CONNECTIONS
+            )
 
     @pytest.mark.anyio
     @patch("allama.storage.blob.get_storage_client")
@@ -446,6 +463,116 @@ class TestS3Operations:
         )
 
 
+class TestStorageClientPool:
+    """Test client reuse and the bucket-existence memo."""
+
+    @pytest.fixture
+    def created_clients(self) -> list[AsyncMock]:
+        return []
+
+    @pytest.fixture
+    def mock_session_cls(self, monkeypatch, created_clients):
+        monkeypatch.setattr(
+            blob_module.config,
+            "ALLAMA__BLOB_STORAGE_ENDPOINT",
+            "http://localhost:9002",
+            raising=False,
+        )
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "minioadmin")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "minioadmin")
+        with patch("allama.storage.blob.aioboto3.Session") as mock_session_cls:
+
+            def new_client(*args, **kwargs):
+                # A distinct client per session.client() call, closed via __aexit__
+                client = AsyncMock()
+                client.__aenter__.return_value = client
+                created_clients.append(client)
+                return client
+
+            mock_session_cls.return_value.client.side_effect = new_client
+            yield mock_session_cls
+
+    @pytest.mark.anyio
+    async def test_client_reused_across_calls(self, mock_session_cls):
+        """Concurrent and sequential callers share one client."""
+
+        async def use_client():
+            async with get_storage_client() as client:
+                await asyncio.sleep(0)
+                return client
+
+        clients = await asyncio.gather(*(use_client() for _ in range(10)))
+        clients.append(await use_client())
+
+        assert len({id(client) for client in clients}) == 1
+        assert mock_session_cls.return_value.client.call_count == 1
+
+    @pytest.mark.anyio
+    async def test_client_recreated_on_credential_change(
+        self, mock_session_cls, created_clients, monkeypatch
+    ):
+        """Changing credentials closes the old client once it is released."""
+        async with get_storage_client() as old_client:
+            monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "rotated")
+            async with get_storage_client() as new_client:
+                assert new_client is not old_client
+                old_mock, new_mock = created_clients
+                # Still in use by the outer block
+                old_mock.__aexit__.assert_not_called()
+            assert (
+                mock_session_cls.return_value.client.call_args.kwargs[
+                    "aws_secret_access_key"
+                ]
+                == "rotated"
+            )
+        old_mock.__aexit__.assert_awaited_once()
+
+        async with get_storage_client() as client:
+            assert client is new_client
+        new_mock.__aexit__.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_close_storage_clients(self, mock_session_cls, created_clients):
+        """close_storage_clients closes the pooled client and the next call reopens."""
+        async with get_storage_client() as client:
+            pass
+        await blob_module.close_storage_clients()
+        [pooled] = created_clients
+        pooled.__aexit__.assert_awaited_once()
+
+        async with get_storage_client() as reopened:
+            assert reopened is not client
+
+    @pytest.mark.anyio
+    @patch("allama.storage.blob.get_storage_client")
+    async def test_ensure_bucket_exists_remembers_bucket(self, mock_get_client):
+        """Only the first ensure_bucket_exists call for a bucket hits storage."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value.__aenter__.return_value = mock_client
+
+        for _ in range(3):
+            await ensure_bucket_exists("test-bucket")
+        await ensure_bucket_exists("other-bucket")
+
+        assert mock_client.head_bucket.await_count == 2
+
+    @pytest.mark.anyio
+    @patch("allama.storage.blob.get_storage_client")
+    async def test_ensure_bucket_exists_failure_not_remembered(self, mock_get_client):
+        """A failed existence check is retried on the next call."""
+        mock_client = AsyncMock()
+        mock_get_client.return_value.__aenter__.return_value = mock_client
+        mock_client.head_bucket.side_effect = ClientError(
+            error_response={"Error": {"Code": "403"}}, operation_name="head_bucket"
+        )
+
+        for _ in range(2):
+            with pytest.raises(ClientError):
+                await ensure_bucket_exists("test-bucket")
+
+        assert mock_client.head_bucket.await_count == 2
+
+
 class TestEdgeCases:
     """Test edge cases and error conditions."""
 
@@ -1,10 +1,17 @@
-"""Tests for SizedMemoryCache."""
+"""Tests for the blob caches (SizedMemoryCache and the disk tier)."""
 
 import asyncio
+import hashlib
+import os
+import time
 
 import pytest
 
-from allama.storage.utils import SizedMemoryCache
+from allama import config
+from allama.storage import blob, utils
+from allama.storage.utils import DiskBlobCache, SizedMemoryCache
+
+BLOB = b'{"payload": "shared"}'
 
 
 class TestSizedMemoryCache:
@@ -187,3 +194,113 @@ class TestSizedMemoryCache:
 
         assert cache.total_bytes == 7
         assert cache.item_count == 2
+
+
+def _sha(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class TestDiskBlobCache:
+    """Test the node-local, content-addressed disk tier."""
+
+    def test_get_set_roundtrip(self, tmp_path):
+        cache = DiskBlobCache(tmp_path, max_bytes=1024)
+        content = b"hello"
+
+        assert cache.get(_sha(content)) is None
+        cache.set(_sha(content), content)
+
+        assert cache.get(_sha(content)) == content
+        assert (tmp_path / _sha(content)[:2] / _sha(content)).read_bytes() == content
+        # Another instance (e.g. a sibling process) sees the same entry
+        assert DiskBlobCache(tmp_path, max_bytes=1024).get(_sha(content)) == content
+
+    def test_rejects_non_sha256_keys(self, tmp_path):
+        cache = DiskBlobCache(tmp_path, max_bytes=1024)
+
+        cache.set("../escape", b"data")
+
+        assert cache.get("../escape") is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_corrupt_entry_is_dropped(self, tmp_path):
+        cache = DiskBlobCache(tmp_path, max_bytes=1024)
+        sha = _sha(b"hello")
+        cache.set(sha, b"hello")
+        path = tmp_path / sha[:2] / sha
+        path.write_bytes(b"tampered")
+
+        assert cache.get(sha) is None
+        assert not path.exists()
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = DiskBlobCache(tmp_path, max_bytes=100)
+        blobs = [bytes([i]) * 30 for i in range(3)]
+        for age, content in zip((30, 20, 10), blobs, strict=True):
+            cache.set(_sha(content), content)
+            path = tmp_path / _sha(content)[:2] / _sha(content)
+            os.utime(path, (time.time() - age, time.time() - age))
+
+        # Reading the oldest entry makes it the most recently used
+        assert cache.get(_sha(blobs[0])) == blobs[0]
+        new = b"n" * 30
+        cache.set(_sha(new), new)
+
+        assert cache.get(_sha(blobs[1])) is None
+        assert cache.get(_sha(blobs[0])) == blobs[0]
+        assert cache.get(_sha(new)) == new
+        total = sum(p.stat().st_size for p in tmp_path.rglob("*") if p.is_file())
+        assert total <= 100
+
+
+class TestCachedBlobDownloadTiers:
+    """Test cached_blob_download across the memory and disk tiers."""
+
+    @pytest.fixture
+    def downloads(self, monkeypatch, tmp_path) -> list[str]:
+        """Fresh tiers with a disk cache in tmp_path; records blob downloads."""
+        monkeypatch.setattr(
+            utils, "_blob_cache", SizedMemoryCache(max_bytes=1024 * 1024)
+        )
+        monkeypatch.setattr(utils, "_blob_downloads", {})
+        monkeypatch.setattr(utils, "_blob_cache_stats", utils.BlobCacheStats())
+        monkeypatch.setattr(utils, "_disk_cache", None)
+        monkeypatch.setattr(config, "ALLAMA__BLOB_CACHE_DIR", str(tmp_path))
+
+        calls: list[str] = []
+
+        async def download_file(key: str, bucket: str) -> bytes:
+            calls.append(key)
+            return BLOB
+
+        monkeypatch.setattr(blob, "download_file", download_file)
+        return calls
+
+    @pytest.mark.anyio
+    async def test_sibling_process_reads_from_disk(self, downloads, monkeypatch):
+        sha = _sha(BLOB)
+
+        assert await utils.cached_blob_download(sha, "bucket", "key") == BLOB
+        assert await utils.cached_blob_download(sha, "bucket", "key") == BLOB
+        # A sibling process starts with an empty memory cache
+        monkeypatch.setattr(
+            utils, "_blob_cache", SizedMemoryCache(max_bytes=1024 * 1024)
+        )
+        assert await utils.cached_blob_download(sha, "bucket", "key") == BLOB
+
+        assert downloads == ["key"]
+        stats = utils.get_blob_cache_stats()
+        assert (stats.memory.hits, stats.memory.misses) == (1, 2)
+        assert (stats.disk.hits, stats.disk.misses) == (1, 1)
+        assert stats.as_dict()["memory_hit_rate"] == pytest.approx(1 / 3, abs=1e-4)
+        assert stats.disk.hit_rate == 0.5
+
+    @pytest.mark.anyio
+    async def test_disk_tier_disabled(self, downloads, monkeypatch, tmp_path):
+        monkeypatch.setattr(config, "ALLAMA__BLOB_CACHE_DIR", "")
+
+        await utils.cached_blob_download(_sha(BLOB), "bucket", "key")
+
+        assert downloads == ["key"]
+        assert list(tmp_path.iterdir()) == []
+        assert utils.get_blob_cache_stats().disk.misses == 0
@@ -202,6 +202,31 @@ class TestCollectionManifestSchemas:
         assert manifest.count == 1000
         assert len(manifest.chunks) == 4
 
+    def test_manifest_v1_without_chunk_encoding_is_json(self):
+        """Manifests written before chunk compression default to plain JSON."""
+        from allama.storage.collection import CollectionManifestV1
+
+        manifest = CollectionManifestV1.model_validate(
+            {
+                "kind": "allama.collection_manifest",
+                "version": 1,
+                "count": 1,
+                "chunk_size": 256,
+                "element_kind": "value",
+                "chunks": [
+                    {
+                        "bucket": "b",
+                        "key": "chunks/0.json",
+                        "size_bytes": 1,
+                        "sha256": "h",
+                    }
+                ],
+            }
+        )
+
+        assert manifest.chunk_encoding == "json"
+        assert manifest.chunks[0].encoding == "json"
+
     def test_chunk_v1_schema(self):
         """Test CollectionChunkV1 schema."""
         from allama.storage.collection import CollectionChunkV1
@@ -226,9 +251,6 @@ class TestCollectionStorageFunctions:
     @pytest.fixture
     def mock_blob_storage(self, monkeypatch):
         """Mock blob storage for testing."""
-        import json
-        import re
-
         stored_blobs: dict[str, bytes] = {}
 
         async def mock_ensure_bucket_exists(bucket: str):
@@ -245,32 +267,11 @@ class TestCollectionStorageFunctions:
                 raise FileNotFoundError(f"Blob not found: {full_key}")
             return stored_blobs[full_key]
 
-        async def mock_select_object_content(
-            key: str, bucket: str, expression: str
-        ) -> bytes:
-            """Mock S3 Select by parsing the expression and extracting data."""
-            full_key = f"{bucket}/{key}"
-            if full_key not in stored_blobs:
-                raise FileNotFoundError(f"Blob not found: {full_key}")
-
-            data = json.loads(stored_blobs[full_key])
-
-            # Parse expression like "SELECT s.items[0] FROM s3object s"
-            match = re.search(r"s\.items\[(\d+)\]", expression)
-            if match:
-                index = int(match.group(1))
-                item = data["items"][index]
-                # S3 Select returns {"_1": <item>} for indexed access
-                return json.dumps({"_1": item}).encode()
-
-            raise ValueError(f"Unsupported expression: {expression}")
-
         from allama.storage import blob
 
         monkeypatch.setattr(blob, "ensure_bucket_exists", mock_ensure_bucket_exists)
         monkeypatch.setattr(blob, "upload_file", mock_upload_file)
         monkeypatch.setattr(blob, "download_file", mock_download_file)
-        monkeypatch.setattr(blob, "select_object_content", mock_select_object_content)
 
         return stored_blobs
 
@@ -449,3 +450,128 @@ class TestCollectionStorageFunctions:
         assert len(values) == 20
         assert values[0] == {"id": 10}
         assert values[19] == {"id": 29}
+
+    @pytest.mark.anyio
+    async def test_scatter_items_fetch_each_chunk_once(
+        self, mock_blob_storage, monkeypatch
+    ):
+        """Test scatter item materialization downloads each chunk at most once."""
+        import asyncio
+        from collections import Counter
+
+        from allama.dsl.action import _materialize_task_result
+        from allama.dsl.schemas import TaskResult
+        from allama.storage import blob, utils
+        from allama.storage.collection import store_collection
+
+        n_items = 10_000
+        chunk_size = 256
+        collection = await store_collection(
+            prefix="wf-123/scatter-test",
+            items=[{"id": i} for i in range(n_items)],
+            element_kind="value",
+            chunk_size=chunk_size,
+            bucket="test-bucket",
+        )
+
+        # Start from a cold worker cache and count downloads per blob
+        monkeypatch.setattr(
+            utils, "_blob_cache", utils.SizedMemoryCache(max_bytes=64 * 1024 * 1024)
+        )
+        monkeypatch.setattr(utils, "_blob_downloads", {})
+        downloads: Counter[str] = Counter()
+        download_file = blob.download_file
+
+        async def counting_download_file(key: str, bucket: str) -> bytes:
+            downloads[key] += 1
+            await asyncio.sleep(0)
+            return await download_file(key=key, bucket=bucket)
+
+        monkeypatch.setattr(blob, "download_file", counting_download_file)
+
+        results = await asyncio.gather(
+            *(
+                _materialize_task_result(
+                    TaskResult.from_collection_item(collection, i, "dict")
+                )
+                for i in range(n_items)
+            )
+        )
+
+        assert [r["result"] for r in results] == [{"id": i} for i in range(n_items)]
+        n_chunks = -(-n_items // chunk_size)
+        assert len(downloads) == n_chunks + 1  # chunks + manifest
+        assert max(downloads.values()) == 1
+
+    @pytest.mark.anyio
+    async def test_store_collection_compressed_roundtrip(self, mock_blob_storage):
+        """Compressed chunks are written as zstd and read back transparently."""
+        from allama.storage.collection import (
+            _fetch_manifest,
+            get_collection_item,
+            materialize_collection_values,
+            store_collection,
+        )
+
+        items = [{"id": i, "value": "x" * 50} for i in range(100)]
+
+        collection = await store_collection(
+            prefix="wf-123/zstd-test",
+            items=items,
+            chunk_size=30,
+            bucket="test-bucket",
+            compress=True,
+        )
+
+        manifest = await _fetch_manifest(collection)
+        assert manifest.chunk_encoding == "json+zstd"
+        assert [ref.encoding for ref in manifest.chunks] == ["json+zstd"] * 4
+        chunk_blob = mock_blob_storage["test-bucket/wf-123/zstd-test/chunks/0.json.zst"]
+        assert chunk_blob.startswith(b"\x28\xb5\x2f\xfd")  # zstd frame magic
+
+        assert await materialize_collection_values(collection) == items
+        assert await get_collection_item(collection, 95) == items[95]
+
+    @pytest.mark.anyio
+    async def test_store_collection_bounds_parallel_uploads(
+        self, mock_blob_storage, monkeypatch
+    ):
+        """Chunk uploads overlap, but never exceed the transfer concurrency."""
+        import asyncio
+
+        from allama import config
+        from allama.storage import blob
+        from allama.storage.collection import (
+            materialize_collection_values,
+            store_collection,
+        )
+
+        monkeypatch.setattr(config, "ALLAMA__COLLECTION_TRANSFER_CONCURRENCY", 4)
+        upload_file = blob.upload_file
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_upload_file(content, key, bucket, content_type):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            await upload_file(content, key, bucket, content_type)
+
+        monkeypatch.setattr(blob, "upload_file", slow_upload_file)
+
+        items = [{"id": i} for i in range(200)]
+        collection = await store_collection(
+            prefix="wf-123/parallel-test",
+            items=items,
+            chunk_size=10,
+            bucket="test-bucket",
+        )
+
+        assert max_in_flight == 4
+        # The manifest is uploaded last, after every chunk it references
+        assert list(mock_blob_storage)[-1] == (
+            "test-bucket/wf-123/parallel-test/manifest.json"
+        )
+        assert await materialize_collection_values(collection) == items
@@ -1,12 +1,15 @@
 """Tests for the object storage module.
 
-Uses InlineObjectStorage as the test double - no mocks needed.
+Uses InlineObjectStorage as the test double - no mocks needed. S3ObjectStorage
+tests replace the blob layer with an in-memory dict.
 """
 
 import pytest
 from pydantic import TypeAdapter
 
-from allama.storage.backends import InlineObjectStorage
+from allama import config
+from allama.storage import blob, utils
+from allama.storage.backends import InlineObjectStorage, S3ObjectStorage
 from allama.storage.object import (
     ExternalObject,
     InlineObject,
@@ -194,6 +197,118 @@ class TestInlineObjectStorage:
             await storage.retrieve(stored)
 
 
+class TestS3ObjectStorage:
+    """Tests for S3ObjectStorage serialization and integrity checks."""
+
+    @pytest.fixture
+    def blobs(self, monkeypatch) -> dict[str, bytes]:
+        """In-memory blob store with fresh blob caches."""
+        stored: dict[str, bytes] = {}
+        downloads: list[str] = []
+
+        async def ensure_bucket_exists(bucket: str) -> None:
+            pass
+
+        async def upload_file(content, key, bucket, content_type=None) -> None:
+            stored[key] = content
+
+        async def download_file(key: str, bucket: str) -> bytes:
+            downloads.append(key)
+            return stored[key]
+
+        monkeypatch.setattr(blob, "ensure_bucket_exists", ensure_bucket_exists)
+        monkeypatch.setattr(blob, "upload_file", upload_file)
+        monkeypatch.setattr(blob, "download_file", download_file)
+        monkeypatch.setattr(utils, "_blob_cache", utils.SizedMemoryCache(2**30))
+        monkeypatch.setattr(utils, "_blob_downloads", {})
+        monkeypatch.setattr(config, "ALLAMA__BLOB_CACHE_DIR", "")
+        self.downloads = downloads
+        return stored
+
+    @pytest.mark.anyio
+    async def test_store_uploads_measured_bytes(self, blobs, monkeypatch):
+        """Data is serialized once and those bytes are uploaded."""
+        calls = 0
+        serialize = utils.serialize_object
+
+        def counting_serialize(data):
+            nonlocal calls
+            calls += 1
+            return serialize(data)
+
+        from allama.storage.backends import s3 as s3_module
+
+        monkeypatch.setattr(s3_module, "serialize_object", counting_serialize)
+        storage = S3ObjectStorage(bucket="b", threshold_bytes=10)
+        data = {"value": "x" * 100}
+
+        stored = await storage.store("k", data)
+
+        assert isinstance(stored, ExternalObject)
+        assert calls == 1
+        assert blobs["k"] == serialize_object(data)
+        assert stored.ref.sha256 == compute_sha256(blobs["k"])
+        assert stored.ref.size_bytes == len(blobs["k"])
+
+    @pytest.mark.anyio
+    async def test_retrieve_after_store_skips_download(self, blobs):
+        storage = S3ObjectStorage(bucket="b", threshold_bytes=10)
+        stored = await storage.store("k", {"value": "x" * 100})
+
+        assert await storage.retrieve(stored) == {"value": "x" * 100}
+        assert self.downloads == []
+
+    @pytest.mark.anyio
+    async def test_retrieve_verifies_download_once(self, blobs, monkeypatch):
+        """Downloads are hashed once; cache hits are not re-hashed."""
+        storage = S3ObjectStorage(bucket="b", threshold_bytes=10)
+        stored = await storage.store("k", {"value": "x" * 100})
+        monkeypatch.setattr(utils, "_blob_cache", utils.SizedMemoryCache(2**30))
+        hashed: list[int] = []
+        compute = utils.compute_sha256
+
+        def counting_compute_sha256(content: bytes) -> str:
+            hashed.append(len(content))
+            return compute(content)
+
+        monkeypatch.setattr(utils, "compute_sha256", counting_compute_sha256)
+
+        for _ in range(3):
+            assert await storage.retrieve(stored) == {"value": "x" * 100}
+
+        assert self.downloads == ["k"]
+        assert hashed == [len(blobs["k"])]
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize("sample_rate", [1.0, 0.0])
+    async def test_retrieve_rejects_corrupt_blob(self, blobs, monkeypatch, sample_rate):
+        """Corrupt downloads raise and are not cached."""
+        monkeypatch.setattr(config, "ALLAMA__BLOB_INTEGRITY_SAMPLE_RATE", sample_rate)
+        storage = S3ObjectStorage(bucket="b", threshold_bytes=10)
+        stored = await storage.store("k", {"value": "x" * 100})
+        monkeypatch.setattr(utils, "_blob_cache", utils.SizedMemoryCache(2**30))
+        original = blobs["k"]
+        # A size change is caught even when the SHA-256 check is not sampled
+        blobs["k"] = original + b" "
+
+        with pytest.raises(ValueError, match="Integrity check failed for k"):
+            await storage.retrieve(stored)
+
+        blobs["k"] = original
+        assert await storage.retrieve(stored) == {"value": "x" * 100}
+
+    @pytest.mark.anyio
+    async def test_unsampled_download_skips_hash(self, blobs, monkeypatch):
+        monkeypatch.setattr(config, "ALLAMA__BLOB_INTEGRITY_SAMPLE_RATE", 0.0)
+        storage = S3ObjectStorage(bucket="b", threshold_bytes=10)
+        stored = await storage.store("k", {"value": "x" * 100})
+        monkeypatch.setattr(utils, "_blob_cache", utils.SizedMemoryCache(2**30))
+        # Same size, different content: only the sampled SHA-256 check sees this
+        blobs["k"] = blobs["k"].replace(b"x", b"y")
+
+        assert await storage.retrieve(stored) == {"value": "y" * 100}
+
+
 class TestSerializationHelpers:
     """Tests for serialization helpers."""
 
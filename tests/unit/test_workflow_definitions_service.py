@@ -1,3 +1,5 @@
+import asyncio
+from collections import OrderedDict
 from collections.abc import AsyncGenerator
 from datetime import datetime
 
@@ -7,9 +9,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from allama.auth.types import Role
 from allama.db.models import Workflow, Workspace
-from allama.dsl.common import DSLInput
+from allama.dsl.common import DSLEntrypoint, DSLInput
+from allama.dsl.schemas import ActionStatement
 from allama.identifiers.workflow import WorkflowUUID
-from allama.workflow.management.definitions import WorkflowDefinitionsService
+from allama.workflow.management import definitions
+from allama.workflow.management.definitions import (
+    WorkflowDefinitionsService,
+    get_workflow_definition_activity,
+)
+from allama.workflow.management.schemas import (
+    GetWorkflowDefinitionActivityInputs,
+    WorkflowDefinitionActivityResult,
+)
 
 pytestmark = pytest.mark.usefixtures("db")
 
@@ -188,3 +199,43 @@ async def test_create_workflow_definition_with_various_datetime_formats(
     assert isinstance(args["date_only"], str)
     assert isinstance(args["nested_dates"]["start"], str)
     assert isinstance(args["nested_dates"]["end"], str)
+
+
+@pytest.mark.anyio
+async def test_get_workflow_definition_activity_caches_pinned_versions(
+    monkeypatch: pytest.MonkeyPatch, svc_role: Role
+):
+    """Looped child workflows pinning one version share a single load."""
+    loads: list[int | None] = []
+
+    async def load(input: GetWorkflowDefinitionActivityInputs):
+        loads.append(input.version)
+        await asyncio.sleep(0)
+        return WorkflowDefinitionActivityResult(
+            dsl=DSLInput(
+                title="child",
+                description="child",
+                entrypoint=DSLEntrypoint(ref="a"),
+                actions=[ActionStatement(ref="a", action="core.noop")],
+            )
+        )
+
+    monkeypatch.setattr(definitions, "_load_workflow_definition", load)
+    monkeypatch.setattr(definitions, "_definition_cache", OrderedDict())
+    wf_id = WorkflowUUID.new_uuid4()
+    pinned = GetWorkflowDefinitionActivityInputs(
+        role=svc_role, workflow_id=wf_id, version=3
+    )
+    latest = GetWorkflowDefinitionActivityInputs(role=svc_role, workflow_id=wf_id)
+
+    results = await asyncio.gather(
+        *(get_workflow_definition_activity(pinned) for _ in range(10))
+    )
+    await get_workflow_definition_activity(pinned)
+    assert loads == [3]
+    assert all(result is results[0] for result in results)
+
+    # The latest version can change, so it is never cached
+    await get_workflow_definition_activity(latest)
+    await get_workflow_definition_activity(latest)
+    assert loads == [3, None, None]